@@ -1,12 +1,26 @@
 import sqlite3
 import openpyxl
-from flask import Flask, render_template, request, jsonify, send_file
-from database import init_db, get_db_connection
+from flask import Flask, render_template, request, jsonify, send_file, url_for, stream_with_context
+from database import (init_db, init_app, get_db, get_pool, write_transaction, bump_version, get_version, get_versions,
+                      read_transaction, iter_rows, rebuild_monthly_totals, get_change_seq, changed_cells_since,
+                      closed_months, work_log_table, list_archived_years)
+from cache import ResponseCache, negotiate_encoding, compress
+import jobs
+import live
+import metrics
+from writers import WRITERS, get_writer
+from payroll import (get_days_in_month, get_month_bounds, get_month_calendar, group_holidays_by_year,
+                     calculate_payments_from_totals, calculate_range_report, use_parallel,
+                     calculate_payments_parallel, calculate_range_report_parallel)
 import json
+import base64
+import hashlib
+import tempfile
 import os
 import logging
 from dotenv import load_dotenv
 from datetime import datetime, date
+from itertools import groupby
 from io import BytesIO
 
 # --- Configuration & Logging (12 Factor) ---
@@ -19,237 +33,165 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# --- Constants ---
-OFFICIAL_HOLIDAYS_2025 = [
-    {'date': '2025-01-01', 'description': 'Yılbaşı'},
-    {'date': '2025-03-31', 'description': 'Ramazan Bayramı'},
-    {'date': '2025-04-01', 'description': 'Ramazan Bayramı'},
-    {'date': '2025-04-02', 'description': 'Ramazan Bayramı'},
-    {'date': '2025-04-23', 'description': 'Ulusal Egemenlik'},
-    {'date': '2025-05-01', 'description': 'Emek ve Dayanışma'},
-    {'date': '2025-05-19', 'description': 'Gençlik ve Spor'},
-    {'date': '2025-06-27', 'description': 'Kurban Bayramı'},
-    {'date': '2025-06-28', 'description': 'Kurban Bayramı'},
-    {'date': '2025-06-29', 'description': 'Kurban Bayramı'},
-    {'date': '2025-06-30', 'description': 'Kurban Bayramı'},
-    {'date': '2025-08-30', 'description': 'Zafer Bayramı'},
-    {'date': '2025-09-05', 'description': 'Kurban Bayramı'},
-    {'date': '2025-09-06', 'description': 'Kurban Bayramı'},
-    {'date': '2025-09-07', 'description': 'Kurban Bayramı'},
-    {'date': '2025-09-08', 'description': 'Kurban Bayramı'},
-    {'date': '2025-10-29', 'description': 'Cumhuriyet Bayramı'},
-]
-
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+init_app(app)
+# İlk kaydedilen after_request en son çalışır: ölçülen süre sıkıştırma dahil tüm işlemeyi kapsar
+metrics.init_app(app)
 
 # Veritabanı dosyası konfigürasyonu
 DB_FILE = os.getenv('DATABASE_FILE', 'overtime.db')
 
-# Uygulamayı başlatmadan önce veritabanının var olduğundan emin ol
+# Uygulamayı başlatmadan önce veritabanının var olduğundan ve şemanın güncel olduğundan emin ol
+# (init_db idempotent; mevcut veritabanlarında da index/migration adımlarını uygular)
 if not os.path.exists(DB_FILE):
     logger.info(f"Veritabanı ({DB_FILE}) bulunamadı, oluşturuluyor...")
-    init_db()
+init_db()
 
 # --- Helper Functions ---
-def get_days_in_month(year_month):
-    year, month = map(int, year_month.split('-'))
-    return (date(year, month + 1, 1) - date(year, month, 1)).days if month < 12 else 31
-
-def get_working_days_in_month(year_month, custom_holidays):
-    year, month = map(int, year_month.split('-'))
-    days_in_month = get_days_in_month(year_month)
-    working_days = 0
-    official_holiday_dates = [h['date'] for h in OFFICIAL_HOLIDAYS_2025]
-
-    for day in range(1, days_in_month + 1):
-        current_date = date(year, month, day)
-        date_str = current_date.isoformat()
-        if current_date.weekday() < 5 and date_str not in custom_holidays and date_str not in official_holiday_dates:
-            working_days += 1
-    return working_days
-
-def calculate_payment_for_employee(emp, year_month, logs, custom_holidays, settings):
-    year, month = map(int, year_month.split('-'))
-    days_in_month = get_days_in_month(year_month)
-
-    # 1. Fetch Salary Type Config
-    salary_type_id = emp['salary_type_id']
-    salary_type_name = emp['salary_type_name']
-
-    # Defaults (if no salary type linked, though we seeded defaults)
-    config = {
-        'include_min_wage': 0, 'include_fixed_salary': 0,
-        'include_fixed_overtime_pay': 0, 'include_fixed_hours_quota': 0,
-        'include_overtime_calc': 0, 'include_on_call': 0
-    }
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 5000))
+EXCEL_MAX_ROWS = 1048576
 
-    # If we have the config columns joined in 'emp', use them
-    if 'include_min_wage' in emp:
-         config = {
-            'include_min_wage': emp['include_min_wage'],
-            'include_fixed_salary': emp['include_fixed_salary'],
-            'include_fixed_overtime_pay': emp['include_fixed_overtime_pay'],
-            'include_fixed_hours_quota': emp['include_fixed_hours_quota'],
-            'include_overtime_calc': emp['include_overtime_calc'],
-            'include_on_call': emp['include_on_call']
-        }
-
-    # 2. Categorize Logs
-    weekday_day, weekday_evening, weekend_day, weekend_evening = 0, 0, 0, 0
-    for day in range(1, days_in_month + 1):
-        d = date(year, month, day)
-        log = logs.get(d.isoformat(), {'day_hours': 0, 'evening_hours': 0})
-        is_weekend = d.weekday() >= 5
-        is_holiday = d.isoformat() in custom_holidays or d.isoformat() in [h['date'] for h in OFFICIAL_HOLIDAYS_2025]
-
-        if is_weekend or is_holiday:
-            weekend_day += log['day_hours']
-            weekend_evening += log['evening_hours']
-        else:
-            weekday_day += log['day_hours']
-            weekday_evening += log['evening_hours']
-
-    # 3. Employee Constants
-    fixed_salary = float(emp['fixed_salary'] or 0)
-    fixed_overtime_pay = float(emp['fixed_overtime_pay'] or 0)
-    try: fixed_day_hours = float(emp['fixed_day_hours'] or 0)
-    except: fixed_day_hours = 0.0
-    try: fixed_evening_hours = float(emp['fixed_evening_hours'] or 0)
-    except: fixed_evening_hours = 0.0
-
-    # 4. Global Settings
-    day_rate = settings.get('dayRate', 0)
-    evening_rate = settings.get('eveningRate', 0)
-    minimum_wage = settings.get('minimumWage', 0)
-
-    # 5. Calculation Logic
-    total_payment = 0
-    overtime_hours = 0
-    overtime_payment = 0
-    details = []
-
-    # A. Base Pay (Min Wage + Fixed Salary)
-    if config['include_min_wage']:
-        total_payment += minimum_wage
-        details.append(f"Asgari Ücret ({minimum_wage} TL)")
-
-    if config['include_fixed_salary']:
-        total_payment += fixed_salary
-        details.append(f"Sabit Maaş ({fixed_salary} TL)")
-
-    # B. Fixed Adds (Fixed OT Pay + Quota)
-    if config['include_fixed_overtime_pay']:
-        total_payment += fixed_overtime_pay
-        overtime_payment += fixed_overtime_pay
-        details.append(f"Sabit FM Ücreti ({fixed_overtime_pay} TL)")
-
-    if config['include_fixed_hours_quota']:
-        quota_pay = (fixed_day_hours * day_rate) + (fixed_evening_hours * evening_rate)
-        total_payment += quota_pay
-        overtime_payment += quota_pay
-        overtime_hours += (fixed_day_hours + fixed_evening_hours)
-        details.append(f"Sabit Ders: {fixed_day_hours}G + {fixed_evening_hours}A")
-
-    # C. Variable Adds (On Call + Overtime Calc)
-
-    # C1. On Call (Nöbet) -> Adds Weekend/Holiday work
-    if config['include_on_call']:
-        # Nöbet genellikle akşam tarifesinden ödenir
-        on_call_pay = (weekend_day + weekend_evening) * evening_rate
-        total_payment += on_call_pay
-        overtime_payment += on_call_pay
-        overtime_hours += (weekend_day + weekend_evening)
-        details.append(f"Nöbet (H.Sonu): {weekend_day + weekend_evening}s")
-
-    # C2. Overtime Calc (Fazla Mesai) -> Adds Weekday work (usually)
-    if config['include_overtime_calc']:
-        # If Min Wage is included, we deduct expected hours. Else we pay all.
-        billable_weekday_day = weekday_day
-        billable_weekday_evening = weekday_evening
-        deducted_hours = 0
-
-        if config['include_min_wage']:
-            working_days = get_working_days_in_month(year_month, custom_holidays)
-            expected_hours = working_days * 4
-
-            # Deduct from day hours first
-            deducted = min(billable_weekday_day, expected_hours)
-            billable_weekday_day -= deducted
-            remaining_deduction = expected_hours - deducted
-
-            # Note: Usually we don't deduct evening hours, but if day isn't enough?
-            # Standard practice in this app seems to be deducting from total or day.
-            # Code `max(0, weekday_day - expected_hours)` implies only day hours are deducted.
-
-            deducted_hours = expected_hours
-            details.append(f"Düşülen Saat: {expected_hours}")
-
-        calc_pay = (billable_weekday_day * day_rate) + (billable_weekday_evening * evening_rate)
-
-        # If 'On Call' is NOT active, maybe weekends count as FM here?
-        # Standard 'Asgari + FM' (MinWage=1, Calc=1, OnCall=0) included weekends in existing code.
-        if not config['include_on_call']:
-             calc_pay += (weekend_day * evening_rate) + (weekend_evening * evening_rate)
-             overtime_hours += (weekend_day + weekend_evening)
-
-        total_payment += calc_pay
-        overtime_payment += calc_pay
-        overtime_hours += (billable_weekday_day + billable_weekday_evening) # Only add billed hours? Or all worked extra hours?
-        # For display, let's show billable.
-
-        if calc_pay > 0:
-            details.append("Hesaplanan FM Eklendi")
-
-    # Helper for branch
-    try: branch = emp['branch']
-    except: branch = ''
+def send_workbook(wb, download_name):
+    """Workbook'u bellekteki BytesIO yerine geçici dosyaya yazıp gönderir (yanıt bitince dosya silinir)."""
+    output = tempfile.TemporaryFile(suffix='.xlsx')
+    wb.save(output)
+    output.seek(0)
+    return send_file(output, as_attachment=True, download_name=download_name)
 
-    return {
-        'emp_id': emp['id'], 'name': emp['name'], 'empId': emp['emp_id'], 'branch': branch,
-        'paymentType': salary_type_name, # Display Name
-        'fixedSalary': fixed_salary,
-        'fixedOvertimePay': fixed_overtime_pay,
-        'fixedDayHours': fixed_day_hours, 'fixedEveningHours': fixed_evening_hours,
-        'weekdayDayHours': weekday_day, 'weekdayEveningHours': weekday_evening,
-        'weekendDayHours': weekend_day, 'weekendEveningHours': weekend_evening,
-        'totalHours': weekday_day + weekday_evening + weekend_day + weekend_evening,
-        'overtimeHours': overtime_hours,
-        'overtimePayment': overtime_payment,
-        'totalPayment': total_payment,
-        'minimumWage': minimum_wage if config['include_min_wage'] else 0,
-        'calculationDetails': " + ".join(details)
-    }
+# Yanıt önbelleği: anahtar (kaynak, bağlı veri sürümleri); ETag aynı sürümlerden türetilir
+response_cache = ResponseCache()
+metrics.register_gauges('db_pool', lambda: get_pool().stats())
+metrics.register_gauges('response_cache', response_cache.stats)
+metrics.register_gauges('live', live.hub.stats)
+
+def cached_json(resource, deps, build):
+    """`deps` sürümleri değişmedikçe `build()` sonucunu önbellekten verir; If-None-Match eşleşirse 304 döner.
+
+    Sürümler veritabanında tutulduğu için ETag tüm worker'larda aynıdır. Sıkıştırılmış gövdeler de
+    kodlama başına önbelleğe alınır; ETag'e kodlama eklenir. build() bytes dönerse hazır JSON gövdesi
+    olarak olduğu gibi kullanılır.
+    """
+    versions = get_versions(get_db(), *deps)
+    etag = hashlib.sha1(repr((resource, versions)).encode()).hexdigest()
+    matched = next((tag for tag in (etag, f'{etag}-gzip', f'{etag}-br') if request.if_none_match.contains(tag)), None)
+    if matched:
+        response = app.response_class(status=304)
+        response.set_etag(matched)
+    else:
+        key = (resource, versions)
+        body = response_cache.get(key)
+        if body is None:
+            body = build()
+            if not isinstance(body, bytes):
+                body = app.json.dumps(body).encode('utf-8')
+            response_cache.set(key, body)
+        encoding = negotiate_encoding(request.accept_encodings, len(body))
+        if encoding:
+            encoded = response_cache.get(key + (encoding,))
+            if encoded is None:
+                encoded = compress(body, encoding)
+                response_cache.set(key + (encoding,), encoded)
+            response = app.response_class(encoded, mimetype='application/json')
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f'{etag}-{encoding}')
+        else:
+            response = app.response_class(body, mimetype='application/json')
+            response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = True
+    return response
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html'}
+
+@app.after_request
+def compress_response(response):
+    """cached_json dışındaki JSON/HTML yanıtlarını da istemci destekliyorsa br/gzip ile sıkıştırır."""
+    if (response.direct_passthrough or response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    body = response.get_data()
+    encoding = negotiate_encoding(request.accept_encodings, len(body))
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+    return response
+
+# Büyük içe/dışa aktarımlar arka plan işi olarak çalışır (jobs.py); uç noktalar iş id'si döner.
+# ?sync=1 ile istek içinde çalıştırılıp sonuç doğrudan döndürülür (küçük dosyalar, scriptler).
+@app.before_request
+def start_job_runner():
+    # gunicorn worker'ında fork sonrası ilk istekte başlar; kuyrukta kalmış işler de böylece devralınır
+    jobs.runner.ensure_started()
+
+def run_sync():
+    return request.args.get('sync', '').lower() in ('1', 'true')
+
+def job_response(job_id):
+    return jsonify({'jobId': job_id, 'status': 'queued',
+                    'statusUrl': url_for('get_job_status', job_id=job_id)}), 202
+
+# Resmi tatiller yıl -> frozenset olarak process başına bir kez yüklenir; içe aktarma sürümü artırınca yenilenir
+_official_holidays = {'version': None, 'by_year': {}}
+
+def official_holidays_by_year(conn, version=None):
+    if version is None:
+        version = get_version(conn, 'official_holidays')
+    if _official_holidays['version'] != version:
+        dates = [row['date'] for row in conn.execute("SELECT date FROM official_holidays").fetchall()]
+        _official_holidays['by_year'] = group_holidays_by_year(dates)
+        _official_holidays['version'] = version
+    return _official_holidays['by_year']
+
+def month_calendar(conn, year_month):
+    """Tatil sürümlerine göre önbelleklenmiş ay takvimi; tatiller yalnızca önbellek ıskalanınca okunur."""
+    versions = get_versions(conn, 'holidays', 'official_holidays')
+    year = int(year_month.split('-')[0])
+
+    def load_holidays():
+        custom = [h['date'] for h in conn.execute("SELECT date FROM holidays").fetchall()]
+        return official_holidays_by_year(conn, versions[1]).get(year, frozenset()).union(custom)
+
+    return get_month_calendar(year_month, versions, load_holidays)
 
 # --- Ana Sayfa ---
 @app.route('/')
 def index():
     return render_template('index.html')
 
+# --- İstatistik API ---
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    return jsonify({'db_pool': get_pool().stats(), 'response_cache': response_cache.stats()})
+
+@app.route('/api/_metrics', methods=['GET'])
+def get_metrics():
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # --- Ayarlar API ---
 @app.route('/api/settings', methods=['GET'])
 def get_settings():
-    conn = get_db_connection()
-    settings = conn.execute('SELECT key, value FROM settings').fetchall()
-    conn.close()
-    return jsonify({s['key']: s['value'] for s in settings})
+    def build():
+        settings = get_db().execute('SELECT key, value FROM settings').fetchall()
+        return {s['key']: s['value'] for s in settings}
+    return cached_json('settings', ('settings',), build)
 
 @app.route('/api/settings', methods=['POST'])
 def update_settings():
     data = request.json
-    conn = get_db_connection()
-    for key, value in data.items():
-        conn.execute("UPDATE settings SET value = ? WHERE key = ?", (str(value), key))
-    conn.commit()
-    conn.close()
+    conn = get_db()
+    with write_transaction(conn):
+        for key, value in data.items():
+            conn.execute("UPDATE settings SET value = ? WHERE key = ?", (str(value), key))
+        bump_version(conn, 'settings')
     return jsonify({'message': 'Ayarlar güncellendi.'})
 
 # --- Maaş Opsiyonları (Salary Types) API ---
 @app.route('/api/salary_types', methods=['GET'])
 def get_salary_types():
-    conn = get_db_connection()
+    conn = get_db()
     types = conn.execute('SELECT * FROM salary_types').fetchall()
-    conn.close()
     return jsonify([dict(t) for t in types])
 
 @app.route('/api/salary_types', methods=['POST'])
@@ -258,48 +200,153 @@ def add_salary_type():
     name = data.get('name')
     if not name: return jsonify({'error': 'İsim zorunludur.'}), 400
 
-    conn = get_db_connection()
-    cursor = conn.execute("""
-        INSERT INTO salary_types (name, include_min_wage, include_fixed_salary, include_fixed_overtime_pay, include_fixed_hours_quota, include_overtime_calc, include_on_call)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (name, data.get('include_min_wage',0), data.get('include_fixed_salary',0),
-          data.get('include_fixed_overtime_pay',0), data.get('include_fixed_hours_quota',0),
-          data.get('include_overtime_calc',0), data.get('include_on_call',0)))
-    conn.commit()
+    conn = get_db()
+    with write_transaction(conn):
+        cursor = conn.execute("""
+            INSERT INTO salary_types (name, include_min_wage, include_fixed_salary, include_fixed_overtime_pay, include_fixed_hours_quota, include_overtime_calc, include_on_call)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (name, data.get('include_min_wage',0), data.get('include_fixed_salary',0),
+              data.get('include_fixed_overtime_pay',0), data.get('include_fixed_hours_quota',0),
+              data.get('include_overtime_calc',0), data.get('include_on_call',0)))
+        bump_version(conn, 'salary_types')
     new_id = cursor.lastrowid
-    conn.close()
     return jsonify({'id': new_id, 'message': 'Maaş opsiyonu eklendi.'}), 201
 
 @app.route('/api/salary_types/<int:id>', methods=['DELETE'])
 def delete_salary_type(id):
-    conn = get_db_connection()
-    # Check usage
-    count = conn.execute("SELECT COUNT(*) FROM employees WHERE salary_type_id = ?", (id,)).fetchone()[0]
-    if count > 0:
-        conn.close()
-        return jsonify({'error': 'Bu opsiyon çalışanlar tarafından kullanılıyor, silinemez.'}), 400
-
-    conn.execute("DELETE FROM salary_types WHERE id = ?", (id,))
-    conn.commit()
-    conn.close()
+    conn = get_db()
+    with write_transaction(conn):
+        # Check usage
+        count = conn.execute("SELECT COUNT(*) FROM employees WHERE salary_type_id = ?", (id,)).fetchone()[0]
+        if count > 0:
+            return jsonify({'error': 'Bu opsiyon çalışanlar tarafından kullanılıyor, silinemez.'}), 400
+
+        conn.execute("DELETE FROM salary_types WHERE id = ?", (id,))
+        bump_version(conn, 'salary_types')
     return jsonify({'message': 'Silindi.'})
 
 # --- Çalışanlar API ---
+EMPLOYEE_SELECT = """
+    SELECT e.*, s.name as salary_type_name,
+           s.include_min_wage, s.include_fixed_salary, s.include_fixed_overtime_pay,
+           s.include_fixed_hours_quota, s.include_overtime_calc, s.include_on_call
+    FROM employees e
+    LEFT JOIN salary_types s ON e.salary_type_id = s.id
+"""
+EMPLOYEE_PAGE_MAX = 500
+# sort parametresi -> (kolon, azalan mı); aynı değerli satırlar e.id ile sıralanır (keyset için tekil anahtar)
+EMPLOYEE_SORTS = {'name': ('e.name', False), '-name': ('e.name', True), 'id': ('e.id', False), '-id': ('e.id', True)}
+
+def _encode_cursor(value, last_id):
+    return base64.urlsafe_b64encode(json.dumps([value, last_id]).encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return value, int(last_id)
+    except (ValueError, TypeError):
+        raise ValueError('Geçersiz sayfa imleci (after).')
+
+def parse_employee_query(args, default_sort):
+    """?branch=&salaryTypeId=&sort=&limit=&after= parametrelerini doğrular; hata durumunda ValueError."""
+    sort = args.get('sort', default_sort)
+    if sort not in EMPLOYEE_SORTS:
+        raise ValueError(f"Geçersiz sıralama: {sort} (geçerli: {', '.join(EMPLOYEE_SORTS)})")
+    try:
+        salary_type_ids = sorted({int(v) for v in args.getlist('salaryTypeId')})
+    except ValueError:
+        raise ValueError('salaryTypeId tam sayı olmalıdır.')
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError('limit tam sayı olmalıdır.')
+        if not 1 <= limit <= EMPLOYEE_PAGE_MAX:
+            raise ValueError(f'limit 1 ile {EMPLOYEE_PAGE_MAX} arasında olmalıdır.')
+    after = args.get('after')
+    if after is not None and limit is None:
+        raise ValueError('after parametresi limit ile birlikte kullanılmalıdır.')
+    return {
+        'branch': sorted(set(args.getlist('branch'))), 'salaryTypeId': salary_type_ids,
+        'sort': sort, 'limit': limit, 'after': _decode_cursor(after) if after else None
+    }
+
+def is_full_employee_query(query):
+    return not (query['branch'] or query['salaryTypeId'] or query['limit'])
+
+def _keyset_clauses(query, alias='e', id_column='id'):
+    """Filtre, keyset ve sıralama parçaları: (where listesi, parametreler, ORDER BY/LIMIT, imleç kolonu).
+
+    Çalışan listesi ve kapatılmış dönem anlık görüntüsü aynı sorgu parametrelerini paylaşır.
+    """
+    where, params = [], []
+    if query['branch']:
+        where.append(f"{alias}.branch IN ({', '.join('?' for _ in query['branch'])})")
+        params += query['branch']
+    if query['salaryTypeId']:
+        where.append(f"{alias}.salary_type_id IN ({', '.join('?' for _ in query['salaryTypeId'])})")
+        params += query['salaryTypeId']
+    column, desc = EMPLOYEE_SORTS[query['sort']]
+    key = column.split('.')[1]
+    id_expr = f'{alias}.{id_column}'
+    column = id_expr if key == 'id' else f'{alias}.{key}'
+    op, direction = ('<', 'DESC') if desc else ('>', 'ASC')
+    if query['after']:
+        value, last_id = query['after']
+        if column == id_expr:
+            where.append(f"{id_expr} {op} ?")
+            params.append(last_id)
+        else:
+            where.append(f"({column}, {id_expr}) {op} (?, ?)")
+            params += [value, last_id]
+    order = f" ORDER BY {column} {direction}" + (f", {id_expr} {direction}" if column != id_expr else '')
+    if query['limit']:
+        # Bir fazla satır okunarak sonraki sayfanın varlığı anlaşılır
+        order += f" LIMIT {query['limit'] + 1}"
+    return where, params, order, key
+
+def _keyset_page(rows, query, key):
+    next_cursor = None
+    if query['limit'] and len(rows) > query['limit']:
+        rows = rows[:query['limit']]
+        last = rows[-1]
+        next_cursor = _encode_cursor(last[key], last['id'])
+    return rows, next_cursor
+
+def fetch_employees(conn, query):
+    """Filtreli/sıralı çalışan satırları ve (sayfalıysa) sonraki sayfanın imleci.
+
+    Sayfalama keyset ile yapılır: (sıralama kolonu, id) son görülen değerden büyük/küçük satırlar;
+    branch/salary_type_id/name indeksleri filtre + sıralamayı karşılar.
+    """
+    where, params, order, key = _keyset_clauses(query)
+    sql = EMPLOYEE_SELECT
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    employees = [dict(row) for row in conn.execute(sql + order, params).fetchall()]
+    return _keyset_page(employees, query, key)
+
+def employee_list_response(items, query, next_cursor):
+    """limit verilmişse {items, nextCursor}, verilmemişse (eski biçim) düz liste."""
+    if query['limit'] is None:
+        return items
+    return {'items': items, 'nextCursor': next_cursor}
+
+def _query_key(query):
+    return repr(sorted(query.items()))
+
 @app.route('/api/employees', methods=['GET'])
 def get_employees():
-    conn = get_db_connection()
-    # Join with salary_types to get name and config
-    query = """
-        SELECT e.*, s.name as salary_type_name,
-               s.include_min_wage, s.include_fixed_salary, s.include_fixed_overtime_pay,
-               s.include_fixed_hours_quota, s.include_overtime_calc, s.include_on_call
-        FROM employees e
-        LEFT JOIN salary_types s ON e.salary_type_id = s.id
-        ORDER BY e.name
-    """
-    employees = conn.execute(query).fetchall()
-    conn.close()
-    return jsonify([dict(emp) for emp in employees])
+    try:
+        query = parse_employee_query(request.args, default_sort='name')
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+
+    def build():
+        employees, next_cursor = fetch_employees(get_db(), query)
+        return employee_list_response(employees, query, next_cursor)
+    return cached_json(f'employees:{_query_key(query)}', ('employees', 'salary_types'), build)
 
 @app.route('/api/employees', methods=['POST'])
 def add_employee():
@@ -307,13 +354,14 @@ def add_employee():
     name, emp_id, branch = data.get('name'), data.get('emp_id'), data.get('branch')
     if not name: return jsonify({'error': 'İsim zorunludur.'}), 400
 
-    conn = get_db_connection()
-    # Get default salary type (first one?)
-    default_type = conn.execute("SELECT id FROM salary_types LIMIT 1").fetchone()
-    salary_type_id = default_type['id'] if default_type else None
+    conn = get_db()
+    with write_transaction(conn):
+        # Get default salary type (first one?)
+        default_type = conn.execute("SELECT id FROM salary_types LIMIT 1").fetchone()
+        salary_type_id = default_type['id'] if default_type else None
 
-    cursor = conn.execute("INSERT INTO employees (name, emp_id, branch, salary_type_id) VALUES (?, ?, ?, ?)", (name, emp_id, branch, salary_type_id))
-    conn.commit()
+        cursor = conn.execute("INSERT INTO employees (name, emp_id, branch, salary_type_id) VALUES (?, ?, ?, ?)", (name, emp_id, branch, salary_type_id))
+        bump_version(conn, 'employees')
     new_id = cursor.lastrowid
 
     # Fetch full object to return
@@ -322,7 +370,6 @@ def add_employee():
         FROM employees e LEFT JOIN salary_types s ON e.salary_type_id = s.id
         WHERE e.id = ?
     """, (new_id,)).fetchone()
-    conn.close()
 
     return jsonify(dict(emp)), 201
 
@@ -338,17 +385,20 @@ def update_employee(id):
     fixed_evening_hours = data.get('fixed_evening_hours')
     branch = data.get('branch')
 
-    conn = get_db_connection()
+    conn = get_db()
 
-    conn.execute("""
-        UPDATE employees SET
-        salary_type_id = ?, fixed_salary = ?, fixed_overtime_pay = ?,
-        fixed_day_hours = ?, fixed_evening_hours = ?, branch = ?
-        WHERE id = ?
-    """, (salary_type_id, fixed_salary, fixed_overtime_pay, fixed_day_hours, fixed_evening_hours, branch, id))
+    with write_transaction(conn):
+        # Foreign key hatası (500) yerine anlamlı yanıt
+        if salary_type_id is not None and not conn.execute("SELECT 1 FROM salary_types WHERE id = ?", (salary_type_id,)).fetchone():
+            return jsonify({'error': f'Maaş türü bulunamadı: {salary_type_id}'}), 400
+        conn.execute("""
+            UPDATE employees SET
+            salary_type_id = ?, fixed_salary = ?, fixed_overtime_pay = ?,
+            fixed_day_hours = ?, fixed_evening_hours = ?, branch = ?
+            WHERE id = ?
+        """, (salary_type_id, fixed_salary, fixed_overtime_pay, fixed_day_hours, fixed_evening_hours, branch, id))
+        bump_version(conn, 'employees')
 
-    conn.commit()
-    conn.close()
     return jsonify({'message': 'Çalışan güncellendi.'})
 
 @app.route('/api/employees/bulk', methods=['POST'])
@@ -356,15 +406,15 @@ def add_bulk_employees():
     employees_data = request.json.get('employees', [])
     if not employees_data: return jsonify({'error': 'Çalışan listesi boş.'}), 400
 
-    conn = get_db_connection()
-    # Get default salary type
-    default_type = conn.execute("SELECT id FROM salary_types LIMIT 1").fetchone()
-    salary_type_id = default_type['id'] if default_type else None
+    conn = get_db()
+    with write_transaction(conn):
+        # Get default salary type
+        default_type = conn.execute("SELECT id FROM salary_types LIMIT 1").fetchone()
+        salary_type_id = default_type['id'] if default_type else None
 
-    conn.executemany("INSERT INTO employees (name, emp_id, branch, salary_type_id) VALUES (?, ?, ?, ?)",
-                     [(e.get('name'), e.get('emp_id'), e.get('branch'), salary_type_id) for e in employees_data])
-    conn.commit()
-    conn.close()
+        conn.executemany("INSERT INTO employees (name, emp_id, branch, salary_type_id) VALUES (?, ?, ?, ?)",
+                         [(e.get('name'), e.get('emp_id'), e.get('branch'), salary_type_id) for e in employees_data])
+        bump_version(conn, 'employees')
     return jsonify({'message': f'{len(employees_data)} çalışan eklendi.'}), 201
 
 @app.route('/api/employees/template', methods=['GET'])
@@ -381,9 +431,8 @@ def download_employee_template():
     sheet.append(headers)
 
     # Add validation info as a second sheet
-    conn = get_db_connection()
+    conn = get_db()
     types = conn.execute("SELECT name FROM salary_types").fetchall()
-    conn.close()
 
     info_sheet = wb.create_sheet("Bilgi")
     info_sheet.append(["Geçerli Ödeme Tipleri (Kopyalayıp Yapıştırın)"])
@@ -395,121 +444,308 @@ def download_employee_template():
     output.seek(0)
     return send_file(output, as_attachment=True, download_name='calisan_ekleme_sablonu.xlsx')
 
-@app.route('/api/employees/upload', methods=['POST'])
-def upload_employees():
-    file = request.files.get('file')
-    if not file: return jsonify({'error': 'Dosya bulunamadı.'}), 400
-
-    wb = openpyxl.load_workbook(file)
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 5000))
+IMPORT_MAX_REPORTED_ERRORS = 500
+
+def _chunks(items, size=IMPORT_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _add_import_error(errors, sheet, row, message):
+    """Satır bazlı hata raporuna ekler; yanıt boyutu sınırlı kalsın diye ilk N hata saklanır."""
+    errors['count'] += 1
+    if len(errors['items']) < IMPORT_MAX_REPORTED_ERRORS:
+        errors['items'].append({'sheet': sheet, 'row': row, 'message': message})
+
+def _import_result(message, imported, errors):
+    if errors['count']:
+        message += f" {errors['count']} satırda hata/uyarı var."
+    return {'message': message, 'imported': imported, 'errorCount': errors['count'], 'errors': errors['items']}
+
+def _row_progress(progress, sheet, start, span):
+    """read_only sayfada satır numarasını [start, start + span] aralığında ilerlemeye çeviren fonksiyon döner."""
+    total = sheet.max_row or 0
+    def report(row_no):
+        if progress and total and row_no % 500 == 0:
+            progress(start + span * row_no / total, f"{sheet.title}: {row_no}/{total} satır okundu")
+    return report
+
+def import_employees_workbook(conn, file, progress=None, job=None):
+    """Çalışan Excel'ini doğrular ve tek transaction'da ekler; sonuç özetini döner.
+
+    Ekleme UPSERT değildir: job verilirse sonuç eklemeyle aynı transaction'da işe kaydedilir ve
+    yeniden denenen iş (ör. commit sonrası ölen worker) çalışanları ikinci kez eklemez.
+    """
+    # read_only: hücre nesneleri oluşturmadan satır satır akış halinde okunur
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
     sheet = wb.active
     employees_to_add = []
+    errors = {'count': 0, 'items': []}
+    report_row = _row_progress(progress, sheet, 0.0, 0.9)
 
-    conn = get_db_connection()
     # Load all salary types into a map: Name -> ID
     salary_types = {row['name']: row['id'] for row in conn.execute("SELECT name, id FROM salary_types").fetchall()}
     default_type_id = list(salary_types.values())[0] if salary_types else None
-    conn.close()
 
-    def safe_float(val):
+    def parse_float(row_no, label, val):
+        if val is None or val == '': return 0.0
         try: return float(val)
-        except (ValueError, TypeError): return 0.0
-
-    # Headers in row 1
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        if not row[0]: continue
-
-        name = row[0]
+        except (ValueError, TypeError):
+            _add_import_error(errors, sheet.title, row_no, f"{label} sayı değil ({val}), 0 kabul edildi.")
+            return 0.0
+
+    # Headers in row 1; doğrulama geçişi
+    for row_no, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), 2):
+        report_row(row_no)
+        if not row or all(v is None or v == '' for v in row): continue
+        row = tuple(row) + (None,) * (8 - len(row))
+        if not row[0]:
+            _add_import_error(errors, sheet.title, row_no, "Ad Soyad boş, satır atlandı.")
+            continue
+
+        name = str(row[0]).strip()
         emp_id = str(row[1]) if row[1] else None
-        branch = row[2] if len(row) > 2 else None
+        branch = row[2]
 
         # Salary Type Lookup
-        payment_type_str = row[3] if len(row) > 3 else None
+        payment_type_str = row[3]
         salary_type_id = salary_types.get(payment_type_str, default_type_id)
+        if payment_type_str and payment_type_str not in salary_types:
+            _add_import_error(errors, sheet.title, row_no, f"Ödeme tipi bulunamadı ({payment_type_str}), varsayılan opsiyon kullanıldı.")
 
-        fixed_salary = safe_float(row[4] if len(row) > 4 else 0)
-        fixed_overtime_pay = safe_float(row[5] if len(row) > 5 else 0)
-        fixed_day_hours = safe_float(row[6] if len(row) > 6 else 0)
-        fixed_evening_hours = safe_float(row[7] if len(row) > 7 else 0)
-
-        employees_to_add.append({
-            'name': name, 'emp_id': emp_id, 'branch': branch,
-            'salary_type_id': salary_type_id,
-            'fixed_salary': fixed_salary,
-            'fixed_overtime_pay': fixed_overtime_pay,
-            'fixed_day_hours': fixed_day_hours,
-            'fixed_evening_hours': fixed_evening_hours
-        })
-
-    if not employees_to_add: return jsonify({'message': 'Eklenecek çalışan bulunamadı.'})
-
-    conn = get_db_connection()
-    conn.executemany("""
-        INSERT INTO employees (
+        employees_to_add.append((
             name, emp_id, branch, salary_type_id,
-            fixed_salary, fixed_overtime_pay,
-            fixed_day_hours, fixed_evening_hours
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, [(
-        e['name'], e['emp_id'], e['branch'], e['salary_type_id'],
-        e['fixed_salary'], e['fixed_overtime_pay'],
-        e['fixed_day_hours'], e['fixed_evening_hours']
-    ) for e in employees_to_add])
-    conn.commit()
-    conn.close()
-    return jsonify({'message': f'{len(employees_to_add)} çalışan Excel\'den eklendi.'})
+            parse_float(row_no, 'Sabit Maaş', row[4]), parse_float(row_no, 'Sabit FM Ücreti', row[5]),
+            parse_float(row_no, 'Gündüz Sabit Ders', row[6]), parse_float(row_no, 'Akşam Sabit Ders', row[7])
+        ))
+    wb.close()
+
+    if not employees_to_add: return _import_result('Eklenecek çalışan bulunamadı.', 0, errors)
+
+    if progress: progress(0.9, f"{len(employees_to_add)} çalışan kaydediliyor")
+    with write_transaction(conn):
+        applied = job.applied_result(conn) if job else None
+        if applied is not None:
+            return applied
+        for chunk in _chunks(employees_to_add):
+            conn.executemany("""
+                INSERT INTO employees (
+                    name, emp_id, branch, salary_type_id,
+                    fixed_salary, fixed_overtime_pay,
+                    fixed_day_hours, fixed_evening_hours
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, chunk)
+        bump_version(conn, 'employees')
+        result = _import_result(f'{len(employees_to_add)} çalışan Excel\'den eklendi.', len(employees_to_add), errors)
+        if job: job.mark_applied(conn, result)
+    return result
+
+@jobs.handler('import_employees')
+def _import_employees_job(conn, job):
+    with open(job.input_path, 'rb') as f:
+        return import_employees_workbook(conn, f, job.progress, job)
+
+@app.route('/api/employees/upload', methods=['POST'])
+def upload_employees():
+    file = request.files.get('file')
+    if not file: return jsonify({'error': 'Dosya bulunamadı.'}), 400
+    if run_sync():
+        return jsonify(import_employees_workbook(get_db(), file))
+    return job_response(jobs.submit(get_db(), 'import_employees', input_file=file.stream, input_suffix='.xlsx'))
 
 @app.route('/api/employees/<int:id>', methods=['DELETE'])
 def delete_employee(id):
-    conn = get_db_connection()
-    conn.execute('DELETE FROM employees WHERE id = ?', (id,))
-    conn.commit()
-    conn.close()
+    conn = get_db()
+    with write_transaction(conn):
+        conn.execute('DELETE FROM employees WHERE id = ?', (id,))
+        bump_version(conn, 'employees')
     return jsonify({'message': 'Çalışan silindi.'})
 
 # --- Tatiller API ---
 @app.route('/api/holidays', methods=['GET'])
 def get_holidays():
-    conn = get_db_connection()
+    conn = get_db()
     holidays = conn.execute('SELECT date FROM holidays ORDER BY date').fetchall()
-    conn.close()
     return jsonify([h['date'] for h in holidays])
 
 @app.route('/api/holidays', methods=['POST'])
 def add_holiday():
     date = request.json.get('date')
     if not date: return jsonify({'error': 'Tarih zorunludur.'}), 400
-    conn = get_db_connection()
+    conn = get_db()
     try:
-        conn.execute("INSERT INTO holidays (date) VALUES (?)", (date,))
-        conn.commit()
+        with write_transaction(conn):
+            conn.execute("INSERT INTO holidays (date) VALUES (?)", (date,))
+            bump_version(conn, 'holidays')
+            rebuild_monthly_totals(conn, date[:7])
     except sqlite3.IntegrityError:
         return jsonify({'error': 'Bu tarih zaten ekli.'}), 409
-    finally: conn.close()
     return jsonify({'message': 'Tatil eklendi.'}), 201
 
+@app.route('/api/holidays/official', methods=['GET'])
+def get_official_holidays():
+    year = request.args.get('year', type=int) or datetime.now().year
+    conn = get_db()
+    holidays = conn.execute(
+        "SELECT date, description FROM official_holidays WHERE date >= ? AND date < ? ORDER BY date",
+        (f"{year:04d}-01-01", f"{year + 1:04d}-01-01")
+    ).fetchall()
+    return jsonify([dict(h) for h in holidays])
+
+@app.route('/api/holidays/official/import', methods=['POST'])
+def import_official_holidays():
+    """Bir veya birden çok yılın resmi tatil takvimini içe aktarır; verilen yılların kayıtları değiştirilir.
+
+    JSON: {"holidays": [{"date": "YYYY-MM-DD", "description": "..."}]} veya
+    Excel dosyası (1. satır başlık; A: Tarih, B: Açıklama).
+    """
+    file = request.files.get('file')
+    if file:
+        wb = openpyxl.load_workbook(file, read_only=True)
+        items = [{'date': row[0], 'description': row[1] if len(row) > 1 else None}
+                 for row in wb.active.iter_rows(min_row=2, values_only=True) if row and row[0]]
+    else:
+        items = (request.json or {}).get('holidays', [])
+    if not items: return jsonify({'error': 'Tatil listesi boş.'}), 400
+
+    rows = []
+    for item in items:
+        value = item.get('date')
+        try:
+            parsed = value if isinstance(value, date) else date.fromisoformat(str(value))
+        except ValueError:
+            return jsonify({'error': f'Geçersiz tarih: {value}'}), 400
+        if isinstance(parsed, datetime): parsed = parsed.date()
+        rows.append((parsed.isoformat(), item.get('description')))
+    years = sorted({d[:4] for d, _ in rows})
+
+    conn = get_db()
+    with write_transaction(conn):
+        conn.executemany("DELETE FROM official_holidays WHERE date >= ? AND date < ?",
+                         [(f"{y}-01-01", f"{int(y) + 1:04d}-01-01") for y in years])
+        conn.executemany("INSERT OR REPLACE INTO official_holidays (date, description) VALUES (?, ?)", rows)
+        bump_version(conn, 'official_holidays')
+        # Tatil kategorisi değişen günlerin aylık özetlerini yeniden hesapla
+        rebuild_monthly_totals(conn, f"{years[0]}-01", f"{years[-1]}-12")
+    return jsonify({'message': f'{len(rows)} resmi tatil içe aktarıldı ({", ".join(years)}).'}), 201
+
 @app.route('/api/holidays/<string:date>', methods=['DELETE'])
 def delete_holiday(date):
-    conn = get_db_connection()
-    conn.execute('DELETE FROM holidays WHERE date = ?', (date,))
-    conn.commit()
-    conn.close()
+    conn = get_db()
+    with write_transaction(conn):
+        conn.execute('DELETE FROM holidays WHERE date = ?', (date,))
+        bump_version(conn, 'holidays')
+        rebuild_monthly_totals(conn, date[:7])
     return jsonify({'message': 'Tatil silindi.'})
 
 # --- Çalışma Saatleri API ---
-@app.route('/api/worklogs/<string:year_month>', methods=['GET'])
-def get_work_logs(year_month):
-    conn = get_db_connection()
+def build_work_logs(conn, year_month):
+    """{emp_id: {tarih: {day, evening, reason}}} biçimindeki ay verisi."""
+    month_start, month_end = get_month_bounds(year_month)
     logs_data = conn.execute(
-        "SELECT employee_id, date, day_hours, evening_hours, sunday_reason FROM work_logs WHERE strftime('%Y-%m', date) = ?",
-        (year_month,)
+        f"SELECT employee_id, date, day_hours, evening_hours, sunday_reason FROM {work_log_table(conn, year_month)} WHERE date >= ? AND date < ?",
+        (month_start, month_end)
     ).fetchall()
-    conn.close()
     result = {}
     for log in logs_data:
         emp_id = str(log['employee_id'])
         if emp_id not in result: result[emp_id] = {}
         result[emp_id][log['date']] = {'day': log['day_hours'], 'evening': log['evening_hours'], 'reason': log['sunday_reason']}
-    return jsonify(result)
+    return result
+
+def build_work_log_matrix(conn, year_month):
+    """Kompakt ay matrisi: çalışan başına ayın günlerine göre indekslenen yoğun saat dizileri.
+
+    {"month", "days", "seq", "rows": {emp_id: {"day": [...], "evening": [...]}}, "reasons": {emp_id: {gün: gerekçe}}}
+    Dizilerin i. elemanı ayın (i + 1). günüdür; gerekçeler yalnızca dolu olan günler için yazılır.
+    seq, verinin okunduğu andaki değişiklik sıra numarasıdır (sonraki ?since= istekleri için).
+    """
+    month_start, month_end = get_month_bounds(year_month)
+    days = get_days_in_month(year_month)
+    rows, reasons = {}, {}
+    table = work_log_table(conn, year_month)
+    with read_transaction(conn):
+        seq = get_change_seq(conn)
+        for emp_id, date_str, day_hours, evening_hours, reason in conn.execute(
+                f"SELECT employee_id, date, day_hours, evening_hours, sunday_reason FROM {table} WHERE date >= ? AND date < ?",
+                (month_start, month_end)):
+            row = rows.get(emp_id)
+            if row is None:
+                row = rows[emp_id] = {'day': [0] * days, 'evening': [0] * days}
+            day = int(date_str[8:10])
+            row['day'][day - 1] = day_hours or 0
+            row['evening'][day - 1] = evening_hours or 0
+            if reason:
+                reasons.setdefault(emp_id, {})[day] = reason
+    return {'month': year_month, 'days': days, 'seq': seq, 'rows': rows, 'reasons': reasons}
+
+def build_work_log_delta(conn, year_month, since):
+    """`since` sıra numarasından sonra değişen hücreler ve yeni sıra numarası.
+
+    {"month", "since", "seq", "changes": [{"empId", "date", "day", "evening", "reason"}]}; silinen
+    hücreler 0/null değerlerle gelir. Değişiklik geçmişi yetmiyorsa "reset": true döner ve istemci
+    ayı baştan yükler.
+    """
+    table = work_log_table(conn, year_month)
+    with read_transaction(conn):
+        seq = get_change_seq(conn)
+        cells = changed_cells_since(conn, year_month, since, table)
+    if cells is None:
+        return {'month': year_month, 'since': since, 'seq': seq, 'reset': True}
+    return {'month': year_month, 'since': since, 'seq': seq, 'changes': live.cell_changes(cells)}
+
+WORK_LOG_FORMATS = {'nested': build_work_logs, 'matrix': build_work_log_matrix}
+
+@app.route('/api/worklogs/<string:year_month>', methods=['GET'])
+def get_work_logs(year_month):
+    since = request.args.get('since')
+    if since is not None:
+        # Artımlı senkronizasyon: önbelleğe alınmaz, indeksli küçük bir sorgudur
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({'error': 'since tam sayı olmalıdır.'}), 400
+        return jsonify(build_work_log_delta(get_db(), year_month, since))
+    fmt = request.args.get('format', 'nested')
+    if fmt not in WORK_LOG_FORMATS: return jsonify({'error': f'Bilinmeyen format: {fmt}'}), 400
+    # Çalışan silinince logları da (cascade) silindiği için 'employees' sürümüne de bağlı
+    return cached_json(f'worklogs:{year_month}:{fmt}', (f'worklogs:{year_month}', 'employees'),
+                       lambda: WORK_LOG_FORMATS[fmt](get_db(), year_month))
+
+@app.route('/api/worklogs/<string:year_month>/stream', methods=['GET'])
+def stream_work_logs(year_month):
+    """Ayın hücre değişikliklerini Server-Sent Events olarak akıtır (bkz. live.py).
+
+    `since` (EventSource yeniden bağlanırken Last-Event-ID başlığı) verilirse önce o numaradan sonraki
+    değişiklikler gönderilir. Olaylar: `changes` (?since= yanıtıyla aynı biçim) ve `reset`.
+    """
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({'error': 'since tam sayı olmalıdır.'}), 400
+    # Abonelik yakalama sorgusundan önce açılır; aradaki değişiklikler kuyruğa düşer
+    subscription = live.hub.subscribe(year_month, live.LIVE_MAX_STREAMS)
+    if subscription is None:
+        return jsonify({'error': 'Canlı akış sınırına ulaşıldı.'}), 503
+    try:
+        first_events = []
+        if since is None:
+            seq = get_change_seq(get_db())
+        else:
+            delta = build_work_log_delta(get_db(), year_month, since)
+            seq = delta['seq']
+            if delta.get('reset') or delta['changes']:
+                first_events.append(live.format_event('reset' if delta.get('reset') else 'changes', delta, seq))
+    except Exception:
+        live.hub.unsubscribe(subscription)
+        raise
+    # stream_with_context kullanılmaz: bağlantı havuza istek bitince döner, akış boyunca tutulmaz
+    response = app.response_class(live.stream(subscription, first_events, seq), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/worklogs', methods=['POST'])
 def update_work_log():
@@ -522,82 +758,196 @@ def update_work_log():
     except (ValueError, TypeError):
         return jsonify({'error': 'Saat değeri tam sayı olmalıdır.'}), 400
 
-    field = 'day_hours' if log_type == 'day' else 'evening_hours'
-    conn = get_db_connection()
-    existing_log = conn.execute("SELECT id FROM work_logs WHERE employee_id = ? AND date = ?", (emp_id, date)).fetchone()
-    if existing_log:
-        query = f"UPDATE work_logs SET {field} = ?"
-        params = [value]
-        if reason is not None:
-            query += ", sunday_reason = ?"
-            params.append(reason)
-        query += " WHERE id = ?"
-        params.append(existing_log['id'])
-        conn.execute(query, tuple(params))
-    else:
-        other_field = 'evening_hours' if log_type == 'day' else 'day_hours'
-        conn.execute(f"INSERT INTO work_logs (employee_id, date, {field}, {other_field}, sunday_reason) VALUES (?, ?, ?, 0, ?)",
-                     (emp_id, date, value, reason))
-    conn.commit()
-    conn.close()
+    conn = get_db()
+    # Kilit kontrolü yazma kilidi altında yapılır: arada kapatılan dönem trigger hatasına (500) dönüşmez
+    with write_transaction(conn):
+        if closed_months(conn, [str(date)[:7]]):
+            return jsonify({'error': f'{str(date)[:7]} dönemi kapatılmış; mesai kaydı değiştirilemez.'}), 409
+        if not conn.execute("SELECT 1 FROM employees WHERE id = ?", (emp_id,)).fetchone():
+            return jsonify({'error': f'Çalışan bulunamadı: {emp_id}'}), 404
+        update_work_log_db(conn, emp_id, date, log_type, value, reason)
+        bump_version(conn, f'worklogs:{str(date)[:7]}')
     return jsonify({'message': 'Çalışma saati güncellendi.'})
 
+WORKLOG_BATCH_MAX = int(os.getenv('WORKLOG_BATCH_MAX', 5000))
+
+def _validate_worklog_change(change, employee_ids, locked_months=frozenset()):
+    """Grid'den gelen tek hücre değişikliğini doğrular; (emp_id, date, type, value, reason) veya hata mesajı döner."""
+    if not isinstance(change, dict): return None, 'Geçersiz hücre verisi.'
+    try:
+        emp_id = int(change.get('empId'))
+    except (ValueError, TypeError):
+        return None, 'Çalışan id geçersiz.'
+    if emp_id not in employee_ids: return None, f'Çalışan bulunamadı: {emp_id}'
+    try:
+        date_str = date.fromisoformat(str(change.get('date'))).isoformat()
+    except ValueError:
+        return None, f"Tarih geçersiz: {change.get('date')}"
+    if date_str[:7] in locked_months: return None, f'Dönem kapatılmış: {date_str[:7]}'
+    log_type = change.get('type')
+    if log_type not in ('day', 'evening'): return None, f'Saat tipi geçersiz: {log_type}'
+    try:
+        value = int(change.get('value') or 0)
+    except (ValueError, TypeError):
+        return None, 'Saat değeri tam sayı olmalıdır.'
+    if value < 0: return None, 'Saat değeri negatif olamaz.'
+    reason = change.get('reason')
+    if reason is not None and not isinstance(reason, str): return None, 'Gerekçe metin olmalıdır.'
+    return (emp_id, date_str, log_type, value, reason), None
+
+@app.route('/api/worklogs/batch', methods=['POST'])
+def update_work_logs_batch():
+    """Grid'de biriken hücre değişikliklerini tek transaction'da uygular; hücre bazında sonuç döner.
+
+    Geçersiz hücreler atlanır (allOrNothing: true verilirse hiçbir değişiklik yazılmaz).
+    Değişiklikler gönderildiği sırayla uygulanır: aynı hücrenin saati ya da gerekçesi birden fazla
+    gelirse sonuncusu geçerlidir.
+    """
+    data = request.get_json(silent=True) or {}
+    changes = data.get('changes')
+    if not isinstance(changes, list): return jsonify({'error': 'changes listesi gerekli.'}), 400
+    if len(changes) > WORKLOG_BATCH_MAX:
+        return jsonify({'error': f'Tek seferde en fazla {WORKLOG_BATCH_MAX} hücre gönderilebilir.'}), 413
+
+    conn = get_db()
+    # Doğrulama yazma kilidi altında yapılır: arada kapatılan dönemin hücreleri hatalı sayılır
+    with write_transaction(conn):
+        employee_ids = {row[0] for row in conn.execute("SELECT id FROM employees").fetchall()}
+        locked = closed_months(conn, [str(c.get('date'))[:7] for c in changes if isinstance(c, dict)])
+        results, valid = [], []
+        for change in changes:
+            cell, error = _validate_worklog_change(change, employee_ids, locked)
+            results.append({'ok': False, 'error': error} if error else {'ok': True})
+            if cell: valid.append(cell)
+        error_count = len(changes) - len(valid)
+
+        if error_count and data.get('allOrNothing'):
+            for result in results:
+                if result['ok']: result.update(ok=False, error='Toplu işlemdeki başka hücreler geçersiz olduğu için yazılmadı.')
+            return jsonify({'applied': 0, 'errorCount': error_count, 'results': results}), 400
+
+        if valid:
+            # Gündüz ve akşam satırları ortak sunday_reason sütununu yazar; sıra korunarak
+            # aynı tipteki ardışık hücreler tek executemany ile gönderilir
+            for log_type, cells in groupby(valid, key=lambda cell: cell[2]):
+                conn.executemany(_work_log_upsert_sql(log_type),
+                                 [(emp_id, date_str, value, reason) for emp_id, date_str, _, value, reason in cells])
+            bump_version(conn, *{f'worklogs:{cell[1][:7]}' for cell in valid})
+    return jsonify({'applied': len(valid), 'errorCount': error_count, 'results': results})
+
+def _header_date(value):
+    """Şablon başlığındaki tarihi 'YYYY-MM-DD' olarak döner (Excel'in tarihe çevirdiği hücreler dahil)."""
+    if isinstance(value, datetime): return value.date().isoformat()
+    if isinstance(value, date): return value.isoformat()
+    try: return date.fromisoformat(str(value).strip()).isoformat()
+    except ValueError: return None
+
+def import_worklogs_workbook(conn, file, progress=None):
+    """Gündüz/Akşam Mesaisi sayfalarını doğrular ve tek transaction'da toplu UPSERT eder; sonuç özetini döner."""
+    employees = {str(e['name']).strip(): e['id'] for e in conn.execute("SELECT id, name FROM employees").fetchall()}
+    # read_only + values_only: büyük çok sayfalı dosyalarda hücre nesneleri oluşturulmaz
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    errors = {'count': 0, 'items': []}
+    locked = {row[0] for row in conn.execute("SELECT year_month FROM closed_periods")}
+
+    def collect_sheet(sheet_name, start):
+        rows = []
+        if sheet_name not in wb.sheetnames: return rows
+        report_row = _row_progress(progress, wb[sheet_name], start, 0.45)
+        sheet_rows = wb[sheet_name].iter_rows(values_only=True)
+        header = next(sheet_rows, None) or ()
+        dates = [_header_date(v) if i and v is not None else None for i, v in enumerate(header)]
+        for i, v in enumerate(header):
+            if i and v is not None and dates[i] is None:
+                _add_import_error(errors, sheet_name, 1, f"{i + 1}. sütun başlığı geçerli bir tarih değil ({v}), sütun atlandı.")
+            elif dates[i] is not None and dates[i][:7] in locked:
+                _add_import_error(errors, sheet_name, 1, f"{dates[i]}: {dates[i][:7]} dönemi kapatılmış, sütun atlandı.")
+                dates[i] = None
+        for row_no, row in enumerate(sheet_rows, 2):
+            report_row(row_no)
+            if not row or row[0] is None or row[0] == '': continue
+            emp_id = employees.get(str(row[0]).strip())
+            if emp_id is None:
+                _add_import_error(errors, sheet_name, row_no, f"Çalışan bulunamadı: {row[0]}")
+                continue
+            for i, hours in enumerate(row[1:len(dates)], 1):
+                if not hours or dates[i] is None: continue
+                try:
+                    hours_val = int(float(hours))
+                except (ValueError, TypeError):
+                    _add_import_error(errors, sheet_name, row_no, f"{dates[i]}: saat değeri sayı değil ({hours}).")
+                    continue
+                if hours_val < 0:
+                    _add_import_error(errors, sheet_name, row_no, f"{dates[i]}: saat değeri negatif olamaz ({hours}).")
+                elif hours_val > 0:
+                    rows.append((emp_id, dates[i], hours_val))
+        return rows
+
+    day_rows = collect_sheet('Gündüz Mesaisi', 0.0)
+    evening_rows = collect_sheet('Akşam Mesaisi', 0.45)
+    wb.close()
+
+    # Tüm hücreler tek transaction içinde, parçalar halinde toplu UPSERT ile yazılır
+    # (yazma kilidi yalnızca doğrulama bittikten sonra tutulur)
+    if progress: progress(0.9, f"{len(day_rows) + len(evening_rows)} hücre kaydediliyor")
+    with write_transaction(conn):
+        # Doğrulama sırasında kapatılan aylar yazma kilidi altında yeniden kontrol edilip atlanır
+        closed = closed_months(conn, {date_str[:7] for _, date_str, _ in day_rows + evening_rows}) - locked
+        for year_month in sorted(closed):
+            _add_import_error(errors, 'Çalışma Saatleri', 1, f"{year_month} dönemi yükleme sırasında kapatıldı, atlandı.")
+        if closed:
+            day_rows = [row for row in day_rows if row[1][:7] not in closed]
+            evening_rows = [row for row in evening_rows if row[1][:7] not in closed]
+        for log_type, rows in (('day', day_rows), ('evening', evening_rows)):
+            for chunk in _chunks(rows):
+                update_work_logs_bulk(conn, log_type, chunk)
+        bump_version(conn, *{f'worklogs:{date_str[:7]}' for _, date_str, _ in day_rows + evening_rows})
+    return _import_result('Çalışma saatleri yüklendi.', len(day_rows) + len(evening_rows), errors)
+
+@jobs.handler('import_worklogs')
+def _import_worklogs_job(conn, job):
+    with open(job.input_path, 'rb') as f:
+        return import_worklogs_workbook(conn, f, job.progress)
+
 @app.route('/api/worklogs/upload', methods=['POST'])
 def upload_worklogs():
     file = request.files.get('file')
     if not file: return jsonify({'error': 'Dosya bulunamadı.'}), 400
+    if run_sync():
+        return jsonify(import_worklogs_workbook(get_db(), file))
+    return job_response(jobs.submit(get_db(), 'import_worklogs', input_file=file.stream, input_suffix='.xlsx'))
 
-    conn = get_db_connection()
-    employees = {e['name']: e['id'] for e in conn.execute("SELECT id, name FROM employees").fetchall()}
-    wb = openpyxl.load_workbook(file)
-
-    def process_sheet(sheet_name, type_):
-        if sheet_name not in wb.sheetnames: return
-        sheet = wb[sheet_name]
-        headers = [cell.value for cell in sheet[1]]
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            emp_name = row[0]
-            if emp_name in employees:
-                emp_id = employees[emp_name]
-                for i, hours in enumerate(row[1:], 1):
-                    if hours:
-                        try:
-                            hours_val = int(float(hours))
-                            if hours_val > 0:
-                                date_str = headers[i]
-                                update_work_log_db(conn, emp_id, date_str, type_, hours_val)
-                        except (ValueError, TypeError):
-                            continue
-
-    process_sheet('Gündüz Mesaisi', 'day')
-    process_sheet('Akşam Mesaisi', 'evening')
-
-    conn.commit()
-    conn.close()
-    return jsonify({'message': 'Çalışma saatleri yüklendi.'})
-
-def update_work_log_db(conn, emp_id, date_str, log_type, value):
+def _work_log_upsert_sql(log_type):
+    # (employee_id, date) benzersiz indeksi sayesinde tek ifadede ekle-veya-güncelle;
+    # reason NULL gelirse mevcut gerekçe korunur.
     field = 'day_hours' if log_type == 'day' else 'evening_hours'
-    existing = conn.execute("SELECT id FROM work_logs WHERE employee_id = ? AND date = ?", (emp_id, date_str)).fetchone()
-    if existing:
-        conn.execute(f"UPDATE work_logs SET {field} = ? WHERE id = ?", (value, existing['id']))
-    else:
-        other_field = 'evening_hours' if log_type == 'day' else 'day_hours'
-        conn.execute(f"INSERT INTO work_logs (employee_id, date, {field}, {other_field}) VALUES (?, ?, ?, 0)",
-                     (emp_id, date_str, value))
+    return f"""
+        INSERT INTO work_logs (employee_id, date, {field}, sunday_reason) VALUES (?, ?, ?, ?)
+        ON CONFLICT (employee_id, date) DO UPDATE SET
+            {field} = excluded.{field},
+            sunday_reason = COALESCE(excluded.sunday_reason, sunday_reason)
+    """
+
+def update_work_log_db(conn, emp_id, date_str, log_type, value, reason=None):
+    conn.execute(_work_log_upsert_sql(log_type), (emp_id, date_str, value, reason))
+
+def update_work_logs_bulk(conn, log_type, rows):
+    """rows: (emp_id, date_str, value) demetleri. Commit çağırana bırakılır."""
+    if not rows: return
+    conn.executemany(_work_log_upsert_sql(log_type), [(emp_id, date_str, value, None) for emp_id, date_str, value in rows])
 
 @app.route('/api/worklogs/template/<string:year_month>', methods=['GET'])
 def download_worklog_template(year_month):
-    conn = get_db_connection()
+    conn = get_db()
     employees = conn.execute("SELECT name FROM employees ORDER BY name").fetchall()
-    conn.close()
+    calendar = month_calendar(conn, year_month)
 
     wb = openpyxl.Workbook()
     day_sheet = wb.active
     day_sheet.title = "Gündüz Mesaisi"
     evening_sheet = wb.create_sheet("Akşam Mesaisi")
 
-    headers = ['Ad Soyad'] + [f"{year_month}-{str(day).zfill(2)}" for day in range(1, get_days_in_month(year_month) + 1)]
+    headers = ['Ad Soyad'] + calendar.dates
     day_sheet.append(headers)
     evening_sheet.append(headers)
 
@@ -612,108 +962,499 @@ def download_worklog_template(year_month):
 
 
 # --- Raporlama API ---
+REPORT_DEPENDENCIES = ('employees', 'salary_types', 'settings', 'holidays', 'official_holidays')
+
+def build_report(conn, year_month, employees=None):
+    """Ayın maaş raporu; employees verilirse (ör. bir sayfa/filtre) yalnızca onlar için hesaplanır."""
+    if employees is None:
+        # Fetch employees with their salary type config
+        employees = [dict(emp) for emp in conn.execute(EMPLOYEE_SELECT + " ORDER BY e.id").fetchall()]
+        totals_sql, params = "", (year_month,)
+    else:
+        totals_sql, params = " AND employee_id IN (SELECT value FROM json_each(?))", (year_month, json.dumps([e['id'] for e in employees]))
+
+    # Saatler work_logs yerine artımlı tutulan aylık özetten okunur (çalışan başına tek satır)
+    totals = {row[0]: tuple(row[1:]) for row in conn.execute(f"""
+        SELECT employee_id, weekday_day, weekday_evening, weekend_day, weekend_evening
+        FROM monthly_employee_totals WHERE year_month = ?{totals_sql}
+    """, params).fetchall()}
+    calendar = month_calendar(conn, year_month)
+    settings = {s['key']: float(s['value']) for s in conn.execute("SELECT key, value FROM settings").fetchall()}
+
+    if use_parallel(len(employees)):
+        return calculate_payments_parallel(employees, calendar, totals, settings)
+    return calculate_payments_from_totals(employees, calendar, totals, settings)
+
 @app.route('/api/report/<string:year_month>', methods=['GET'])
 def get_report(year_month):
-    conn = get_db_connection()
-    # Fetch employees with their salary type config
-    employees = conn.execute("""
-        SELECT e.*, s.name as salary_type_name,
-               s.include_min_wage, s.include_fixed_salary, s.include_fixed_overtime_pay,
-               s.include_fixed_hours_quota, s.include_overtime_calc, s.include_on_call
-        FROM employees e
-        LEFT JOIN salary_types s ON e.salary_type_id = s.id
-    """).fetchall()
-
-    logs_data = conn.execute("SELECT * FROM work_logs WHERE strftime('%Y-%m', date) = ?", (year_month,)).fetchall()
-    holidays = [h['date'] for h in conn.execute("SELECT date FROM holidays").fetchall()]
+    """Tüm çalışanlar veya ?branch=&salaryTypeId=&sort=&limit=&after= ile seçilen sayfa için rapor."""
+    try:
+        query = parse_employee_query(request.args, default_sort='id')
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+
+    if closed_months(get_db(), [year_month]):
+        # Kapatılmış dönem: hesap yapılmaz, anlık görüntü okunur (kapatma/yeniden açma ay sürümünü artırır)
+        def build_closed():
+            conn = get_db()
+            if is_full_employee_query(query) and query['sort'] == 'id':
+                return get_period_report_body(conn, year_month)
+            items, next_cursor = fetch_snapshot_rows(conn, year_month, query)
+            return employee_list_response(items, query, next_cursor)
+        return cached_json(f'report-closed:{year_month}:{_query_key(query)}', (f'worklogs:{year_month}',), build_closed)
+
+    def build():
+        conn = get_db()
+        if is_full_employee_query(query) and query['sort'] == 'id':
+            return build_report(conn, year_month)
+        employees, next_cursor = fetch_employees(conn, query)
+        return employee_list_response(build_report(conn, year_month, employees), query, next_cursor)
+    return cached_json(f'report:{year_month}:{_query_key(query)}', (f'worklogs:{year_month}',) + REPORT_DEPENDENCIES, build)
+
+RANGE_REPORT_MAX_MONTHS = int(os.getenv('RANGE_REPORT_MAX_MONTHS', 120))
+
+def parse_month_range(args):
+    """?from=YYYY-MM&to=YYYY-MM parametrelerinden aralıktaki ayların listesini döner; hata durumunda ValueError."""
+    bounds = []
+    for name in ('from', 'to'):
+        value = args.get(name, '')
+        try:
+            year, month = map(int, value.split('-'))
+            if len(value) != 7 or not 1 <= month <= 12: raise ValueError
+        except ValueError:
+            raise ValueError(f"'{name}' parametresi YYYY-MM biçiminde olmalıdır.")
+        bounds.append(year * 12 + month - 1)
+    first, last = bounds
+    if first > last: raise ValueError("'from' ayı 'to' ayından sonra olamaz.")
+    if last - first >= RANGE_REPORT_MAX_MONTHS:
+        raise ValueError(f'Aralık en fazla {RANGE_REPORT_MAX_MONTHS} ay olabilir.')
+    return [f'{index // 12:04d}-{index % 12 + 1:02d}' for index in range(first, last + 1)]
+
+def fetch_deleted_snapshot_employees(conn, months, query=None):
+    """Aralıktaki kapatılmış aylarda anlık görüntüsü olup sonradan silinmiş çalışanlar.
+
+    Bilgileri en son anlık görüntüden alınır; query verilirse fetch_employees ile aynı filtre, sıralama
+    ve imleç kuralları uygulanır (sayfa başına en fazla limit + 1 satır).
+    """
+    where, params, order = [], [], " ORDER BY p.employee_id"
+    if query is not None:
+        where, params, order, _ = _keyset_clauses(query, 'p', 'employee_id')
+    sql = """
+        SELECT p.employee_id, p.name, p.branch, p.salary_type_id, p.data FROM (
+            SELECT employee_id, name, branch, salary_type_id, data, MAX(year_month) AS year_month
+            FROM period_snapshot_rows
+            WHERE year_month BETWEEN ? AND ? AND employee_id NOT IN (SELECT id FROM employees)
+            GROUP BY employee_id
+        ) p
+    """
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    employees = []
+    for row in conn.execute(sql + order, [months[0], months[-1]] + params):
+        data = json.loads(row['data'])
+        employees.append({'id': row['employee_id'], 'name': row['name'], 'emp_id': data.get('empId'),
+                          'branch': row['branch'], 'salary_type_id': row['salary_type_id'],
+                          'salary_type_name': data.get('paymentType'), 'deleted': True})
+    return employees
+
+def fetch_range_employees(conn, months, query):
+    """Aralık raporunun çalışanları: güncel çalışanlar ve kapatılmış aylarda yer alıp silinmiş olanlar.
+
+    Kapatılmış ayın raporu anlık görüntüden okunduğu için aralık raporu da o çalışanları içerir.
+    İki liste aynı (sıralama kolonu, id) düzeninde birleştirilip sayfalanır.
+    """
+    where, params, order, key = _keyset_clauses(query)
+    sql = EMPLOYEE_SELECT + (" WHERE " + " AND ".join(where) if where else '')
+    employees = [dict(row) for row in conn.execute(sql + order, params).fetchall()]
+    deleted = fetch_deleted_snapshot_employees(conn, months, query)
+    if deleted:
+        _, desc = EMPLOYEE_SORTS[query['sort']]
+        employees = sorted(employees + deleted, key=lambda emp: (emp[key], emp['id']), reverse=desc)
+        if query['limit']:
+            employees = employees[:query['limit'] + 1]
+    return _keyset_page(employees, query, key)
+
+def build_range_report(conn, months, employees=None):
+    """Aralıktaki tüm ayların raporu; özetler tek sorguda okunur, çalışanlar/ayarlar bir kez yüklenir.
+
+    employees verilmezse güncel çalışanlar ve kapatılmış aylarda yer alıp silinmiş çalışanlar (id sırasıyla).
+    """
+    sql, params = """
+        SELECT employee_id, year_month, weekday_day, weekday_evening, weekend_day, weekend_evening
+        FROM monthly_employee_totals WHERE year_month BETWEEN ? AND ?
+    """, [months[0], months[-1]]
+    if employees is None:
+        employees = [dict(emp) for emp in conn.execute(EMPLOYEE_SELECT + " ORDER BY e.id").fetchall()]
+        deleted = fetch_deleted_snapshot_employees(conn, months)
+        if deleted:
+            employees = sorted(employees + deleted, key=lambda emp: emp['id'])
+    else:
+        sql += " AND employee_id IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps([e['id'] for e in employees]))
+    totals = {(row[0], row[1]): tuple(row[2:]) for row in conn.execute(sql, params)}
+    calendars = {year_month: month_calendar(conn, year_month) for year_month in months}
     settings = {s['key']: float(s['value']) for s in conn.execute("SELECT key, value FROM settings").fetchall()}
-    conn.close()
+    # Kapatılmış aylar yeniden hesaplanmaz, anlık görüntüdeki tutarlar kullanılır
+    frozen = {year_month: {row[0]: json.loads(row[1]) for row in conn.execute(
+                  "SELECT employee_id, data FROM period_snapshot_rows WHERE year_month = ?", (year_month,))}
+              for year_month in sorted(closed_months(conn, months))}
+    # Eşik aralık raporunda çalışan x ay hesap sayısına uygulanır
+    if use_parallel(len(employees) * len(months)):
+        return calculate_range_report_parallel(employees, calendars, totals, settings, frozen)
+    return calculate_range_report(employees, calendars, totals, settings, frozen)
+
+def _build_range_report_response(conn, months, query):
+    if is_full_employee_query(query) and query['sort'] == 'id':
+        return build_range_report(conn, months)
+    employees, next_cursor = fetch_range_employees(conn, months, query)
+    return employee_list_response(build_range_report(conn, months, employees), query, next_cursor)
+
+@app.route('/api/report/range', methods=['GET'])
+def get_range_report():
+    """?from=YYYY-MM&to=YYYY-MM aralığında çalışan başına aylık ve kümülatif ödemeler (sayfalama/filtre destekli)."""
+    try:
+        months = parse_month_range(request.args)
+        query = parse_employee_query(request.args, default_sort='id')
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    deps = tuple(f'worklogs:{year_month}' for year_month in months) + REPORT_DEPENDENCIES
+    return cached_json(f'report-range:{months[0]}:{months[-1]}:{_query_key(query)}', deps,
+                       lambda: _build_range_report_response(get_db(), months, query))
+
+def build_range_report_workbook(conn, months, query):
+    """Aralık raporu: 'Özet' (çalışan x ay toplam hakediş) ve 'Aylık Detay' (çalışan-ay satırları) sayfaları."""
+    employees = None if is_full_employee_query(query) and query['sort'] == 'id' else fetch_range_employees(conn, months, query)[0]
+    report = build_range_report(conn, months, employees)
+    wb = openpyxl.Workbook(write_only=True)
+
+    summary = wb.create_sheet("Özet")
+    summary.append(['Ad Soyad', 'Çalışan No', 'Branş', 'Ödeme Tipi'] + months +
+                   ['Toplam Saat', 'Fazla Mesai Saati', 'Fazla Mesai Ödemesi', 'Toplam Hakediş'])
+    for data in report:
+        summary.append([data['name'], data['empId'], data['branch'], data['paymentType']] +
+                       [round(row['totalPayment'], 2) for row in data['months']] +
+                       [data['total']['totalHours'], data['total']['overtimeHours'],
+                        round(data['total']['overtimePayment'], 2), round(data['total']['totalPayment'], 2)])
+
+    detail = wb.create_sheet("Aylık Detay")
+    detail.append(['Ad Soyad', 'Çalışan No', 'Ay', 'Toplam Saat', 'Fazla Mesai Saati', 'Fazla Mesai Ödemesi',
+                   'Toplam Hakediş', 'Kümülatif Hakediş'])
+    for data in report:
+        for row in data['months']:
+            detail.append([data['name'], data['empId'], row['month'], row['totalHours'], row['overtimeHours'],
+                           round(row['overtimePayment'], 2), round(row['totalPayment'], 2), round(row['cumulativePayment'], 2)])
+    return wb
+
+@jobs.handler('export_range_report')
+def _export_range_report_job(conn, job):
+    months = job.params['months']
+    build_range_report_workbook(conn, months, job.params['query']).save(
+        job.artifact(f'maas-raporu-{months[0]}_{months[-1]}.xlsx', '.xlsx'))
+    return {'message': f'{months[0]} - {months[-1]} aralık raporu hazır.'}
+
+@app.route('/api/report/range/export', methods=['GET', 'POST'])
+def export_range_report():
+    """GET: Excel'i istek içinde üretip gönderir; POST: arka plan işi başlatır."""
+    try:
+        months = parse_month_range(request.args)
+        query = parse_employee_query(request.args, default_sort='id')
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    if request.method == 'POST':
+        return job_response(jobs.submit(get_db(), 'export_range_report', {'months': months, 'query': query}))
+    return send_workbook(build_range_report_workbook(get_db(), months, query), f'maas-raporu-{months[0]}_{months[-1]}.xlsx')
+
+REPORT_EXPORT_COLUMNS = [
+    ('Ad Soyad', 'name', False), ('Çalışan No', 'empId', False), ('Branş', 'branch', False),
+    ('Ödeme Tipi', 'paymentType', False), ('Sabit Maaş', 'fixedSalary', True), ('Asgari Ücret', 'minimumWage', True),
+    ('Fazla Mesai Saati', 'overtimeHours', False), ('Fazla Mesai Ödemesi', 'overtimePayment', True),
+    ('Toplam Hakediş', 'totalPayment', True), ('Açıklama', 'calculationDetails', False),
+]
+EXPORT_QUERY_KEYS = ('branch', 'salaryTypeId', 'sort')
 
-    logs_by_emp = {}
-    for log in logs_data:
-        emp_id = log['employee_id']
-        if emp_id not in logs_by_emp: logs_by_emp[emp_id] = {}
-        logs_by_emp[emp_id][log['date']] = log
+def iter_report_rows(conn, year_month, query=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Rapor satırlarını çalışan parçaları (keyset sayfaları) halinde hesaplayıp tek tek verir.
 
-    report = [calculate_payment_for_employee(dict(emp), year_month, logs_by_emp.get(emp['id'], {}), holidays, settings) for emp in employees]
-    return jsonify(report)
+    Tüm rapor bellekte tutulmaz; tutarlı bir sonuç için çağıran read_transaction içinde tüketmelidir.
+    """
+    query = {'branch': [], 'salaryTypeId': [], 'sort': 'id', **(query or {}), 'limit': chunk_size, 'after': None}
+    closed = bool(closed_months(conn, [year_month]))
+    while True:
+        if closed:
+            rows, next_cursor = fetch_snapshot_rows(conn, year_month, query)
+            yield from rows
+        else:
+            employees, next_cursor = fetch_employees(conn, query)
+            yield from build_report(conn, year_month, employees)
+        if next_cursor is None:
+            return
+        query['after'] = _decode_cursor(next_cursor)
+
+def write_report_export(conn, year_month, writer, query=None):
+    """Raporu seçilen yazıcıyla (CSV/NDJSON/XLSX) bytes parçaları olarak üretir."""
+    with read_transaction(conn):
+        yield from writer.write(REPORT_EXPORT_COLUMNS, iter_report_rows(conn, year_month, query), 'Maaş Raporu')
+
+@jobs.handler('export_report')
+def _export_report_job(conn, job):
+    year_month = job.params['yearMonth']
+    writer = WRITERS[job.params.get('format', 'xlsx')]
+    with open(job.artifact(f'maas-raporu-{year_month}{writer.extension}', writer.extension), 'wb') as f:
+        for chunk in write_report_export(conn, year_month, writer, job.params.get('query')):
+            f.write(chunk)
+    return {'message': f'{year_month} maaş raporu hazır.'}
+
+def parse_export_request(args):
+    """?format=csv|ndjson|xlsx (varsayılan xlsx) ve rapor filtreleri; hata durumunda ValueError."""
+    fmt = args.get('format', 'xlsx')
+    get_writer(fmt)
+    query = parse_employee_query(args, default_sort='id')
+    return fmt, {key: query[key] for key in EXPORT_QUERY_KEYS}
 
 @app.route('/api/report/export/<string:year_month>', methods=['GET'])
 def export_report(year_month):
-    report_data = get_report(year_month).get_json()
-    wb = openpyxl.Workbook()
-    sheet = wb.active
-    sheet.title = "Maaş Raporu"
-
-    headers = ['Ad Soyad', 'Çalışan No', 'Branş', 'Ödeme Tipi', 'Sabit Maaş', 'Asgari Ücret',
-               'Fazla Mesai Saati', 'Fazla Mesai Ödemesi', 'Toplam Hakediş', 'Açıklama']
-    sheet.append(headers)
-
-    for data in report_data:
-        sheet.append([
-            data['name'], data['empId'], data.get('branch', ''), data['paymentType'],
-            f"{data['fixedSalary']:.2f}", f"{data['minimumWage']:.2f}",
-            data['overtimeHours'], f"{data['overtimePayment']:.2f}",
-            f"{data['totalPayment']:.2f}", data['calculationDetails']
-        ])
-
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return send_file(output, as_attachment=True, download_name=f'maas-raporu-{year_month}.xlsx')
-
-@app.route('/api/export_all', methods=['GET'])
-def export_all_data():
-    conn = get_db_connection()
-
-    employees = conn.execute("""
-        SELECT e.id, e.name, e.emp_id, e.branch, s.name as salary_type,
-               e.fixed_salary, e.fixed_overtime_pay, e.fixed_day_hours, e.fixed_evening_hours
-        FROM employees e LEFT JOIN salary_types s ON e.salary_type_id = s.id
-        ORDER BY e.name
-    """).fetchall()
-
-    work_logs = conn.execute("""
-        SELECT e.name, w.date, w.day_hours, w.evening_hours, w.sunday_reason
-        FROM work_logs w JOIN employees e ON w.employee_id = e.id
-        ORDER BY e.name, w.date
-    """).fetchall()
-    holidays = conn.execute("SELECT date FROM holidays ORDER BY date").fetchall()
-    settings = conn.execute("SELECT key, value FROM settings").fetchall()
+    """Raporu istek içinde akıtır: CSV/NDJSON ilk çalışan parçası hesaplanınca gönderilmeye başlar."""
+    try:
+        fmt, query = parse_export_request(request.args)
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    writer = WRITERS[fmt]
+    response = app.response_class(stream_with_context(write_report_export(get_db(), year_month, writer, query)),
+                                  mimetype=writer.mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=maas-raporu-{year_month}{writer.extension}'
+    return response
+
+@app.route('/api/report/export/<string:year_month>', methods=['POST'])
+def start_export_report(year_month):
+    try:
+        fmt, query = parse_export_request(request.args)
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    return job_response(jobs.submit(get_db(), 'export_report', {'yearMonth': year_month, 'format': fmt, 'query': query}))
+
+# --- Dönem kapatma API ---
+# Kapatılan ayın raporu bir kez hesaplanıp closed_periods / period_snapshot_rows tablolarına yazılır;
+# sonraki rapor ve dışa aktarma istekleri hesap yapmadan buradan okunur, ayın mesai kayıtları kilitlenir.
+# Sonradan değişen ayarlar, maaş türleri, tatiller veya çalışan bilgileri kapatılmış dönemi etkilemez.
+
+def get_period_report_body(conn, year_month):
+    """Kapatılmış dönemin tam raporu: saklanan JSON gövdesi (bytes); dönem açıksa None."""
+    row = conn.execute("SELECT report FROM closed_periods WHERE year_month = ?", (year_month,)).fetchone()
+    return row[0].encode('utf-8') if row else None
+
+def fetch_snapshot_rows(conn, year_month, query):
+    """Anlık görüntüdeki rapor satırları; fetch_employees ile aynı filtre, sıralama ve imleç kuralları."""
+    where, params, order, key = _keyset_clauses(query, 'p', 'employee_id')
+    sql = "SELECT p.employee_id AS id, p.name, p.data FROM period_snapshot_rows p WHERE p.year_month = ?"
+    rows = conn.execute(sql + ''.join(f" AND {clause}" for clause in where) + order, [year_month] + params).fetchall()
+    rows, next_cursor = _keyset_page(rows, query, key)
+    return [json.loads(row['data']) for row in rows], next_cursor
+
+def _is_year_month(value):
+    try:
+        return datetime.strptime(value, '%Y-%m').strftime('%Y-%m') == value
+    except ValueError:
+        return False
 
-    conn.close()
+def _period_summary(row):
+    return {'month': row['year_month'], 'closed': True, 'closedAt': row['closed_at'], 'closedBy': row['closed_by'],
+            'employeeCount': row['employee_count'], 'totalPayment': row['total_payment']}
 
-    wb = openpyxl.Workbook()
+def _add_period_audit(conn, year_month, action, actor, reason):
+    conn.execute("INSERT INTO period_audit (year_month, action, actor, reason, at) VALUES (?, ?, ?, ?, ?)",
+                 (year_month, action, actor, reason, datetime.now().isoformat(timespec='seconds')))
 
-    # Çalışanlar Sayfası
-    ws_employees = wb.active
-    ws_employees.title = "Çalışanlar"
-    ws_employees.append(['ID', 'Ad Soyad', 'Çalışan No', 'Branş', 'Ödeme Tipi', 'Sabit Maaş', 'Sabit FM Ücreti', 'Sabit Gündüz Ders', 'Sabit Akşam Ders'])
-    for emp in employees:
-        ws_employees.append([emp['id'], emp['name'], emp['emp_id'], emp['branch'], emp['salary_type'], emp['fixed_salary'], emp['fixed_overtime_pay'], emp['fixed_day_hours'], emp['fixed_evening_hours']])
+def close_period(conn, year_month, actor=None, reason=None):
+    """Ayın raporunu hesaplayıp anlık görüntü olarak saklar ve ayı kilitler; dönem zaten kapalıysa None.
 
-    # Diğer sayfalar aynı...
-    ws_worklogs = wb.create_sheet("Çalışma Saatleri")
-    ws_worklogs.append(['Ad Soyad', 'Tarih', 'Gündüz Saati', 'Akşam Saati', 'Pazar Gerekçesi'])
-    for log in work_logs:
-        ws_worklogs.append([log['name'], log['date'], log['day_hours'], log['evening_hours'], log['sunday_reason']])
+    Hesap ve yazma aynı yazma transaction'ında yapılır: arada mesai kaydı değişemez.
+    """
+    with write_transaction(conn):
+        if closed_months(conn, [year_month]):
+            return None
+        employees = [dict(emp) for emp in conn.execute(EMPLOYEE_SELECT + " ORDER BY e.id").fetchall()]
+        report = build_report(conn, year_month, employees)
+        settings = {row['key']: row['value'] for row in conn.execute("SELECT key, value FROM settings")}
+        salary_types = [dict(row) for row in conn.execute("SELECT * FROM salary_types ORDER BY id")]
+        conn.execute("""
+            INSERT INTO closed_periods (year_month, closed_at, closed_by, settings, salary_types, employee_count, total_payment, report)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (year_month, datetime.now().isoformat(timespec='seconds'), actor, json.dumps(settings),
+              json.dumps(salary_types, ensure_ascii=False), len(report),
+              round(sum(row['totalPayment'] for row in report), 2), app.json.dumps(report)))
+        conn.executemany("""
+            INSERT INTO period_snapshot_rows (year_month, employee_id, name, branch, salary_type_id, data)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(year_month, emp['id'], emp['name'], emp['branch'], emp['salary_type_id'], app.json.dumps(row))
+              for emp, row in zip(employees, report)])
+        _add_period_audit(conn, year_month, 'close', actor, reason)
+        # Ayın sürümü artar: önbellekteki hesaplanmış raporlar ve ETag'ler geçersiz olur
+        bump_version(conn, f'worklogs:{year_month}', 'periods')
+        return _period_summary(conn.execute("SELECT * FROM closed_periods WHERE year_month = ?", (year_month,)).fetchone())
+
+def reopen_period(conn, year_month, actor, reason):
+    """Anlık görüntüyü siler ve ayın kilidini kaldırır; dönem kapalı değilse False, yıl arşivdeyse ValueError."""
+    with write_transaction(conn):
+        if conn.execute("SELECT 1 FROM archived_years WHERE year = ?", (year_month[:4],)).fetchone():
+            raise ValueError(f'{year_month[:4]} yılı arşivlenmiş; önce arşivden geri alınmalıdır (python database.py restore).')
+        if not conn.execute("DELETE FROM closed_periods WHERE year_month = ?", (year_month,)).rowcount:
+            return False
+        conn.execute("DELETE FROM period_snapshot_rows WHERE year_month = ?", (year_month,))
+        _add_period_audit(conn, year_month, 'reopen', actor, reason)
+        bump_version(conn, f'worklogs:{year_month}', 'periods')
+        return True
+
+def _period_request():
+    data = request.get_json(silent=True) or {}
+    actor = data.get('actor') or request.remote_addr
+    reason = data.get('reason')
+    return str(actor) if actor else None, str(reason).strip() if reason else None
+
+@app.route('/api/periods', methods=['GET'])
+def get_periods():
+    def build():
+        rows = get_db().execute("""
+            SELECT year_month, closed_at, closed_by, employee_count, total_payment
+            FROM closed_periods ORDER BY year_month DESC
+        """).fetchall()
+        return [_period_summary(row) for row in rows]
+    return cached_json('periods', ('periods',), build)
+
+@app.route('/api/periods/<string:year_month>', methods=['GET'])
+def get_period(year_month):
+    """Dönemin durumu; kapalıysa kapatmada kullanılan ayarlar ve maaş türleri. Her durumda işlem geçmişi."""
+    conn = get_db()
+    row = conn.execute("""
+        SELECT year_month, closed_at, closed_by, employee_count, total_payment, settings, salary_types
+        FROM closed_periods WHERE year_month = ?
+    """, (year_month,)).fetchone()
+    result = {'month': year_month, 'closed': False}
+    if row:
+        result = dict(_period_summary(row), settings=json.loads(row['settings']), salaryTypes=json.loads(row['salary_types']))
+    result['audit'] = [dict(r) for r in conn.execute(
+        "SELECT action, actor, reason, at FROM period_audit WHERE year_month = ? ORDER BY id", (year_month,))]
+    return jsonify(result)
 
-    ws_holidays = wb.create_sheet("Tatiller")
-    ws_holidays.append(['Tarih'])
-    for holiday in holidays:
-        ws_holidays.append([holiday['date']])
+@app.route('/api/periods/<string:year_month>/close', methods=['POST'])
+def close_period_route(year_month):
+    if not _is_year_month(year_month): return jsonify({'error': 'Ay YYYY-MM biçiminde olmalıdır.'}), 400
+    actor, reason = _period_request()
+    summary = close_period(get_db(), year_month, actor, reason)
+    if summary is None: return jsonify({'error': f'{year_month} dönemi zaten kapatılmış.'}), 409
+    return jsonify(summary)
+
+@app.route('/api/periods/<string:year_month>/reopen', methods=['POST'])
+def reopen_period_route(year_month):
+    """Yeniden açma açık bir işlemdir: gerekçe zorunludur ve işlem geçmişine yazılır."""
+    actor, reason = _period_request()
+    if not reason: return jsonify({'error': 'Yeniden açma gerekçesi (reason) zorunludur.'}), 400
+    try:
+        if not reopen_period(get_db(), year_month, actor, reason):
+            return jsonify({'error': f'{year_month} dönemi kapalı değil.'}), 409
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 409
+    return jsonify({'month': year_month, 'closed': False, 'message': f'{year_month} dönemi yeniden açıldı.'})
 
-    ws_settings = wb.create_sheet("Ayarlar")
-    ws_settings.append(['Ayar', 'Değer'])
-    for setting in settings:
-        ws_settings.append([setting['key'], setting['value']])
+def build_full_export(conn, progress=None):
+    """Tüm verilerin yedek workbook'unu oluşturur; progress verilirse çalışma saati satırları için çağrılır.
 
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
+    Arşivlenmiş yılların çalışma saatleri dahil edilmez (yedekleri arşiv dosyalarıdır); 'Arşiv'
+    sayfası bu yılları ve dosyalarını listeler.
+    """
+    # write_only: satırlar bellekte tutulmadan doğrudan sayfa XML'ine yazılır; imleçler parça parça okunur
+    wb = openpyxl.Workbook(write_only=True)
+
+    with read_transaction(conn):
+        # Çalışanlar Sayfası
+        ws_employees = wb.create_sheet("Çalışanlar")
+        ws_employees.append(['ID', 'Ad Soyad', 'Çalışan No', 'Branş', 'Ödeme Tipi', 'Sabit Maaş', 'Sabit FM Ücreti', 'Sabit Gündüz Ders', 'Sabit Akşam Ders'])
+        employees = conn.execute("""
+            SELECT e.id, e.name, e.emp_id, e.branch, s.name as salary_type,
+                   e.fixed_salary, e.fixed_overtime_pay, e.fixed_day_hours, e.fixed_evening_hours
+            FROM employees e LEFT JOIN salary_types s ON e.salary_type_id = s.id
+            ORDER BY e.name
+        """)
+        for emp in iter_rows(employees, EXPORT_CHUNK_SIZE):
+            ws_employees.append(list(emp))
+
+        # Çalışma saatleri; Excel'in sayfa başına satır sınırı aşılırsa yeni sayfaya devam edilir
+        total_logs = conn.execute("SELECT COUNT(*) FROM work_logs").fetchone()[0] if progress else 0
+        worklog_headers = ['Ad Soyad', 'Tarih', 'Gündüz Saati', 'Akşam Saati', 'Pazar Gerekçesi']
+        ws_worklogs = wb.create_sheet("Çalışma Saatleri")
+        ws_worklogs.append(worklog_headers)
+        sheet_rows, sheet_no, written = 1, 1, 0
+        work_logs = conn.execute("""
+            SELECT e.name, w.date, w.day_hours, w.evening_hours, w.sunday_reason
+            FROM work_logs w JOIN employees e ON w.employee_id = e.id
+            ORDER BY e.name, w.date
+        """)
+        for log in iter_rows(work_logs, EXPORT_CHUNK_SIZE):
+            if sheet_rows >= EXCEL_MAX_ROWS:
+                sheet_no += 1
+                ws_worklogs = wb.create_sheet(f"Çalışma Saatleri ({sheet_no})")
+                ws_worklogs.append(worklog_headers)
+                sheet_rows = 1
+            ws_worklogs.append(list(log))
+            sheet_rows += 1
+            written += 1
+            if progress and written % EXPORT_CHUNK_SIZE == 0:
+                progress(0.9 * written / total_logs, f"{written}/{total_logs} çalışma saati satırı yazıldı")
+
+        ws_holidays = wb.create_sheet("Tatiller")
+        ws_holidays.append(['Tarih'])
+        for holiday in conn.execute("SELECT date FROM holidays ORDER BY date"):
+            ws_holidays.append([holiday['date']])
+
+        ws_settings = wb.create_sheet("Ayarlar")
+        ws_settings.append(['Ayar', 'Değer'])
+        for setting in conn.execute("SELECT key, value FROM settings"):
+            ws_settings.append([setting['key'], setting['value']])
+
+        archives = list_archived_years(conn)
+        if archives:
+            ws_archive = wb.create_sheet("Arşiv")
+            ws_archive.append(['Yıl', 'Satır Sayısı', 'Dosya', 'Arşivlenme'])
+            for archive in archives:
+                ws_archive.append([archive['year'], archive['row_count'], archive['path'], archive['archived_at']])
+    return wb
+
+def _full_export_name():
+    return f'fazla_mesai_yedek_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+
+@jobs.handler('export_all')
+def _export_all_job(conn, job):
+    wb = build_full_export(conn, job.progress)
+    job.progress(0.9, 'Dosya sıkıştırılıyor')
+    wb.save(job.artifact(_full_export_name(), '.xlsx'))
+    return {'message': 'Yedek dosyası hazır.'}
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return send_file(output, as_attachment=True, download_name=f'fazla_mesai_yedek_{timestamp}.xlsx')
+@app.route('/api/export_all', methods=['GET'])
+def export_all_data():
+    return send_workbook(build_full_export(get_db()), _full_export_name())
+
+@app.route('/api/export_all', methods=['POST'])
+def start_export_all():
+    return job_response(jobs.submit(get_db(), 'export_all'))
+
+# --- Arka plan işleri ---
+@app.route('/api/jobs/<string:job_id>', methods=['GET'])
+def get_job_status(job_id):
+    job = jobs.get_job(get_db(), job_id)
+    if job is None: return jsonify({'error': 'İş bulunamadı.'}), 404
+    data = jobs.describe(job)
+    if data['hasArtifact']:
+        data['downloadUrl'] = url_for('download_job_artifact', job_id=job_id)
+    return jsonify(data)
+
+@app.route('/api/jobs/<string:job_id>/download', methods=['GET'])
+def download_job_artifact(job_id):
+    job = jobs.get_job(get_db(), job_id)
+    if job is None: return jsonify({'error': 'İş bulunamadı.'}), 404
+    if job['status'] != 'done' or not job['artifact_path']:
+        return jsonify({'error': 'İşin indirilecek bir çıktısı yok veya henüz bitmedi.', 'status': job['status']}), 409
+    if not os.path.exists(job['artifact_path']):
+        return jsonify({'error': 'Çıktı dosyasının saklama süresi doldu.'}), 410
+    return send_file(job['artifact_path'], as_attachment=True, download_name=job['artifact_name'])
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
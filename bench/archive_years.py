@@ -0,0 +1,146 @@
+"""Yıl arşivi (python database.py archive) öncesi ve sonrası güncel ay sorgu süreleri ile dosya boyutu.
+
+bench/datagen.py ile --years yıl geçmiş + güncel ay üretilir; geçmiş aylar kapatılır. Güncel ayın
+mesai gridi (matrix ve nested, önbellek boş), raporu, delta sorgusu ve yeni bağlantıyla (soğuk
+sayfa önbelleği) ham ay sorgusu ölçülür. Geçmiş yıllar arşivlenip VACUUM yapıldıktan sonra aynı
+ölçümler tekrarlanır. Ardından arşivlenmiş ayın gridinin arşiv öncesiyle aynı olduğu, arşivdeki
+ayın yeniden açılamadığı ve geri almanın (restore) kayıtları eksiksiz döndürdüğü doğrulanır.
+
+Kullanım:
+    python bench/archive_years.py [--employees 300] [--years 10] [--repeat 5]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import datagen  # noqa: E402
+
+
+def median_ms(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=300)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--current', default='2025-01', help='güncel (açık) ay')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    ym = args.current
+    first_year = int(ym[:4]) - args.years
+    years = [str(first_year + i) for i in range(args.years)]
+
+    tmp = tempfile.TemporaryDirectory()
+    db_file = os.path.join(tmp.name, 'archive.db')
+    os.environ['DATABASE_FILE'] = db_file
+    os.environ['JOBS_DIR'] = os.path.join(tmp.name, 'jobs')
+    os.environ['ARCHIVE_DIR'] = os.path.join(tmp.name, 'archive')
+    logging.disable(logging.WARNING)
+    started = time.perf_counter()
+    data = datagen.generate(db_file, employees=args.employees, months=args.years * 12 + 1,
+                            first_month=f'{first_year}-{ym[5:]}')
+    print(f"{data['employees']} çalışan, {len(data['months'])} ay, {data['work_logs']} log satırı "
+          f"({time.perf_counter() - started:.1f} sn)")
+
+    import app as app_module
+    import database
+    client = app_module.app.test_client()
+    clear = app_module.response_cache.clear
+
+    def get(url, expect=200):
+        response = client.get(url)
+        body = response.get_data()
+        assert response.status_code == expect, (url, response.status_code, body[:200])
+        return response
+
+    conn = database.get_db_connection()
+    started = time.perf_counter()
+    for month in data['months'][:-1]:
+        app_module.close_period(conn, month, 'bench')
+    print(f"{len(data['months']) - 1} geçmiş ay kapatıldı ({time.perf_counter() - started:.1f} sn)")
+
+    def cold_month_query():
+        fresh = database.get_db_connection()
+        start, end = app_module.get_month_bounds(ym)
+        fresh.execute(f"SELECT * FROM {database.work_log_table(fresh, ym)} WHERE date >= ? AND date < ?",
+                      (start, end)).fetchall()
+        fresh.close()
+
+    def timings(label):
+        seq = get(f'/api/worklogs/{ym}?format=matrix').get_json()['seq']
+        matrix = median_ms(lambda: get(f'/api/worklogs/{ym}?format=matrix'), args.repeat, clear)
+        nested = median_ms(lambda: get(f'/api/worklogs/{ym}'), args.repeat, clear)
+        report = median_ms(lambda: get(f'/api/report/{ym}'), args.repeat, clear)
+        delta = median_ms(lambda: get(f'/api/worklogs/{ym}?format=matrix&since={seq}'), args.repeat, clear)
+        cold = median_ms(cold_month_query, args.repeat)
+        size = os.path.getsize(db_file) / 1024 / 1024
+        print(f"  {label:7s}: ana dosya {size:7.1f} MiB | matrix {matrix:6.1f} ms, nested {nested:6.1f} ms, "
+              f"rapor {report:6.1f} ms, delta {delta:5.2f} ms, yeni bağlantı ay sorgusu {cold:5.1f} ms")
+
+    old_month = f'{years[0]}-06'
+    before_old = get(f'/api/worklogs/{old_month}?format=matrix').get_json()
+    before_report = get(f'/api/report/{old_month}').get_json()
+    timings('arşivsiz')
+
+    started = time.perf_counter()
+    archived = sum(database.archive_year(conn, year) for year in years)
+    conn.execute("VACUUM")
+    print(f"  {len(years)} yıl arşivlendi: {archived} satır ({time.perf_counter() - started:.1f} sn)")
+    timings('arşivli')
+    clear()
+    old = median_ms(lambda: get(f'/api/worklogs/{old_month}?format=matrix'), args.repeat, clear)
+    print(f"  arşivdeki ay ({old_month}) matrix: {old:.1f} ms")
+
+    # Arşivdeki ay aynı okunur, rapor anlık görüntüden gelir; yeniden açma reddedilir
+    clear()
+    after_old = get(f'/api/worklogs/{old_month}?format=matrix').get_json()
+    assert {k: v for k, v in after_old.items() if k != 'seq'} == {k: v for k, v in before_old.items() if k != 'seq'}
+    assert get(f'/api/report/{old_month}').get_json() == before_report
+    assert client.post(f'/api/periods/{old_month}/reopen', json={'reason': 'düzeltme'}).status_code == 409
+    assert client.post('/api/worklogs', json={'empId': 1, 'date': f'{old_month}-10', 'type': 'day', 'value': 7}).status_code == 409
+    assert database.check_monthly_totals(conn) == []
+
+    # Eski arşivi bağlamış, havuzdaki gibi uzun ömürlü bağlantı (aşağıda yeniden arşivlemede kullanılır)
+    pooled = database.get_db_connection()
+    database.work_log_table(pooled, old_month)
+    restored = database.restore_year(conn, years[0])
+    count = conn.execute("SELECT COUNT(*) FROM work_logs WHERE date LIKE ?", (f'{years[0]}-%',)).fetchone()[0]
+    assert restored == count and not any(name.startswith(f'work_logs_{years[0]}_') for name in os.listdir(os.environ['ARCHIVE_DIR']))
+    clear()
+    restored_old = get(f'/api/worklogs/{old_month}?format=matrix').get_json()
+    assert {k: v for k, v in restored_old.items() if k != 'seq'} == {k: v for k, v in before_old.items() if k != 'seq'}
+    # Geri alınıp değiştirilen ve yeniden arşivlenen yıl: eski arşivi bağlamış bağlantı silinmiş
+    # eski dosyayı değil yeni arşivi okur
+    cell = {'empId': 1, 'date': f'{old_month}-10', 'type': 'day', 'value': 77}
+    assert client.post(f'/api/periods/{old_month}/reopen', json={'reason': 'düzeltme'}).status_code == 200
+    assert client.post('/api/worklogs', json=cell).status_code == 200
+    assert client.post(f'/api/periods/{old_month}/close', json={}).status_code == 200
+    database.archive_year(conn, years[0])
+    table = database.work_log_table(pooled, old_month)
+    assert pooled.execute(f"SELECT day_hours FROM {table} WHERE employee_id = 1 AND date = ?",
+                          (cell['date'],)).fetchone()[0] == 77
+    pooled.close()
+    database.restore_year(conn, years[0])
+    assert client.post(f'/api/periods/{old_month}/reopen', json={'reason': 'düzeltme'}).status_code == 200
+    assert database.check_monthly_totals(conn) == []
+    conn.close()
+    print(f"Doğruluk: arşivdeki ay okuması, yeniden açma/yazma reddi ve geri alma ({restored} satır) - OK")
+
+
+if __name__ == '__main__':
+    main()
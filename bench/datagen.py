@@ -0,0 +1,119 @@
+"""Benchmark'lar için deterministik sentetik okul verisi üreteci.
+
+Aynı parametreler ve tohum (seed) her zaman aynı veritabanını üretir: çalışanlar (branş ve maaş
+türü karışımıyla), özel tatiller ve her ay için gündüz/akşam mesai kayıtları. Şema
+database.init_db ile kurulur; tohumlama hızı için work_logs trigger'ları kaldırılır, aylık özetler
+sonda toplu hesaplanır ve trigger'lar init_db ile geri kurulur.
+
+Kullanım (tek başına):
+    python bench/datagen.py out.db [--employees 500] [--months 12] [--first-month 2025-01]
+                                   [--salary-mix 3,1,1,1,0,1,1] [--holiday-density 0.03] [--seed 1]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BRANCHES = ['Matematik', 'Türkçe', 'Fizik', 'Kimya', 'Biyoloji', 'Tarih', 'Coğrafya',
+            'İngilizce', 'Beden Eğitimi', 'Müzik', 'Görsel Sanatlar', 'Rehberlik']
+
+
+def month_list(first_month, months):
+    year, month = map(int, first_month.split('-'))
+    result = []
+    for _ in range(months):
+        result.append(f'{year:04d}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return result
+
+
+def generate(db_file, employees=500, months=12, first_month='2025-01', salary_mix=None,
+             holiday_density=0.03, density=0.6, seed=1):
+    """db_file'da yeni veritabanı üretir; üretilen verinin özetini (dict) döner.
+
+    salary_mix: maaş türü id sırasıyla ağırlıklar (None = eşit). holiday_density: hafta içi
+    günlerin özel tatil olma oranı. density: hafta içi bir günde kayıt olma olasılığı (hafta sonu
+    ve tatillerde bunun beşte biri, kısmen 'Nöbet' gerekçesiyle).
+    """
+    sys.path.insert(0, ROOT)
+    import database
+    rng = random.Random(seed)
+    if os.path.exists(db_file):
+        raise FileExistsError(db_file)
+    database.DB_FILE = db_file
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.init_db()
+    conn = database.get_db_connection()
+    with database.write_transaction(conn):
+        database.drop_work_log_triggers(conn)
+        types = [tuple(row) for row in conn.execute("SELECT id, include_fixed_salary, include_fixed_hours_quota FROM salary_types ORDER BY id")]
+        weights = list(salary_mix or [1] * len(types))
+        weights = (weights + [0] * len(types))[:len(types)]
+        picked = rng.choices(types, weights=weights, k=employees)
+        conn.executemany("""
+            INSERT INTO employees (name, emp_id, branch, salary_type_id, fixed_salary, fixed_day_hours, fixed_evening_hours)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(f'Öğretmen {i:05d}', str(100000 + i), rng.choice(BRANCHES), type_id,
+               rng.choice([22000, 28000, 35000]) if fixed_salary else 0,
+               rng.choice([2, 4, 6]) if quota else 0, rng.choice([0, 2]) if quota else 0)
+              for i, (type_id, fixed_salary, quota) in enumerate(picked)])
+
+        month_names = month_list(first_month, months)
+        first = date.fromisoformat(f'{month_names[0]}-01')
+        end = date.fromisoformat(f'{month_list(month_names[-1], 2)[1]}-01')
+        days = [first + timedelta(days=i) for i in range((end - first).days)]
+        holidays = [d.isoformat() for d in days if d.weekday() < 5 and rng.random() < holiday_density]
+        conn.executemany("INSERT INTO holidays (date) VALUES (?)", [(d,) for d in holidays])
+        holiday_set = set(holidays)
+
+        log_rows = 0
+        for day in days:
+            ds = day.isoformat()
+            off = day.weekday() >= 5 or ds in holiday_set
+            chance = density / 5 if off else density
+            rows = [(emp_id, ds, rng.randint(1, 8), rng.randint(0, 4), 'Nöbet' if off and rng.random() < 0.3 else None)
+                    for emp_id in range(1, employees + 1) if rng.random() < chance]
+            conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours, sunday_reason) VALUES (?, ?, ?, ?, ?)", rows)
+            log_rows += len(rows)
+        database.rebuild_monthly_totals(conn)
+    conn.close()
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.init_db()  # trigger'ları geri kur
+    return {'employees': employees, 'months': month_names, 'holidays': len(holidays), 'work_logs': log_rows,
+            'salary_mix': weights, 'holiday_density': holiday_density, 'density': density, 'seed': seed}
+
+
+def add_arguments(parser):
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--months', type=int, default=12)
+    parser.add_argument('--first-month', default='2025-01')
+    parser.add_argument('--salary-mix', default=None,
+                        help='maaş türü id sırasıyla virgüllü ağırlıklar (varsayılan: eşit)')
+    parser.add_argument('--holiday-density', type=float, default=0.03)
+    parser.add_argument('--density', type=float, default=0.6)
+    parser.add_argument('--seed', type=int, default=1)
+
+
+def generate_from_args(db_file, args):
+    mix = [float(w) for w in args.salary_mix.split(',')] if args.salary_mix else None
+    return generate(db_file, args.employees, args.months, args.first_month, mix,
+                    args.holiday_density, args.density, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('db_file')
+    add_arguments(parser)
+    args = parser.parse_args()
+    summary = generate_from_args(args.db_file, args)
+    print(f"{args.db_file}: {summary['employees']} çalışan, {len(summary['months'])} ay, "
+          f"{summary['holidays']} tatil, {summary['work_logs']} log satırı")
+
+
+if __name__ == '__main__':
+    main()
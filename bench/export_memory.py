@@ -0,0 +1,127 @@
+"""Tüm verileri dışa aktarma (/api/export_all) için süre ve en yüksek bellek (peak RSS) ölçümü.
+
+Veritabanı ayrı bir process'te tohumlanır; dışa aktarma her mod için yeni bir process'te
+çalıştırılır ve o process'in ru_maxrss değeri raporlanır:
+  - streaming: mevcut uç nokta (write-only workbook, parça parça imleç, geçici dosya)
+  - legacy: eski yöntem (fetchall + tam workbook + BytesIO), karşılaştırma için
+
+Kullanım:
+    python bench/export_memory.py [--rows 5000000] [--employees 2000] [--modes streaming,legacy]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(db_file, rows, employees):
+    sys.path.insert(0, ROOT)
+    import database
+    database.DB_FILE = db_file
+    database.init_db()
+    conn = database.get_db_connection()
+    # Tohumlama hızı için özet trigger'larını kaldır, sonra özetleri toplu hesapla
+    database.drop_work_log_triggers(conn)
+    conn.executemany("INSERT INTO employees (name, emp_id, branch) VALUES (?, ?, ?)",
+                     [(f"Çalışan {i:05d}", str(10000 + i), 'Matematik') for i in range(employees)])
+    emp_ids = [r[0] for r in conn.execute("SELECT id FROM employees").fetchall()]
+    days = -(-rows // len(emp_ids))
+    start = date(2010, 1, 1)
+    batch = []
+    written = 0
+    for offset in range(days):
+        ds = (start + timedelta(days=offset)).isoformat()
+        for emp_id in emp_ids:
+            if written >= rows:
+                break
+            batch.append((emp_id, ds, 4, 2))
+            written += 1
+        if len(batch) >= 200_000:
+            conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (?, ?, ?, ?)", batch)
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (?, ?, ?, ?)", batch)
+    database.rebuild_monthly_totals(conn)
+    conn.commit()
+    conn.close()
+    database.init_db()
+
+
+def legacy_export(conn):
+    from io import BytesIO
+    import openpyxl
+    work_logs = conn.execute("""
+        SELECT e.name, w.date, w.day_hours, w.evening_hours, w.sunday_reason
+        FROM work_logs w JOIN employees e ON w.employee_id = e.id
+        ORDER BY e.name, w.date
+    """).fetchall()
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for log in work_logs:
+        ws.append([log['name'], log['date'], log['day_hours'], log['evening_hours'], log['sunday_reason']])
+    output = BytesIO()
+    wb.save(output)
+    return output.getbuffer().nbytes
+
+
+def run_export(db_file, mode, queue):
+    os.environ['DATABASE_FILE'] = db_file
+    sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.INFO)
+    import app as app_module
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    if mode == 'streaming':
+        client = app_module.app.test_client()
+        response = client.get('/api/export_all')
+        size = 0
+        for chunk in response.iter_encoded():
+            size += len(chunk)
+        response.close()
+    else:
+        import database
+        conn = database.get_db_connection()
+        size = legacy_export(conn)
+        conn.close()
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((mode, elapsed, size, baseline, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--modes', default='streaming,legacy')
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'export.db')
+        t0 = time.perf_counter()
+        proc = ctx.Process(target=seed, args=(db_file, args.rows, args.employees))
+        proc.start()
+        proc.join()
+        print(f"Seed: {args.rows} work_logs satırı, {args.employees} çalışan ({time.perf_counter() - t0:.1f}s)")
+
+        for mode in args.modes.split(','):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=run_export, args=(db_file, mode, queue))
+            proc.start()
+            mode, elapsed, size, baseline, peak = queue.get()
+            proc.join()
+            # ru_maxrss Linux'ta KiB cinsindendir
+            print(f"  {mode:9s}: {elapsed:7.1f}s, dosya {size / 1e6:7.1f} MB, "
+                  f"peak RSS {peak / 1024:7.1f} MiB (import sonrası {baseline / 1024:.1f} MiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Çalışma saatleri Excel içe aktarma (/api/worklogs/upload) için süre ve en yüksek bellek ölçümü.
+
+N çalışan x 31 gün x 2 sayfa (Gündüz/Akşam Mesaisi) şablonu üretilir ve her mod yeni bir
+process'te çalıştırılır:
+  - streaming: mevcut uç nokta (read-only ayrıştırma + doğrulama + tek transaction'da toplu yazma)
+  - legacy-parse: yalnızca eski tam modda load_workbook + hücre gezme (karşılaştırma için)
+
+Kullanım:
+    python bench/import_worklogs.py [--employees 2000] [--month 2025-03] [--modes streaming,legacy-parse]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prepare(db_file, xlsx_file, employees, year_month):
+    sys.path.insert(0, ROOT)
+    import openpyxl
+    import database
+    from payroll import MonthCalendar
+    database.DB_FILE = db_file
+    database.init_db()
+    conn = database.get_db_connection()
+    names = [f"Çalışan {i:05d}" for i in range(employees)]
+    conn.executemany("INSERT INTO employees (name) VALUES (?)", [(n,) for n in names])
+    conn.commit()
+    conn.close()
+
+    wb = openpyxl.Workbook(write_only=True)
+    headers = ['Ad Soyad'] + MonthCalendar(year_month).dates
+    for title, hours in (('Gündüz Mesaisi', 4), ('Akşam Mesaisi', 2)):
+        sheet = wb.create_sheet(title)
+        sheet.append(headers)
+        for name in names:
+            sheet.append([name] + [hours] * (len(headers) - 1))
+    wb.save(xlsx_file)
+
+
+def run(db_file, xlsx_file, mode, queue):
+    os.environ['DATABASE_FILE'] = db_file
+    sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.INFO)
+    import app as app_module
+    import openpyxl
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    if mode == 'streaming':
+        client = app_module.app.test_client()
+        with open(xlsx_file, 'rb') as f:
+            response = client.post('/api/worklogs/upload?sync=1', data={'file': (f, 'import.xlsx')})
+        result = response.get_json()
+        detail = f"{result['imported']} hücre, {result['errorCount']} hata"
+    else:
+        wb = openpyxl.load_workbook(xlsx_file)
+        cells = sum(1 for ws in wb for row in ws.iter_rows() for _ in row)
+        detail = f"{cells} hücre ayrıştırıldı (yazma yok)"
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((mode, elapsed, detail, baseline, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--month', default='2025-03')
+    parser.add_argument('--modes', default='streaming,legacy-parse')
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file, xlsx_file = os.path.join(tmp, 'import.db'), os.path.join(tmp, 'import.xlsx')
+        proc = ctx.Process(target=prepare, args=(db_file, xlsx_file, args.employees, args.month))
+        proc.start()
+        proc.join()
+        print(f"{args.employees} çalışan x {args.month} x 2 sayfa, dosya {os.path.getsize(xlsx_file) / 1e6:.1f} MB")
+
+        for mode in args.modes.split(','):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=run, args=(db_file, xlsx_file, mode, queue))
+            proc.start()
+            mode, elapsed, detail, baseline, peak = queue.get()
+            proc.join()
+            # ru_maxrss Linux'ta KiB cinsindendir
+            print(f"  {mode:12s}: {elapsed:6.2f}s, {detail}, peak RSS {peak / 1024:.1f} MiB "
+                  f"(import sonrası {baseline / 1024:.1f} MiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Canlı grid akışı (GET /api/worklogs/<ay>/stream) için worker'lar arası dağıtım ve gecikme ölçümü.
+
+Gunicorn birden çok worker ile başlatılır; N istemci akışa bağlanır (bağlantılar worker'lara
+dağılır) ve ayrı bir bağlantıdan hücre yazmaları yapılır. Her yazmanın tüm istemcilere doğru
+değerle ulaştığı doğrulanır; yazma yanıtından olayın istemcide okunmasına kadar geçen süre raporlanır.
+
+Kullanım:
+    python bench/live_stream.py [--employees 200] [--clients 8] [--workers 2] [--writes 40]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import datagen  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def request(port, method, path, body=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                 headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, data
+
+
+class Listener(threading.Thread):
+    """Akışı okuyup her `changes` olayındaki hücreleri alınma zamanıyla kaydeder."""
+
+    def __init__(self, port, month, since):
+        super().__init__(daemon=True)
+        self.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        self.conn.request('GET', f'/api/worklogs/{month}/stream?since={since}')
+        self.response = self.conn.getresponse()
+        assert self.response.status == 200, self.response.status
+        self.received = {}
+        self.events = 0
+
+    def run(self):
+        event = None
+        for raw in self.response:
+            line = raw.decode('utf-8').rstrip('\n')
+            if line.startswith('event: '):
+                event = line[7:]
+            elif line.startswith('data: ') and event == 'changes':
+                now = time.perf_counter()
+                self.events += 1
+                for change in json.loads(line[6:])['changes']:
+                    self.received[(change['empId'], change['date'], change['day'])] = now
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--month', default='2025-03')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--writes', type=int, default=40)
+    parser.add_argument('--interval', type=float, default=0.2, help='yazmalar arası bekleme (sn)')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_file = os.path.join(tmp.name, 'live.db')
+    datagen.generate(db_file, employees=args.employees, months=1, first_month=args.month)
+    port = free_port()
+    env = dict(os.environ, DATABASE_FILE=db_file, JOBS_DIR=os.path.join(tmp.name, 'jobs'),
+               WEB_CONCURRENCY=str(args.workers), GUNICORN_THREADS=str(args.clients + 4),
+               LIVE_MAX_STREAMS=str(args.clients), METRICS_ENABLED='0')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-b', f'127.0.0.1:{port}', 'app:app'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                status, body = request(port, 'GET', f'/api/worklogs/{args.month}?format=matrix')
+                break
+            except OSError:
+                time.sleep(0.1)
+        seq = json.loads(body)['seq']
+        listeners = [Listener(port, args.month, seq) for _ in range(args.clients)]
+        for listener in listeners:
+            listener.start()
+
+        rng = random.Random(5)
+        written = {}
+        for i in range(args.writes):
+            # Değer (100 + i) her yazmayı ayırt eder
+            cell = {'empId': rng.randint(1, args.employees), 'date': f'{args.month}-{rng.randint(1, 28):02d}',
+                    'type': 'day', 'value': 100 + i}
+            status, _ = request(port, 'POST', '/api/worklogs', cell)
+            assert status == 200, status
+            written[(cell['empId'], cell['date'], cell['value'])] = time.perf_counter()
+            time.sleep(args.interval)
+        time.sleep(1.5)
+
+        latencies, missing = [], 0
+        for listener in listeners:
+            for key, sent in written.items():
+                if key in listener.received:
+                    latencies.append(listener.received[key] - sent)
+                else:
+                    missing += 1
+        latencies.sort()
+        print(f"{args.workers} worker, {args.clients} istemci, {args.writes} yazma: "
+              f"{len(latencies)} teslim, {missing} eksik (aynı hücreye üst üste yazılırsa ara değer atlanabilir)")
+        if latencies:
+            print(f"  gecikme: medyan {statistics.median(latencies) * 1000:.0f} ms, "
+                  f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms, maks {latencies[-1] * 1000:.0f} ms")
+        print(f"  istemci başına olay: {statistics.mean(listener.events for listener in listeners):.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
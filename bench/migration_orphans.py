@@ -0,0 +1,98 @@
+"""Eski (foreign key'siz) sürümden yükseltme: silinmiş çalışanların kayıtlarını içeren veritabanı göçü.
+
+İlk sürümün şemasıyla (foreign key'ler uygulanmadan) bir veritabanı oluşturulur; bazı çalışanlar
+kayıtları dururken silinir ve aynı hücre için yinelenen satırlar eklenir. Ardından init_db ve
+uygulama açılışı çalıştırılır; göçün hata vermediği, sahipsiz kayıtların work_logs_orphaned
+tablosuna taşındığı, aylık özetlerin tutarlı olduğu ve raporun açıldığı doğrulanır.
+
+Kullanım:
+    python bench/migration_orphans.py [--employees 200] [--deleted 20] [--month 2025-03]
+"""
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+BASELINE_SCHEMA = """
+    CREATE TABLE salary_types (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+        include_min_wage INTEGER DEFAULT 0, include_fixed_salary INTEGER DEFAULT 0,
+        include_fixed_overtime_pay INTEGER DEFAULT 0, include_fixed_hours_quota INTEGER DEFAULT 0,
+        include_overtime_calc INTEGER DEFAULT 0, include_on_call INTEGER DEFAULT 0
+    );
+    CREATE TABLE employees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, emp_id TEXT, branch TEXT,
+        payment_type TEXT DEFAULT 'asgari_ucret_fazla_mesai', salary_type_id INTEGER,
+        fixed_salary REAL DEFAULT 0, fixed_hours REAL DEFAULT 0, fixed_overtime_pay REAL DEFAULT 0,
+        fixed_day_hours REAL DEFAULT 0, fixed_evening_hours REAL DEFAULT 0,
+        FOREIGN KEY (salary_type_id) REFERENCES salary_types (id)
+    );
+    CREATE TABLE work_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, employee_id INTEGER NOT NULL, date TEXT NOT NULL,
+        day_hours INTEGER DEFAULT 0, evening_hours INTEGER DEFAULT 0, sunday_reason TEXT,
+        FOREIGN KEY (employee_id) REFERENCES employees (id) ON DELETE CASCADE
+    );
+    CREATE TABLE holidays (date TEXT PRIMARY KEY);
+    CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def build_baseline(db_file, employees, deleted, year_month):
+    rng = random.Random(3)
+    conn = sqlite3.connect(db_file)  # ilk sürüm gibi: PRAGMA foreign_keys kapalı
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany("INSERT INTO employees (name, emp_id) VALUES (?, ?)",
+                     [(f'Öğretmen {i:04d}', str(1000 + i)) for i in range(1, employees + 1)])
+    rows = [(emp_id, f'{year_month}-{day:02d}', rng.randint(1, 8), rng.randint(0, 4))
+            for emp_id in range(1, employees + 1) for day in range(1, 29) if rng.random() < 0.5]
+    rows += rows[:50]  # eski sürümün yinelenen hücreleri
+    conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (?, ?, ?, ?)", rows)
+    removed = rng.sample(range(1, employees + 1), deleted)
+    conn.executemany("DELETE FROM employees WHERE id = ?", [(emp_id,) for emp_id in removed])
+    conn.commit()
+    orphaned = conn.execute("SELECT COUNT(*) FROM work_logs WHERE employee_id NOT IN (SELECT id FROM employees)").fetchone()[0]
+    conn.close()
+    return orphaned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--deleted', type=int, default=20)
+    parser.add_argument('--month', default='2025-03')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_file = os.path.join(tmp.name, 'baseline.db')
+    os.environ['DATABASE_FILE'] = db_file
+    os.environ['JOBS_DIR'] = os.path.join(tmp.name, 'jobs')
+    logging.disable(logging.WARNING)
+    orphaned = build_baseline(db_file, args.employees, args.deleted, args.month)
+    print(f"İlk sürüm şeması: {args.employees} çalışan ({args.deleted} silinmiş), {orphaned} sahipsiz kayıt")
+
+    started = time.perf_counter()
+    import app as app_module  # init_db göçleri burada çalışır
+    import database
+    print(f"Göç ve uygulama açılışı: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    conn = database.get_db_connection()
+    assert conn.execute("SELECT COUNT(*) FROM work_logs_orphaned").fetchone()[0] == orphaned
+    assert conn.execute("SELECT COUNT(*) FROM work_logs WHERE employee_id NOT IN (SELECT id FROM employees)").fetchone()[0] == 0
+    assert database.check_monthly_totals(conn) == []
+    conn.close()
+    database.init_db()  # ikinci açılış: göç tekrar çalışmaz
+    response = app_module.app.test_client().get(f'/api/report/{args.month}')
+    assert response.status_code == 200, response.status_code
+    assert len(response.get_json()) == args.employees - args.deleted
+    print("Doğruluk: sahipsiz kayıtlar work_logs_orphaned'a taşındı, özetler tutarlı, rapor açılıyor - OK")
+
+
+if __name__ == '__main__':
+    main()
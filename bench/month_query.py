@@ -0,0 +1,101 @@
+"""Aylık work_logs sorgusu için karşılaştırma: strftime() tam tarama vs indeksli tarih aralığı.
+
+Kullanım:
+    python bench/month_query.py [--employees 500] [--years 5] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+OLD_QUERY = "SELECT * FROM work_logs WHERE strftime('%Y-%m', date) = ?"
+NEW_QUERY = "SELECT * FROM work_logs WHERE date >= ? AND date < ?"
+NEW_EMP_QUERY = "SELECT * FROM work_logs WHERE employee_id = ? AND date >= ? AND date < ?"
+
+
+def seed(conn, employees, years, start_year):
+    rng = random.Random(42)
+    conn.executemany("INSERT INTO employees (name) VALUES (?)", [(f"Çalışan {i:05d}",) for i in range(employees)])
+    emp_ids = [r[0] for r in conn.execute("SELECT id FROM employees").fetchall()]
+
+    start = date(start_year, 1, 1)
+    end = date(start_year + years, 1, 1)
+    rows = []
+    d = start
+    while d < end:
+        ds = d.isoformat()
+        for emp_id in emp_ids:
+            if rng.random() < 0.6:
+                rows.append((emp_id, ds, rng.randint(0, 8), rng.randint(0, 4)))
+        if len(rows) > 200_000:
+            conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (?, ?, ?, ?)", rows)
+            rows.clear()
+        d += timedelta(days=1)
+    if rows:
+        conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    return emp_ids
+
+
+def month_bounds(year_month):
+    year, month = map(int, year_month.split('-'))
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(year, month, 1).isoformat(), end.isoformat()
+
+
+def timeit(conn, sql, params, repeat):
+    best = float('inf')
+    rows = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = len(conn.execute(sql, params).fetchall())
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    start_year = 2021
+    year_month = f"{start_year + args.years - 1}-06"
+    month_start, month_end = month_bounds(year_month)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_FILE = os.path.join(tmp, 'bench.db')
+        database.init_db()
+        conn = sqlite3.connect(database.DB_FILE)
+
+        t0 = time.perf_counter()
+        emp_ids = seed(conn, args.employees, args.years, start_year)
+        total = conn.execute("SELECT COUNT(*) FROM work_logs").fetchone()[0]
+        print(f"Seed: {args.employees} çalışan x {args.years} yıl = {total} satır ({time.perf_counter() - t0:.1f}s)")
+        conn.execute("ANALYZE")
+
+        old_ms, old_rows = timeit(conn, OLD_QUERY, (year_month,), args.repeat)
+        new_ms, new_rows = timeit(conn, NEW_QUERY, (month_start, month_end), args.repeat)
+        emp_ms, _ = timeit(conn, NEW_EMP_QUERY, (emp_ids[len(emp_ids) // 2], month_start, month_end), args.repeat)
+        assert old_rows == new_rows, (old_rows, new_rows)
+
+        print(f"Ay: {year_month} ({new_rows} satır)")
+        print(f"  önce  strftime('%Y-%m', date) = ?     : {old_ms:8.2f} ms")
+        print(f"  sonra date >= ? AND date < ?          : {new_ms:8.2f} ms  ({old_ms / new_ms:.1f}x)")
+        print(f"  sonra employee_id = ? + tarih aralığı : {emp_ms:8.2f} ms")
+        plan = conn.execute("EXPLAIN QUERY PLAN " + NEW_QUERY, (month_start, month_end)).fetchall()
+        print("  plan:", "; ".join(row[-1] for row in plan))
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""monthly_employee_totals özetinin her yazma yolundan sonra tam yeniden hesaplamayla aynı kaldığını doğrular.
+
+Rastgele tek hücre yazmaları, Excel yüklemeleri, tatil ekleme/silme, resmi tatil içe aktarma ve
+çalışan silme işlemleri API üzerinden uygulanır; her adımdan sonra özet tablosu ve
+/api/report çıktısı ham work_logs'tan yapılan hesaplamayla karşılaştırılır.
+
+Kullanım:
+    python bench/monthly_totals_check.py [--steps 300] [--seed 3]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONTHS = ['2025-03', '2025-04', '2026-01']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--steps', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_FILE'] = os.path.join(tmp.name, 'totals.db')
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.INFO)
+    import openpyxl
+    import app as app_module
+    from database import check_monthly_totals, get_db_connection
+    from payroll import MonthCalendar, calculate_payments_batch
+
+    client = app_module.app.test_client()
+    client.post('/api/employees/bulk', json={'employees': [{'name': f'E{i}'} for i in range(20)]})
+
+    def emp_ids():
+        return [e['id'] for e in client.get('/api/employees').get_json()]
+
+    def random_date(ym):
+        return f"{ym}-{rng.randint(1, 28):02d}"
+
+    def upload(ym):
+        wb = openpyxl.Workbook()
+        day, evening = wb.active, wb.create_sheet('Akşam Mesaisi')
+        day.title = 'Gündüz Mesaisi'
+        headers = ['Ad Soyad'] + [f"{ym}-{d:02d}" for d in range(1, 29)]
+        day.append(headers)
+        evening.append(headers)
+        for emp in client.get('/api/employees').get_json()[:8]:
+            day.append([emp['name']] + [rng.choice([None, 0, 2, 5]) for _ in range(28)])
+            evening.append([emp['name']] + [rng.choice([None, 1, 3]) for _ in range(28)])
+        buf = BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+        return client.post('/api/worklogs/upload?sync=1', data={'file': (buf, 'w.xlsx')})
+
+    def verify(step):
+        conn = get_db_connection()
+        mismatches = check_monthly_totals(conn)
+        assert not mismatches, f'adım {step}: özet tutarsız: {mismatches[:5]}'
+        for ym in MONTHS:
+            holidays = [r[0] for r in conn.execute(
+                "SELECT date FROM holidays UNION SELECT date FROM official_holidays").fetchall()]
+            employees = [dict(e) for e in conn.execute("""
+                SELECT e.*, s.name as salary_type_name,
+                       s.include_min_wage, s.include_fixed_salary, s.include_fixed_overtime_pay,
+                       s.include_fixed_hours_quota, s.include_overtime_calc, s.include_on_call
+                FROM employees e LEFT JOIN salary_types s ON e.salary_type_id = s.id
+            """).fetchall()]
+            logs = conn.execute("SELECT * FROM work_logs WHERE date LIKE ?", (ym + '-%',)).fetchall()
+            settings = {s['key']: float(s['value']) for s in conn.execute("SELECT key, value FROM settings").fetchall()}
+            expected = calculate_payments_batch(employees, MonthCalendar(ym, holidays), logs, settings)
+            actual = client.get(f'/api/report/{ym}').get_json()
+            assert expected == actual, f'adım {step}: {ym} raporu ham hesaplamadan farklı'
+        conn.close()
+
+    for step in range(args.steps):
+        ym = rng.choice(MONTHS)
+        op = rng.random()
+        if op < 0.6:
+            resp = client.post('/api/worklogs', json={
+                'empId': rng.choice(emp_ids()), 'date': random_date(ym),
+                'type': rng.choice(['day', 'evening']), 'value': rng.randint(0, 9)})
+        elif op < 0.7:
+            resp = upload(ym)
+        elif op < 0.8:
+            resp = client.post('/api/holidays', json={'date': random_date(ym)})
+        elif op < 0.88:
+            holidays = client.get('/api/holidays').get_json()
+            resp = client.delete(f'/api/holidays/{rng.choice(holidays)}') if holidays else None
+        elif op < 0.93:
+            resp = client.post('/api/holidays/official/import', json={'holidays': [
+                {'date': random_date('2026-01'), 'description': 'Test'} for _ in range(3)]})
+        else:
+            ids = emp_ids()
+            resp = client.delete(f'/api/employees/{rng.choice(ids)}') if len(ids) > 5 else None
+        if resp is not None:
+            assert resp.status_code < 500, resp.get_data(as_text=True)
+        if step % 10 == 0 or step == args.steps - 1:
+            verify(step)
+
+    print(f'{args.steps} adım: aylık özetler ve raporlar tam yeniden hesaplamayla tutarlı - OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Paralel rapor hesabı (calculate_payments_parallel) için ölçekleme ölçümü ve sıra/sonuç kontrolü.
+
+Rastgele N çalışan ve aylık toplamlarla ay raporu önce seri (calculate_payments_from_totals),
+sonra 1..W worker'lı process havuzuyla hesaplanır. Sonuçların seri hesapla aynı sırada ve
+birebir aynı olduğu doğrulanır. Havuz ısınma süresi ölçüme dahil edilmez.
+
+Kullanım:
+    python bench/parallel_report.py [--employees 50000] [--workers 1,2,4] [--chunk 2000] [--months 1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payroll import (MonthCalendar, calculate_payments_from_totals, calculate_payments_parallel,  # noqa: E402
+                     calculate_range_report, calculate_range_report_parallel, get_process_pool)
+
+CONFIG_KEYS = ['include_min_wage', 'include_fixed_salary', 'include_fixed_overtime_pay',
+               'include_fixed_hours_quota', 'include_overtime_calc', 'include_on_call']
+SETTINGS = {'dayRate': 100.0, 'eveningRate': 120.0, 'minimumWage': 17002.0}
+
+
+def make_data(rng, count, months):
+    employees, totals = [], {}
+    for i in range(1, count + 1):
+        emp = {'id': i, 'name': f'Çalışan {i}', 'emp_id': str(1000 + i), 'branch': rng.choice(['Mat', 'Fizik', None]),
+               'salary_type_id': 1, 'salary_type_name': 'Test', 'fixed_salary': rng.choice([0, 25000.5]),
+               'fixed_overtime_pay': rng.choice([0, 1500]), 'fixed_day_hours': rng.choice([0, 6]),
+               'fixed_evening_hours': rng.choice([0, 4])}
+        emp.update({key: rng.randint(0, 1) for key in CONFIG_KEYS})
+        employees.append(emp)
+        for year_month in months:
+            totals[(i, year_month)] = tuple(rng.randint(0, 60) for _ in range(4))
+    return employees, totals
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--workers', default=','.join(str(w) for w in sorted({1, 2, os.cpu_count() or 1})))
+    parser.add_argument('--chunk', type=int, default=None, help='varsayılan: worker başına ~4 parça')
+    parser.add_argument('--months', type=int, default=1, help='>1 ise aralık raporu (calculate_range_report) ölçülür')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    months = [f'2025-{m:02d}' for m in range(1, 13)][:args.months] if args.months <= 12 else \
+        [f'{2025 + i // 12}-{i % 12 + 1:02d}' for i in range(args.months)]
+    employees, totals = make_data(rng, args.employees, months)
+    calendars = {year_month: MonthCalendar(year_month) for year_month in months}
+
+    if args.months == 1:
+        month_totals = {emp_id: buckets for (emp_id, _), buckets in totals.items()}
+        serial = lambda: calculate_payments_from_totals(employees, calendars[months[0]], month_totals, SETTINGS)  # noqa: E731
+        parallel = lambda w: calculate_payments_parallel(employees, calendars[months[0]], month_totals, SETTINGS,  # noqa: E731
+                                                         workers=w, chunk_size=args.chunk)
+    else:
+        serial = lambda: calculate_range_report(employees, calendars, totals, SETTINGS)  # noqa: E731
+        parallel = lambda w: calculate_range_report_parallel(employees, calendars, totals, SETTINGS,  # noqa: E731
+                                                             workers=w, chunk_size=args.chunk)
+
+    print(f"{args.employees} çalışan x {len(months)} ay, parça {args.chunk}, CPU {os.cpu_count()}")
+    t_serial, expected = timed(serial)
+    print(f"  seri           : {t_serial * 1000:8.1f} ms")
+    for workers in [int(w) for w in args.workers.split(',')]:
+        get_process_pool(workers).submit(int).result()  # havuzu ve alt process'leri ısıt
+        parallel(workers)
+        t_parallel, actual = timed(lambda: parallel(workers))
+        assert actual == expected, f'{workers} worker: sonuç/sıra seri hesaptan farklı'
+        print(f"  {workers:2d} worker      : {t_parallel * 1000:8.1f} ms  ({t_serial / t_parallel:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Toplu maaş motoru (calculate_payments_batch) için eşdeğerlik kontrolü ve hız karşılaştırması.
+
+Rastgele çalışan/log verisiyle her ay için calculate_payment_for_employee ile birebir aynı
+sonucu ürettiği doğrulanır, ardından 10k çalışanlık bir ay iki yolla ölçülür.
+
+Kullanım:
+    python bench/payroll_engine.py [--employees 10000] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payroll import MonthCalendar, calculate_payment_for_employee, calculate_payments_batch, get_days_in_month  # noqa: E402
+
+# (name, min_wage, fixed_sal, fixed_ot_pay, fixed_quota, ot_calc, on_call) - database.init_db ile aynı
+SALARY_TYPES = [
+    ('Asgari Ücret + Fazla Mesai', 1, 0, 0, 0, 1, 0),
+    ('Yalnızca Sabit Maaş', 0, 1, 0, 0, 0, 0),
+    ('Sabit Maaş + Nöbet', 0, 1, 0, 0, 0, 1),
+    ('Yalnızca Fazla Mesai', 0, 0, 0, 0, 1, 0),
+    ('Asgari Ücret + Sabit FM Saati (Eski)', 1, 0, 0, 1, 0, 0),
+    ('Asgari Ücret + Sabit FM Ücreti', 1, 0, 1, 0, 0, 0),
+    ('Asgari Ücret + Ders Saati + Nöbet', 1, 0, 0, 1, 0, 1),
+    ('Hepsi', 1, 1, 1, 1, 1, 1),
+]
+CONFIG_KEYS = ['include_min_wage', 'include_fixed_salary', 'include_fixed_overtime_pay',
+               'include_fixed_hours_quota', 'include_overtime_calc', 'include_on_call']
+SETTINGS = {'dayRate': 100.0, 'eveningRate': 120.0, 'minimumWage': 17002.0}
+
+
+def make_employees(rng, count):
+    employees = []
+    for i in range(1, count + 1):
+        emp = {
+            'id': i, 'name': f'Çalışan {i}', 'emp_id': str(1000 + i), 'branch': rng.choice(['Mat', 'Fizik', None]),
+            'fixed_salary': rng.choice([0, None, 25000.5]), 'fixed_overtime_pay': rng.choice([0, None, 1500]),
+            'fixed_day_hours': rng.choice([0, None, 6, 2.5]), 'fixed_evening_hours': rng.choice([0, None, 4]),
+        }
+        if rng.random() < 0.05:
+            emp.update({'salary_type_id': None, 'salary_type_name': None})
+        else:
+            st = rng.randrange(len(SALARY_TYPES))
+            emp.update({'salary_type_id': st + 1, 'salary_type_name': SALARY_TYPES[st][0]})
+            emp.update(dict(zip(CONFIG_KEYS, SALARY_TYPES[st][1:])))
+        employees.append(emp)
+    return employees
+
+
+def make_logs(rng, employees, year_month, density=0.5):
+    year, month = map(int, year_month.split('-'))
+    logs = []
+    for emp in employees:
+        for day in range(1, get_days_in_month(year_month) + 1):
+            if rng.random() < density:
+                logs.append({'employee_id': emp['id'], 'date': date(year, month, day).isoformat(),
+                             'day_hours': rng.randint(0, 8), 'evening_hours': rng.randint(0, 4)})
+    return logs
+
+
+def per_employee(employees, year_month, logs, holidays):
+    logs_by_emp = {}
+    for log in logs:
+        logs_by_emp.setdefault(log['employee_id'], {})[log['date']] = log
+    return [calculate_payment_for_employee(emp, year_month, logs_by_emp.get(emp['id'], {}), holidays, SETTINGS)
+            for emp in employees]
+
+
+def check_equivalence(rng):
+    months = [f'2025-{m:02d}' for m in range(1, 13)] + ['2024-02', '2026-01']
+    employees = make_employees(rng, 300)
+    for year_month in months:
+        holidays = [f'{year_month}-{d:02d}' for d in rng.sample(range(1, 29), 2)]
+        logs = make_logs(rng, employees, year_month)
+        expected = per_employee(employees, year_month, logs, holidays)
+        actual = calculate_payments_batch(employees, MonthCalendar(year_month, holidays), logs, SETTINGS)
+        assert expected == actual, f'{year_month}: toplu motor farklı sonuç üretti'
+    print(f'Eşdeğerlik: {len(months)} ay x {len(employees)} çalışan - OK')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    check_equivalence(rng)
+
+    year_month = '2025-04'
+    employees = make_employees(rng, args.employees)
+    logs = make_logs(rng, employees, year_month)
+    holidays = ['2025-04-15']
+
+    t0 = time.perf_counter()
+    expected = per_employee(employees, year_month, logs, holidays)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    actual = calculate_payments_batch(employees, MonthCalendar(year_month, holidays), logs, SETTINGS)
+    t_new = time.perf_counter() - t0
+    assert expected == actual
+
+    print(f'{args.employees} çalışan, {len(logs)} log satırı ({year_month})')
+    print(f'  çalışan başına : {t_old * 1000:9.1f} ms')
+    print(f'  toplu motor    : {t_new * 1000:9.1f} ms  ({t_old / t_new:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
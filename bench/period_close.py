@@ -0,0 +1,133 @@
+"""Dönem kapatma (/api/periods/<ay>/close) için doğruluk ve rapor okuma süresi ölçümü.
+
+N çalışanlık veri bench/datagen.py ile üretilir. Önce açık ayın raporu (önbellek boş) ve CSV
+dışa aktarması ölçülür; ay kapatılır ve aynı ölçümler anlık görüntüden tekrarlanır. Ardından
+kapatılmış raporun kapatma öncesi hesapla aynı olduğu, ayar değişikliğinden etkilenmediği, mesai
+yazmalarının her yoldan reddedildiği, sonradan silinen çalışanın aralık raporunda kaldığı ve
+yeniden açmanın gerekçe isteyip işlem geçmişine yazıldığı doğrulanır.
+
+Kullanım:
+    python bench/period_close.py [--employees 5000] [--month 2025-03] [--repeat 5]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import datagen  # noqa: E402
+
+
+def median_ms(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--month', default='2025-03')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    ym = args.month
+
+    tmp = tempfile.TemporaryDirectory()
+    db_file = os.path.join(tmp.name, 'period.db')
+    os.environ['DATABASE_FILE'] = db_file
+    os.environ['JOBS_DIR'] = os.path.join(tmp.name, 'jobs')
+    logging.disable(logging.WARNING)
+    data = datagen.generate(db_file, employees=args.employees, months=2, first_month=ym)
+    print(f"{data['employees']} çalışan, {data['work_logs']} log satırı")
+
+    import app as app_module
+    from database import get_db_connection
+    client = app_module.app.test_client()
+    clear = app_module.response_cache.clear
+
+    def get(url, expect=200):
+        response = client.get(url)
+        body = response.get_data()
+        assert response.status_code == expect, (url, response.status_code, body[:200])
+        return response
+
+    def timings(label):
+        report = median_ms(lambda: get(f'/api/report/{ym}'), args.repeat, clear)
+        page = median_ms(lambda: get(f'/api/report/{ym}?limit=100&sort=name'), args.repeat, clear)
+        export = median_ms(lambda: get(f'/api/report/export/{ym}?format=csv'), args.repeat)
+        print(f"  {label:6s}: rapor {report:8.1f} ms, sayfa (100, ada göre) {page:7.1f} ms, CSV {export:8.1f} ms")
+
+    before = get(f'/api/report/{ym}').get_json()
+    before_page = get(f'/api/report/{ym}?limit=50&sort=-name&branch=Fizik').get_json()
+    before_range = get(f'/api/report/range?from={ym}&to={ym}').get_json()
+    timings('açık')
+
+    started = time.perf_counter()
+    response = client.post(f'/api/periods/{ym}/close', json={'actor': 'bench'})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    print(f"  kapatma: {(time.perf_counter() - started) * 1000:.1f} ms, {response.get_json()['employeeCount']} satır")
+    timings('kapalı')
+
+    # Anlık görüntü kapatma öncesi hesapla aynı; sonradan değişen ayarlar kapalı ayı etkilemez
+    assert get(f'/api/report/{ym}').get_json() == before
+    assert get(f'/api/report/{ym}?limit=50&sort=-name&branch=Fizik').get_json() == before_page
+    client.post('/api/settings', json={'dayRate': 999, 'minimumWage': 1})
+    assert get(f'/api/report/{ym}').get_json() == before
+    assert get(f'/api/report/range?from={ym}&to={ym}').get_json() == before_range
+    assert client.post(f'/api/periods/{ym}/close', json={}).status_code == 409
+
+    # Mesai yazmaları reddedilir: tekil, toplu, Excel yükleme ve doğrudan SQL (trigger)
+    cell = {'empId': 1, 'date': f'{ym}-10', 'type': 'day', 'value': 7}
+    assert client.post('/api/worklogs', json=cell).status_code == 409
+    batch = client.post('/api/worklogs/batch', json={'changes': [cell]}).get_json()
+    assert batch['applied'] == 0 and 'kapatılmış' in batch['results'][0]['error']
+    conn = get_db_connection()
+    try:
+        conn.execute("UPDATE work_logs SET day_hours = day_hours + 1 WHERE date LIKE ?", (f'{ym}-%',))
+        raise AssertionError('kapalı aya yazılabildi')
+    except sqlite3.IntegrityError:
+        conn.rollback()
+    # Sonraki ay açık kalır
+    next_month = datagen.month_list(ym, 2)[1]
+    assert client.post('/api/worklogs', json=dict(cell, date=f'{next_month}-10')).status_code == 200
+
+    # Kapatmadan sonra silinen çalışan aralık raporunda da anlık görüntüdeki tutarla yer alır
+    assert client.delete('/api/employees/2').status_code == 200
+    monthly = get(f'/api/report/{ym}').get_json()
+    deleted_row = next(row for row in monthly if row['emp_id'] == 2)
+    full = get(f'/api/report/range?from={ym}&to={next_month}').get_json()
+    assert round(sum(r['months'][0]['totalPayment'] for r in full), 2) == round(sum(r['totalPayment'] for r in monthly), 2)
+    ghost = next(r for r in full if r['emp_id'] == 2)
+    assert ghost['months'][0]['totalPayment'] == deleted_row['totalPayment'] and ghost['months'][1]['totalPayment'] == 0
+    paged, after = [], ''
+    while True:
+        page = get(f'/api/report/range?from={ym}&to={next_month}&sort=-name&limit=333{after}').get_json()
+        paged += page['items']
+        if not page['nextCursor']:
+            break
+        after = f"&after={page['nextCursor']}"
+    assert sorted(r['emp_id'] for r in paged) == sorted(r['emp_id'] for r in full)
+    assert [r['name'] for r in paged] == sorted((r['name'] for r in paged), reverse=True)
+
+    assert client.post(f'/api/periods/{ym}/reopen', json={}).status_code == 400
+    assert client.post(f'/api/periods/{ym}/reopen', json={'reason': 'düzeltme', 'actor': 'bench'}).status_code == 200
+    assert client.post('/api/worklogs', json=cell).status_code == 200
+    assert get(f'/api/report/{ym}').get_json() != before  # yeni ayarlarla yeniden hesaplanır
+    audit = get(f'/api/periods/{ym}').get_json()['audit']
+    assert [(a['action'], a['actor']) for a in audit] == [('close', 'bench'), ('reopen', 'bench')]
+    print("Doğruluk: anlık görüntü = kapatma öncesi rapor, yazma kilidi ve yeniden açma - OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Aralık raporu (/api/report/range) için doğruluk kontrolü ve süre ölçümü.
+
+N çalışan x Y yıllık rastgele veri tohumlanır. Aralık raporunun her çalışan/ay değeri aylık
+raporla (/api/report/<ay>) karşılaştırılır; ardından önbellek boşken tek aralık isteği ile
+ay başına ayrı istekler ölçülür ve Excel dışa aktarma süresi raporlanır.
+
+Kullanım:
+    python bench/range_report.py [--employees 1000] [--years 5] [--density 0.6]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--density', type=float, default=0.6)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_FILE'] = os.path.join(tmp.name, 'range.db')
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.INFO)
+    import app as app_module
+    from database import drop_work_log_triggers, get_db_connection, rebuild_monthly_totals, write_transaction
+
+    first_year = 2021
+    conn = get_db_connection()
+    t0 = time.perf_counter()
+    with write_transaction(conn):
+        # Tohumlama hızı için özet trigger'ları devre dışı; özetler sonda toplu hesaplanır
+        drop_work_log_triggers(conn)
+        types = [row[0] for row in conn.execute("SELECT id FROM salary_types").fetchall()]
+        conn.executemany("INSERT INTO employees (name, emp_id, salary_type_id, fixed_salary, fixed_day_hours) VALUES (?, ?, ?, ?, ?)",
+                         [(f'Çalışan {i:05d}', str(1000 + i), rng.choice(types), rng.choice([0, 25000]), rng.choice([0, 4]))
+                          for i in range(args.employees)])
+        day, end = date(first_year, 1, 1), date(first_year + args.years, 1, 1)
+        while day < end:
+            ds = day.isoformat()
+            conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (?, ?, ?, ?)",
+                             [(emp_id, ds, rng.randint(0, 8), rng.randint(0, 4))
+                              for emp_id in range(1, args.employees + 1) if rng.random() < args.density])
+            day += timedelta(days=1)
+        rebuild_monthly_totals(conn)
+    rows = conn.execute("SELECT COUNT(*) FROM work_logs").fetchone()[0]
+    conn.close()
+    app_module.init_db()  # trigger'ları geri kur
+    print(f"Seed: {args.employees} çalışan, {args.years} yıl, {rows} log satırı ({time.perf_counter() - t0:.1f}s)")
+
+    client = app_module.app.test_client()
+    first, last = f'{first_year}-01', f'{first_year + args.years - 1}-12'
+    months = [f'{y}-{m:02d}' for y in range(first_year, first_year + args.years) for m in range(1, 13)]
+
+    app_module.response_cache.clear()
+    t0 = time.perf_counter()
+    response = client.get(f'/api/report/range?from={first}&to={last}')
+    body = response.get_data()
+    t_range = time.perf_counter() - t0
+    assert response.status_code == 200, body[:200]
+    report = response.get_json()
+
+    app_module.response_cache.clear()
+    t0 = time.perf_counter()
+    monthly = {ym: client.get(f'/api/report/{ym}').get_json() for ym in months}
+    t_monthly = time.perf_counter() - t0
+
+    for emp_index, data in enumerate(report):
+        cumulative = 0
+        for row in data['months']:
+            expected = monthly[row['month']][emp_index]
+            assert expected['name'] == data['name']
+            for field in ('totalHours', 'overtimeHours', 'overtimePayment', 'totalPayment'):
+                assert row[field] == expected[field], (data['name'], row['month'], field)
+            cumulative += expected['totalPayment']
+            assert row['cumulativePayment'] == cumulative
+    print(f"Doğruluk: {len(report)} çalışan x {len(months)} ay aylık raporla aynı - OK")
+
+    t0 = time.perf_counter()
+    export = client.get(f'/api/report/range/export?from={first}&to={last}')
+    size = len(export.get_data())
+    t_export = time.perf_counter() - t0
+
+    print(f"  aralık raporu (tek istek) : {t_range:6.2f}s, {len(body) / 1e6:.1f} MB JSON")
+    print(f"  {len(months)} ayrı aylık istek     : {t_monthly:6.2f}s")
+    print(f"  Excel dışa aktarma        : {t_export:6.2f}s, {size / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Aylık rapor dışa aktarma (/api/report/export/<ay>?format=) için biçim başına süre ölçümü.
+
+N çalışanlık veri bench/datagen.py ile üretilir. Her biçim (csv, ndjson, xlsx) için ilk baytın
+gelme süresi, toplam süre ve boyut ölçülür; karşılaştırma için önceki yöntem (tüm rapor listesi
++ sayıları f-string'e çeviren tam openpyxl workbook) de çalıştırılır. Çıktıların satır sayısı
+çalışan sayısıyla karşılaştırılır.
+
+Kullanım:
+    python bench/report_export_formats.py [--employees 10000] [--repeat 3]
+"""
+import argparse
+import csv
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import datagen  # noqa: E402
+
+
+def legacy_export(conn, app_module, year_month):
+    """Önceki export_report: tüm rapor bellekte, sayılar metin olarak."""
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet("Maaş Raporu")
+    sheet.append([header for header, _, _ in app_module.REPORT_EXPORT_COLUMNS])
+    for data in app_module.build_report(conn, year_month):
+        sheet.append([
+            data['name'], data['empId'], data.get('branch', ''), data['paymentType'],
+            f"{data['fixedSalary']:.2f}", f"{data['minimumWage']:.2f}",
+            data['overtimeHours'], f"{data['overtimePayment']:.2f}",
+            f"{data['totalPayment']:.2f}", data['calculationDetails']
+        ])
+    with tempfile.TemporaryFile() as f:
+        wb.save(f)
+        return f.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--month', default='2025-03')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_file = os.path.join(tmp.name, 'export.db')
+    os.environ['DATABASE_FILE'] = db_file
+    logging.disable(logging.WARNING)
+    started = time.perf_counter()
+    data = datagen.generate(db_file, employees=args.employees, months=1, first_month=args.month)
+    print(f"{data['employees']} çalışan, {data['work_logs']} log satırı ({time.perf_counter() - started:.1f}s)")
+
+    import openpyxl
+    import app as app_module
+    from database import get_db_connection
+    client = app_module.app.test_client()
+
+    def check(fmt, body):
+        if fmt == 'csv':
+            rows = list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+        elif fmt == 'ndjson':
+            rows = [None] + body.decode('utf-8').splitlines()
+        else:
+            rows = list(openpyxl.load_workbook(io.BytesIO(body), read_only=True).active.iter_rows(values_only=True))
+        assert len(rows) == args.employees + 1, (fmt, len(rows))
+
+    for fmt in ('csv', 'ndjson', 'xlsx'):
+        first_byte, total, size = [], [], 0
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            response = client.get(f'/api/report/export/{args.month}?format={fmt}')
+            chunks = iter(response.response)
+            body = next(chunks)
+            first_byte.append(time.perf_counter() - started)
+            body += b''.join(chunks)
+            total.append(time.perf_counter() - started)
+            response.close()
+            size = len(body)
+        check(fmt, body)
+        print(f"  {fmt:7s}: ilk bayt {statistics.median(first_byte) * 1000:7.1f} ms, "
+              f"toplam {statistics.median(total) * 1000:7.1f} ms, {size / 1024:8.1f} KiB")
+
+    conn = get_db_connection()
+    samples = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        size = legacy_export(conn, app_module, args.month)
+        samples.append(time.perf_counter() - started)
+    conn.close()
+    print(f"  önceki : ilk bayt = toplam {statistics.median(samples) * 1000:7.1f} ms, {size / 1024:8.1f} KiB (xlsx)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Saat kategorilerinin (hafta içi/sonu x gündüz/akşam) SQL GROUP BY ile hesaplanması: doğruluk ve süre.
+
+Önce rastgele tatillerle (hafta içi ve hafta sonuna denk gelen, özel ve resmi) tohumlanan küçük
+bir veride her ay için Python bucket_logs, SQL aggregate_month_totals ve trigger'larla tutulan
+monthly_employee_totals birbiriyle karşılaştırılır; check_monthly_totals'ın bozulmuş bir özeti
+yakaladığı da doğrulanır. Ardından büyük veride bir ay için ham satırları çekip Python'da
+kovalamak, SQL'de gruplamak ve saklanan özeti okumak ölçülür; tam/aylık yeniden hesaplama ve
+tutarlılık kontrolü süreleri raporlanır.
+
+Kullanım:
+    python bench/sql_bucketing.py [--employees 1000] [--years 5] [--density 0.6] [--repeat 5]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def median_time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def seed(conn, rng, employees, first_year, years, density, holidays_per_year):
+    """Çalışan, tatil ve log satırlarını ekler; bir de biçimi bozuk tarihli satır (sayılmamalı).
+
+    Not: SQLite date() 'YYYY-02-30' gibi ayda olmayan günleri reddetmez; bu tarihler API'de
+    date.fromisoformat ile zaten engellendiğinden burada yalnızca biçim hatası denenir.
+    """
+    conn.executemany("INSERT INTO employees (name) VALUES (?)", [(f'Çalışan {i:05d}',) for i in range(employees)])
+    days, day, end = [], date(first_year, 1, 1), date(first_year + years, 1, 1)
+    while day < end:
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    picked = rng.sample(days, holidays_per_year * years)
+    half = len(picked) // 2
+    conn.executemany("INSERT INTO holidays (date) VALUES (?)", [(d,) for d in picked[:half]])
+    conn.executemany("INSERT OR IGNORE INTO official_holidays (date, description) VALUES (?, 'Test')",
+                     [(d,) for d in picked[half:]])
+    for ds in days:
+        conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (?, ?, ?, ?)",
+                         [(emp_id, ds, rng.randint(0, 8), rng.randint(0, 4))
+                          for emp_id in range(1, employees + 1) if rng.random() < density])
+    conn.execute("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours) VALUES (1, ?, 5, 5)",
+                 (f'{first_year}-02-1',))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--density', type=float, default=0.6)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tmp = tempfile.TemporaryDirectory()
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.INFO)
+    import database
+    from payroll import MonthCalendar, bucket_logs
+
+    def open_db(name):
+        database.DB_FILE = os.path.join(tmp.name, name)
+        database.init_db()
+        return database.get_db_connection()
+
+    def holiday_dates(conn):
+        return [r[0] for r in conn.execute("SELECT date FROM holidays UNION SELECT date FROM official_holidays")]
+
+    def stored_totals(conn, ym):
+        columns = ', '.join(database.TOTAL_COLUMNS)
+        return {row[0]: tuple(row[1:]) for row in conn.execute(
+            f"SELECT employee_id, {columns} FROM monthly_employee_totals WHERE year_month = ?", (ym,))}
+
+    def python_totals(conn, ym, holidays):
+        logs = conn.execute("SELECT employee_id, date, day_hours, evening_hours FROM work_logs "
+                            "WHERE date >= ? AND date <= ?", (f'{ym}-01', f'{ym}-31')).fetchall()
+        return bucket_logs(MonthCalendar(ym, holidays), logs)
+
+    def nonzero(totals):
+        return {emp_id: buckets for emp_id, buckets in totals.items() if any(buckets)}
+
+    # Doğruluk: trigger'lar açıkken tohumlanan küçük veri
+    conn = open_db('small.db')
+    with database.write_transaction(conn):
+        seed(conn, rng, 40, 2024, 2, 0.7, 40)
+    holidays = holiday_dates(conn)
+    months = [f'{y}-{m:02d}' for y in (2024, 2025) for m in range(1, 13)]
+    for ym in months:
+        expected = python_totals(conn, ym, holidays)
+        assert nonzero(database.aggregate_month_totals(conn, ym)) == nonzero(expected), f'{ym}: SQL != Python'
+        assert nonzero(stored_totals(conn, ym)) == nonzero(expected), f'{ym}: özet != Python'
+    assert not database.check_monthly_totals(conn)
+    with database.write_transaction(conn):
+        conn.execute("UPDATE monthly_employee_totals SET weekend_day = weekend_day + 1 "
+                     "WHERE rowid = (SELECT MIN(rowid) FROM monthly_employee_totals)")
+    assert len(database.check_monthly_totals(conn)) == 2, 'bozulmuş özet yakalanmadı'
+    with database.write_transaction(conn):
+        database.rebuild_monthly_totals(conn)
+    assert not database.check_monthly_totals(conn)
+    conn.close()
+    print(f"Doğruluk: {len(months)} ay, {len(holidays)} tatil; Python = SQL GROUP BY = özet tablosu - OK")
+
+    # Süre: büyük veri, tohumlama hızı için trigger'lar kapalı, özetler sonda toplu hesaplanır
+    conn = open_db('large.db')
+    t0 = time.perf_counter()
+    with database.write_transaction(conn):
+        database.drop_work_log_triggers(conn)
+        seed(conn, rng, args.employees, 2021, args.years, args.density, 18)
+    rows = conn.execute("SELECT COUNT(*) FROM work_logs").fetchone()[0]
+    print(f"Seed: {args.employees} çalışan, {args.years} yıl, {rows} log satırı ({time.perf_counter() - t0:.1f}s)")
+
+    with database.write_transaction(conn):
+        t_rebuild = median_time(lambda: database.rebuild_monthly_totals(conn), 1)
+    with database.write_transaction(conn):
+        t_rebuild_month = median_time(lambda: database.rebuild_monthly_totals(conn, '2023-03'), args.repeat)
+    t_check = median_time(lambda: database.check_monthly_totals(conn), 1)
+
+    ym, holidays = '2023-03', holiday_dates(conn)
+    t_python = median_time(lambda: python_totals(conn, ym, holidays), args.repeat)
+    t_sql = median_time(lambda: database.aggregate_month_totals(conn, ym), args.repeat)
+    t_stored = median_time(lambda: stored_totals(conn, ym), args.repeat)
+    assert nonzero(database.aggregate_month_totals(conn, ym)) == nonzero(python_totals(conn, ym, holidays))
+    conn.close()
+
+    print(f"  {ym} kovalama, ham satırlar + Python : {t_python * 1000:7.1f} ms")
+    print(f"  {ym} kovalama, SQL GROUP BY          : {t_sql * 1000:7.1f} ms ({t_python / t_sql:.1f}x)")
+    print(f"  {ym} saklanan özet okuma             : {t_stored * 1000:7.1f} ms")
+    print(f"  tam yeniden hesaplama               : {t_rebuild:7.2f} s")
+    print(f"  tek ay yeniden hesaplama            : {t_rebuild_month * 1000:7.1f} ms")
+    print(f"  tutarlılık kontrolü                 : {t_check:7.2f} s")
+
+
+if __name__ == '__main__':
+    main()
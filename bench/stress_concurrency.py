@@ -0,0 +1,138 @@
+"""Eşzamanlı POST /api/worklogs ve GET /api/report/<ym> yük testi.
+
+Birden çok process (gunicorn worker'larını taklit eder) ve her birinde birden çok thread aynı
+SQLite dosyasına yazar/okur. Sonunda kilit hatası olmadığı ve hiçbir güncellemenin kaybolmadığı
+doğrulanır; aynı satırın gündüz ve akşam alanlarını farklı worker'lar yazar.
+
+Kullanım:
+    python bench/stress_concurrency.py [--processes 4] [--threads 4] [--employees 40] [--rounds 3]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YEAR_MONTH = '2025-03'
+
+
+def worker(db_file, proc_idx, threads, employees, rounds, result_queue):
+    os.environ['DATABASE_FILE'] = db_file
+    sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.INFO)
+    import app as app_module
+
+    errors = []
+    counts = {'writes': 0, 'reads': 0}
+    lock = threading.Lock()
+
+    def writer(thread_idx):
+        client = app_module.app.test_client()
+        # Process'in çift/tek olmasına göre aynı satırın farklı alanını yaz
+        log_type = 'day' if proc_idx % 2 == 0 else 'evening'
+        for rnd in range(1, rounds + 1):
+            for emp in range(1, employees + 1):
+                day = (proc_idx // 2) * threads + thread_idx + 1
+                if day > 28:
+                    continue
+                value = rnd
+                resp = client.post('/api/worklogs', json={
+                    'empId': emp, 'date': f'{YEAR_MONTH}-{day:02d}', 'type': log_type, 'value': value
+                })
+                with lock:
+                    counts['writes'] += 1
+                    if resp.status_code != 200:
+                        errors.append(f'POST {resp.status_code}: {resp.get_data(as_text=True)[:200]}')
+
+    def reader():
+        client = app_module.app.test_client()
+        for _ in range(rounds * 5):
+            resp = client.get(f'/api/report/{YEAR_MONTH}')
+            with lock:
+                counts['reads'] += 1
+                if resp.status_code != 200:
+                    errors.append(f'GET {resp.status_code}: {resp.get_data(as_text=True)[:200]}')
+
+    pool = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    pool.append(threading.Thread(target=reader))
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    result_queue.put((errors, counts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--employees', type=int, default=40)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'stress.db')
+        os.environ['DATABASE_FILE'] = db_file
+        sys.path.insert(0, ROOT)
+        import database
+        database.DB_FILE = db_file
+        database.init_db()
+        conn = database.get_db_connection()
+        conn.executemany("INSERT INTO employees (name) VALUES (?)", [(f'E{i}',) for i in range(args.employees)])
+        conn.commit()
+        conn.close()
+
+        ctx = multiprocessing.get_context('spawn')
+        queue = ctx.Queue()
+        procs = [ctx.Process(target=worker, args=(db_file, i, args.threads, args.employees, args.rounds, queue))
+                 for i in range(args.processes)]
+        started = time.perf_counter()
+        for p in procs:
+            p.start()
+        results = [queue.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - started
+
+        errors = [e for errs, _ in results for e in errs]
+        writes = sum(c['writes'] for _, c in results)
+        reads = sum(c['reads'] for _, c in results)
+        print(f"{writes} yazma, {reads} rapor okuması, {elapsed:.2f}s ({writes / elapsed:.0f} yazma/sn)")
+
+        # Kayıp güncelleme kontrolü: her hücrenin son değeri `rounds` olmalı
+        conn = sqlite3.connect(db_file)
+        writer_days = {}
+        for proc_idx in range(args.processes):
+            field = 'day_hours' if proc_idx % 2 == 0 else 'evening_hours'
+            for thread_idx in range(args.threads):
+                day = (proc_idx // 2) * args.threads + thread_idx + 1
+                if day <= 28:
+                    writer_days.setdefault(day, set()).add(field)
+        lost = 0
+        for day, fields in writer_days.items():
+            for field in fields:
+                lost += conn.execute(
+                    f"SELECT COUNT(*) FROM work_logs WHERE date = ? AND {field} != ?",
+                    (f'{YEAR_MONTH}-{day:02d}', args.rounds)
+                ).fetchone()[0]
+            rows = conn.execute("SELECT COUNT(*) FROM work_logs WHERE date = ?", (f'{YEAR_MONTH}-{day:02d}',)).fetchone()[0]
+            lost += abs(rows - args.employees)
+        dupes = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM work_logs GROUP BY employee_id, date HAVING COUNT(*) > 1)"
+        ).fetchone()[0]
+        conn.close()
+
+        for e in errors[:10]:
+            print('  HATA', e)
+        print(f"Hatalar: {len(errors)}, kayıp güncelleme: {lost}, tekrarlanan satır: {dupes}")
+        if errors or lost or dupes:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Tekrarlanabilir benchmark paketi: ana yolların süreleri, commit'ler arası karşılaştırma için JSON.
+
+bench/datagen.py ile yeni bir veritabanı deterministik olarak üretilir, ardından uygulama
+test istemcisiyle şu yollar ölçülür (her biri --repeat kez; medyan/min/maks ms):
+  get_report (önbellek boş ve dolu), get_work_logs (iç içe ve matris), export_report,
+  export_all_data, upload_worklogs (bir aylık Excel, ?sync=1) ve hücre başına update_work_log.
+
+Sonuçlar varsayılan olarak bench/results/<commit>.json dosyasına yazılır; --compare ile önceki
+bir sonuç dosyasıyla oran tablosu basılır.
+
+Kullanım:
+    python bench/suite.py [--employees 500] [--months 12] [--repeat 5] [--output sonuc.json]
+                          [--compare bench/results/<eski>.json] [datagen parametreleri]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import datagen  # noqa: E402
+
+
+def git_revision():
+    def git(*cmd):
+        return subprocess.run(['git', *cmd], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    try:
+        return git('rev-parse', '--short', 'HEAD') or None, bool(git('status', '--porcelain', '--untracked-files=no'))
+    except OSError:
+        return None, False
+
+
+def measure(fn, repeat, setup=None):
+    """fn'i repeat kez çalıştırır (her seferinden önce setup); ms cinsinden özet döner."""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(samples), 3), 'min_ms': round(min(samples), 3),
+            'max_ms': round(max(samples), 3), 'runs': repeat}
+
+
+def month_workbook(year_month, employees):
+    """Ayın tüm çalışanları için Gündüz/Akşam Mesaisi sayfalı yükleme dosyası (bytes)."""
+    import openpyxl
+    from payroll import get_days_in_month
+    dates = [f'{year_month}-{d:02d}' for d in range(1, get_days_in_month(year_month) + 1)]
+    wb = openpyxl.Workbook(write_only=True)
+    day, evening = wb.create_sheet('Gündüz Mesaisi'), wb.create_sheet('Akşam Mesaisi')
+    day.append(['Ad Soyad'] + dates)
+    evening.append(['Ad Soyad'] + dates)
+    for i, emp in enumerate(employees):
+        day.append([emp['name']] + [(i + d) % 7 for d in range(len(dates))])
+        evening.append([emp['name']] + [(i * d) % 3 for d in range(len(dates))])
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def run(client, app_module, months, repeat):
+    ym = months[len(months) // 2]
+    results = {}
+
+    def get(url, expect=200):
+        response = client.get(url)
+        response.get_data()
+        assert response.status_code == expect, (url, response.status_code)
+        return response
+
+    def post(url, expect=200, **kwargs):
+        response = client.post(url, **kwargs)
+        assert response.status_code == expect, (url, response.status_code, response.get_data(as_text=True)[:200])
+        return response
+
+    clear = app_module.response_cache.clear
+    results['get_report'] = measure(lambda: get(f'/api/report/{ym}'), repeat, clear)
+    results['get_report_cached'] = measure(lambda: get(f'/api/report/{ym}'), repeat)
+    results['get_work_logs'] = measure(lambda: get(f'/api/worklogs/{ym}'), repeat, clear)
+    results['get_work_logs_matrix'] = measure(lambda: get(f'/api/worklogs/{ym}?format=matrix'), repeat, clear)
+    results['export_report'] = measure(lambda: get(f'/api/report/export/{ym}'), repeat)
+    results['export_all_data'] = measure(lambda: get('/api/export_all'), max(1, repeat // 2))
+
+    employees = get('/api/employees').get_json()
+    upload = month_workbook(ym, employees)
+    results['upload_worklogs'] = measure(
+        lambda: post('/api/worklogs/upload?sync=1', data={'file': (BytesIO(upload), 'mesai.xlsx')}),
+        max(1, repeat // 2))
+    results['upload_worklogs']['bytes'] = len(upload)
+
+    cells = [{'empId': emp['id'], 'date': f'{ym}-{day:02d}', 'type': kind, 'value': value}
+             for value, emp in enumerate(employees[:50]) for day in (3, 17) for kind in ('day', 'evening')]
+    samples = []
+    for cell in cells:
+        started = time.perf_counter()
+        post('/api/worklogs', json=cell)
+        samples.append((time.perf_counter() - started) * 1000)
+    results['update_work_log'] = {'median_ms': round(statistics.median(samples), 3), 'min_ms': round(min(samples), 3),
+                                  'max_ms': round(max(samples), 3), 'runs': len(samples)}
+    return results
+
+
+def print_results(results, baseline=None):
+    baseline = (baseline or {}).get('results', {})
+    for name, result in results.items():
+        line = f"  {name:22s} {result['median_ms']:10.1f} ms  (min {result['min_ms']:.1f}, maks {result['max_ms']:.1f})"
+        old = baseline.get(name)
+        if old:
+            line += f"  önceki {old['median_ms']:10.1f} ms  x{result['median_ms'] / old['median_ms']:.2f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    datagen.add_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help='varsayılan: bench/results/<commit>.json')
+    parser.add_argument('--compare', default=None, help='karşılaştırılacak önceki sonuç dosyası')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_file = os.path.join(tmp.name, 'suite.db')
+    os.environ['DATABASE_FILE'] = db_file
+    os.environ['JOBS_DIR'] = os.path.join(tmp.name, 'jobs')
+    logging.disable(logging.WARNING)
+
+    started = time.perf_counter()
+    data = datagen.generate_from_args(db_file, args)
+    print(f"Veri: {data['employees']} çalışan, {len(data['months'])} ay, {data['holidays']} tatil, "
+          f"{data['work_logs']} log satırı ({time.perf_counter() - started:.1f}s)")
+
+    import app as app_module
+    client = app_module.app.test_client()
+    results = run(client, app_module, data['months'], args.repeat)
+
+    revision, dirty = git_revision()
+    output = {
+        'meta': {
+            'commit': revision, 'dirty': dirty, 'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+            'repeat': args.repeat, 'data': data,
+        },
+        'results': results,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('data') != data:
+            print("Uyarı: karşılaştırılan sonuç farklı veri parametreleriyle üretilmiş.")
+    print_results(results, baseline)
+
+    path = args.output or os.path.join(BENCH_DIR, 'results', f"{revision or 'unknown'}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar: {path}")
+
+
+if __name__ == '__main__':
+    main()
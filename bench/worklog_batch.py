@@ -0,0 +1,100 @@
+"""Grid yazma yükü: hücre başına POST /api/worklogs ile POST /api/worklogs/batch karşılaştırması.
+
+Uygulama gerçek bir HTTP sunucusunda (werkzeug, thread'li) çalıştırılır. Bir bölümün bir aylık
+grid'i (çalışan x gün x gündüz/akşam) önce hücre başına istekle, sonra --batch boyutlu toplu
+isteklerle --clients eşzamanlı istemciden yazılır. Her moddan sonra tüm hücrelerin yazıldığı
+doğrulanır ve hücre/saniye raporlanır.
+
+Kullanım:
+    python bench/worklog_batch.py [--employees 60] [--month 2025-03] [--clients 4] [--batch 200]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def post(base_url, path, payload):
+    request = urllib.request.Request(base_url + path, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def run_clients(clients, work):
+    """work listesini istemcilere paylaştırıp paralel çalıştırır; geçen süreyi döner."""
+    threads = [threading.Thread(target=lambda items=work[i::clients]: [fn() for fn in items]) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=60)
+    parser.add_argument('--month', default='2025-03')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=200)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_FILE'] = os.path.join(tmp.name, 'batch.db')
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.INFO)
+    from werkzeug.serving import make_server
+    import app as app_module
+    from database import get_db_connection
+    from payroll import MonthCalendar
+
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    post(base_url, '/api/employees/bulk', {'employees': [{'name': f'Çalışan {i}'} for i in range(args.employees)]})
+    conn = get_db_connection()
+    emp_ids = [row[0] for row in conn.execute("SELECT id FROM employees").fetchall()]
+    dates = MonthCalendar(args.month).dates
+
+    def cells(value):
+        return [{'empId': emp_id, 'date': d, 'type': t, 'value': value}
+                for emp_id in emp_ids for d in dates for t in ('day', 'evening')]
+
+    def verify(value):
+        row = conn.execute("SELECT COUNT(*), SUM(day_hours = ?), SUM(evening_hours = ?) FROM work_logs",
+                           (value, value)).fetchone()
+        expected = len(emp_ids) * len(dates)
+        assert tuple(row) == (expected, expected, expected), f'eksik/yanlış yazılmış hücre: {tuple(row)}'
+
+    print(f"{len(emp_ids)} çalışan x {len(dates)} gün x 2 = {len(emp_ids) * len(dates) * 2} hücre, "
+          f"{args.clients} istemci")
+
+    changes = cells(3)
+    elapsed = run_clients(args.clients, [lambda c=c: post(base_url, '/api/worklogs', c) for c in changes])
+    verify(3)
+    per_cell = len(changes) / elapsed
+    print(f"  hücre başına   : {elapsed:6.2f}s, {len(changes)} istek, {per_cell:8.0f} hücre/s")
+
+    changes = cells(5)
+    batches = [changes[i:i + args.batch] for i in range(0, len(changes), args.batch)]
+    elapsed = run_clients(args.clients, [lambda b=b: post(base_url, '/api/worklogs/batch', {'changes': b}) for b in batches])
+    verify(5)
+    batched = len(changes) / elapsed
+    print(f"  toplu ({args.batch:4d})   : {elapsed:6.2f}s, {len(batches)} istek, {batched:8.0f} hücre/s "
+          f"({batched / per_cell:.1f}x)")
+
+    conn.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Artımlı grid senkronizasyonu (GET /api/worklogs/<ay>?since=<seq>) için doğruluk ve boyut/süre ölçümü.
+
+İstemci ayı matris biçiminde bir kez yükler; ardından rastgele hücre yazmaları, toplu yazmalar,
+Excel yüklemeleri ve çalışan silmeleri yapılır. Her adımdan sonra istemci yalnızca ?since= ile
+değişiklikleri alıp yerel kopyasına uygular ve sonuç tam yüklemeyle karşılaştırılır. Sonda tam ay
+ile tek hücre değişikliği sonrası delta yanıtının boyutu ve süresi raporlanır.
+
+Kullanım:
+    python bench/worklog_delta.py [--employees 1000] [--month 2025-03] [--steps 60]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import datagen  # noqa: E402
+
+
+def median_time(fn, repeat=7):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--month', default='2025-03')
+    parser.add_argument('--steps', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=9)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tmp = tempfile.TemporaryDirectory()
+    db_file = os.path.join(tmp.name, 'delta.db')
+    os.environ['DATABASE_FILE'] = db_file
+    logging.disable(logging.WARNING)
+    data = datagen.generate(db_file, employees=args.employees, months=1, first_month=args.month)
+    print(f"{data['employees']} çalışan, {data['work_logs']} log satırı ({args.month})")
+
+    import openpyxl
+    import app as app_module
+    client = app_module.app.test_client()
+    ym = args.month
+
+    def full():
+        matrix = client.get(f'/api/worklogs/{ym}?format=matrix').get_json()
+        cells = {}
+        for emp_id, row in matrix['rows'].items():
+            reasons = matrix['reasons'].get(emp_id, {})
+            for i, (day, evening) in enumerate(zip(row['day'], row['evening'])):
+                reason = reasons.get(str(i + 1))
+                if day or evening or reason:
+                    cells[(int(emp_id), f'{ym}-{i + 1:02d}')] = (day, evening, reason)
+        return matrix['seq'], cells
+
+    def random_cell():
+        return {'empId': rng.choice(emp_ids), 'date': f'{ym}-{rng.randint(1, 28):02d}',
+                'type': rng.choice(['day', 'evening']), 'value': rng.randint(0, 9)}
+
+    def upload():
+        wb = openpyxl.Workbook()
+        sheet = wb.active
+        sheet.title = 'Gündüz Mesaisi'
+        dates = [f'{ym}-{d:02d}' for d in range(1, 29)]
+        sheet.append(['Ad Soyad'] + dates)
+        for emp in rng.sample(employees, 20):
+            sheet.append([emp['name']] + [rng.choice([None, 2, 5]) for _ in dates])
+        buf = BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+        return client.post('/api/worklogs/upload?sync=1', data={'file': (buf, 'w.xlsx')})
+
+    employees = client.get('/api/employees').get_json()
+    emp_ids = [e['id'] for e in employees]
+    seq, local = full()
+    delta_cells = 0
+    for step in range(args.steps):
+        op = rng.random()
+        if op < 0.5:
+            response = client.post('/api/worklogs', json=random_cell())
+        elif op < 0.8:
+            response = client.post('/api/worklogs/batch', json={'changes': [random_cell() for _ in range(50)]})
+        elif op < 0.95:
+            response = upload()
+        else:
+            victim = emp_ids.pop(rng.randrange(len(emp_ids)))
+            employees = [e for e in employees if e['id'] != victim]
+            response = client.delete(f'/api/employees/{victim}')
+        assert response.status_code < 400, response.get_data(as_text=True)
+
+        delta = client.get(f'/api/worklogs/{ym}?since={seq}').get_json()
+        assert not delta.get('reset'), delta
+        for change in delta['changes']:
+            key = (change['empId'], change['date'])
+            if change['day'] or change['evening'] or change['reason']:
+                local[key] = (change['day'], change['evening'], change['reason'])
+            else:
+                local.pop(key, None)
+        delta_cells += len(delta['changes'])
+        seq = delta['seq']
+        expected_seq, expected = full()
+        assert seq == expected_seq and local == expected, f'adım {step}: delta uygulanmış kopya tam yüklemeden farklı'
+    print(f"Doğruluk: {args.steps} adım, {delta_cells} hücre değişikliği; delta uygulanan kopya = tam yükleme - OK")
+
+    client.post('/api/worklogs', json=random_cell())
+
+    def fetch_full():
+        app_module.response_cache.clear()
+        return client.get(f'/api/worklogs/{ym}?format=matrix').get_data()
+
+    def fetch_delta():
+        return client.get(f'/api/worklogs/{ym}?since={seq}').get_data()
+
+    full_body, delta_body = fetch_full(), fetch_delta()
+    print(f"  tam ay (matris)     : {median_time(fetch_full) * 1000:7.2f} ms, {len(full_body) / 1024:8.1f} KiB")
+    print(f"  delta (1 hücre)     : {median_time(fetch_delta) * 1000:7.2f} ms, {len(delta_body) / 1024:8.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
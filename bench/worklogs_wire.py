@@ -0,0 +1,84 @@
+"""GET /api/worklogs/<ay> için yanıt boyutu ve serileştirme süresi: iç içe (nested) ve matris biçimleri.
+
+Her biçim için önbellek boşaltılarak sunucu tarafı üretim + JSON serileştirme süresi (medyan),
+ham/gzip/brotli gövde boyutları ve istemci tarafı JSON ayrıştırma süresi ölçülür.
+
+Kullanım:
+    python bench/worklogs_wire.py [--employees 1000] [--month 2025-03] [--density 0.7] [--repeat 7]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def median_time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--month', default='2025-03')
+    parser.add_argument('--density', type=float, default=0.7)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_FILE'] = os.path.join(tmp.name, 'wire.db')
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.INFO)
+    import app as app_module
+    from cache import brotli, compress
+    from database import get_db_connection, write_transaction
+    from payroll import MonthCalendar
+
+    conn = get_db_connection()
+    calendar = MonthCalendar(args.month)
+    with write_transaction(conn):
+        conn.executemany("INSERT INTO employees (name) VALUES (?)", [(f'Çalışan {i}',) for i in range(args.employees)])
+        rows = []
+        for emp_id in range(1, args.employees + 1):
+            for d in calendar.dates:
+                if rng.random() < args.density:
+                    reason = 'Nöbet' if calendar.is_off(d) and rng.random() < 0.3 else None
+                    rows.append((emp_id, d, rng.randint(0, 8), rng.randint(0, 4), reason))
+        conn.executemany("INSERT INTO work_logs (employee_id, date, day_hours, evening_hours, sunday_reason) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.close()
+    print(f"{args.employees} çalışan, {len(rows)} log satırı ({args.month})")
+
+    client = app_module.app.test_client()
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+    for fmt in ('nested', 'matrix'):
+        url = f'/api/worklogs/{args.month}?format={fmt}'
+
+        def fetch():
+            app_module.response_cache.clear()
+            return client.get(url).get_data()
+
+        build = median_time(fetch, args.repeat)
+        body = fetch()
+        parse = median_time(lambda: json.loads(body), args.repeat)
+        sizes = ', '.join(f"{enc} {len(compress(body, enc)) / 1024:6.1f} KiB "
+                          f"({median_time(lambda enc=enc: compress(body, enc), args.repeat) * 1000:.0f} ms)"
+                          for enc in encodings)
+        print(f"  {fmt:7s}: üretim+serileştirme {build * 1000:6.1f} ms, ayrıştırma {parse * 1000:5.1f} ms, "
+              f"ham {len(body) / 1024:7.1f} KiB, {sizes}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,680 @@
 import sqlite3
 import os
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from dotenv import load_dotenv
+from flask import g, request
+
+import metrics
 
 load_dotenv()
 
 DB_FILE = os.getenv('DATABASE_FILE', 'overtime.db')
+OFFICIAL_HOLIDAYS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'official_holidays.json')
 
-def get_db_connection():
-    """Veritabanına bir bağlantı oluşturur ve döner."""
-    conn = sqlite3.connect(DB_FILE)
+# Bağlantı havuzu ve bağlantı seviyesindeki PRAGMA ayarları
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 5000))
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', 256 * 1024 * 1024))
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', 16000))
+
+# Eşzamanlılık modu: WAL'da okuyucular yazıcıları bloklamaz (ör. uzun export sırasında grid düzenleme).
+# Yazma transaction'ları BEGIN IMMEDIATE ile yazma kilidini baştan alır; kilit alınamazsa
+# busy_timeout'a ek olarak üstel geri çekilmeyle yeniden denenir.
+DB_JOURNAL_MODE = os.getenv('DB_JOURNAL_MODE', 'WAL').upper()
+DB_WRITE_RETRIES = int(os.getenv('DB_WRITE_RETRIES', 5))
+DB_WRITE_BACKOFF = float(os.getenv('DB_WRITE_BACKOFF', 0.05))
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """execute süresini ölçüp metrics'e bildirir (yavaş sorgu logu, istek başına sorgu sayısı)."""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            metrics.observe_query(sql, parameters, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.observe_query(sql, '<executemany>', time.perf_counter() - started)
+
+class InstrumentedConnection(sqlite3.Connection):
+    # Connection.execute kısayolları alt sınıfın cursor metodunu kullanmadığından ayrıca yönlendirilir
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+CONNECTION_FACTORY = InstrumentedConnection if metrics.METRICS_ENABLED else sqlite3.Connection
+
+def _configure_connection(conn):
+    """Bağlantı açılırken bir kez uygulanan PRAGMA ayarları."""
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA journal_mode = {DB_JOURNAL_MODE}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    # Negatif değer KiB cinsinden sayfa önbelleği boyutu demektir
+    conn.execute(f"PRAGMA cache_size = {-DB_CACHE_SIZE_KB}")
     return conn
 
+def get_db_connection():
+    """Veritabanına yeni (havuz dışı) bir bağlantı oluşturur ve döner."""
+    conn = sqlite3.connect(DB_FILE, factory=CONNECTION_FACTORY)
+    return _configure_connection(conn)
+
+def is_locked_error(exc):
+    """Yazma kilidi başkasındayken SQLite'ın verdiği (database is locked / busy) hata mı."""
+    return isinstance(exc, sqlite3.OperationalError) and ('locked' in str(exc) or 'busy' in str(exc))
+
+@contextmanager
+def write_transaction(conn, retries=None, backoff=None):
+    """Yazma kilidini baştan alan (BEGIN IMMEDIATE) transaction; başarıyla biterse commit eder.
+
+    Kilit alınamazsa (database is locked) üstel geri çekilmeyle yeniden dener. Kilit bir kez
+    alındıktan sonra diğer yazıcılar bekler, dolayısıyla gövde tekrar çalıştırılmaz.
+    """
+    retries = DB_WRITE_RETRIES if retries is None else retries
+    backoff = DB_WRITE_BACKOFF if backoff is None else backoff
+    if conn.in_transaction:
+        conn.commit()
+    for attempt in range(retries + 1):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            break
+        except sqlite3.OperationalError as exc:
+            if not is_locked_error(exc) or attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+@contextmanager
+def read_transaction(conn):
+    """Birden çok sorguyu tek bir tutarlı anlık görüntü (WAL snapshot) üzerinde çalıştırır."""
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+
+def iter_rows(cursor, chunk_size=1000):
+    """İmleç sonuçlarını fetchmany ile parça parça döner (tüm sonucu belleğe almadan)."""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+class ConnectionPool:
+    """Thread-safe SQLite bağlantı havuzu.
+
+    En fazla `size` bağlantı aynı anda dışarıda olabilir; hepsi kullanımdaysa
+    `timeout` saniye boyunca boşa çıkan bir bağlantı beklenir.
+    """
+
+    def __init__(self, db_file, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT):
+        self.db_file = db_file
+        self.size = size
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._idle = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def _connect(self):
+        # Bağlantılar thread'ler arasında el değiştirir, ama aynı anda tek thread kullanır
+        conn = sqlite3.connect(self.db_file, check_same_thread=False, factory=CONNECTION_FACTORY)
+        return _configure_connection(conn)
+
+    def acquire(self):
+        with self._cond:
+            if not self._idle and self._in_use >= self.size:
+                self.waits += 1
+                started = time.perf_counter()
+                ok = self._cond.wait_for(lambda: self._idle or self._in_use < self.size, timeout=self.timeout)
+                self.wait_time += time.perf_counter() - started
+                if not ok:
+                    raise TimeoutError("Veritabanı bağlantı havuzunda boş bağlantı bulunamadı.")
+            self._in_use += 1
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop()
+            self.misses += 1
+        try:
+            return self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            reusable = True
+        except sqlite3.Error:
+            reusable = False
+        with self._cond:
+            self._in_use -= 1
+            if reusable and len(self._idle) < self.size:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size, 'in_use': self._in_use, 'idle': len(self._idle),
+                'hits': self.hits, 'misses': self.misses,
+                'waits': self.waits, 'wait_time_ms': round(self.wait_time * 1000, 3)
+            }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """İşlem (process) başına tek havuz; fork sonrası veya DB_FILE değişince yeniden kurulur."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid() or _pool.db_file != DB_FILE:
+            _pool = ConnectionPool(DB_FILE)
+        return _pool
+
+@contextmanager
+def pooled_connection():
+    """İstek bağlamı dışında (script, arka plan thread'i) havuzdan bağlantı kullanmak için."""
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+def get_db():
+    """Flask isteği boyunca tek bir havuz bağlantısını (g üzerinde) yeniden kullanır."""
+    if 'db' not in g:
+        pool = get_pool()
+        g.db = pool.acquire()
+        g.db_pool = pool
+    return g.db
+
+def close_db(exc=None):
+    conn = g.pop('db', None)
+    pool = g.pop('db_pool', None)
+    if conn is not None:
+        pool.release(conn)
+
+def init_app(app):
+    """Uygulama bağlamı kapanırken istek bağlantısını havuza iade eder; yazma isteklerinde değişiklik günlüğünü budar."""
+    app.teardown_appcontext(close_db)
+    app.before_request(_prune_worklog_changes_on_write)
+
+def _prune_worklog_changes_on_write():
+    # Günlük yalnızca yazmalarla büyüdüğünden budama da yazma isteklerine bağlanır (process başına seyrek)
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        prune_worklog_changes_if_due(get_db())
+
+def bump_version(conn, *keys):
+    """Verilen kaynakların sürüm sayacını artırır (çağıranın transaction'ı içinde)."""
+    conn.executemany("""
+        INSERT INTO data_versions (key, version) VALUES (?, 1)
+        ON CONFLICT (key) DO UPDATE SET version = version + 1
+    """, [(key,) for key in keys])
+
+def get_version(conn, key):
+    row = conn.execute("SELECT version FROM data_versions WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else 0
+
+def get_versions(conn, *keys):
+    """Birden çok kaynağın sürümünü tek sorguda, verilen sırayla demet olarak döner."""
+    placeholders = ', '.join('?' for _ in keys)
+    rows = dict(conn.execute(f"SELECT key, version FROM data_versions WHERE key IN ({placeholders})", keys).fetchall())
+    return tuple(rows.get(key, 0) for key in keys)
+
+def seed_official_holidays(cursor, path=OFFICIAL_HOLIDAYS_FILE):
+    """Veri dosyasındaki yıllardan, tabloda hiç kaydı olmayanları ekler (içe aktarılan yıllar ezilmez)."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        years = json.load(f).get('years', {})
+    existing = {row[0] for row in cursor.execute("SELECT DISTINCT substr(date, 1, 4) FROM official_holidays").fetchall()}
+    rows = [(h['date'], h.get('description')) for year, holidays in years.items() if year not in existing for h in holidays]
+    if rows:
+        print(f"Migrating: Seeding official holidays for {len(years) - len(existing & set(years))} year(s)...")
+        cursor.executemany("INSERT OR IGNORE INTO official_holidays (date, description) VALUES (?, ?)", rows)
+        bump_version(cursor, 'official_holidays')
+
+# --- Aylık özet (monthly_employee_totals) ---
+# Bir tarihin hafta sonu/tatil sayılıp sayılmadığı (payroll.MonthCalendar ile aynı kural)
+def _off_day_sql(date_expr):
+    return (f"(strftime('%w', {date_expr}) IN ('0', '6')"
+            f" OR EXISTS (SELECT 1 FROM holidays WHERE date = {date_expr})"
+            f" OR EXISTS (SELECT 1 FROM official_holidays WHERE date = {date_expr}))")
+
+def _bucket_columns_sql(ref, sign=''):
+    """weekday_day, weekday_evening, weekend_day, weekend_evening değer ifadeleri."""
+    off = _off_day_sql(f"{ref}.date")
+    day, evening = f"COALESCE({ref}.day_hours, 0)", f"COALESCE({ref}.evening_hours, 0)"
+    return [f"{sign}(CASE WHEN {off} THEN 0 ELSE {day} END)",
+            f"{sign}(CASE WHEN {off} THEN 0 ELSE {evening} END)",
+            f"{sign}(CASE WHEN {off} THEN {day} ELSE 0 END)",
+            f"{sign}(CASE WHEN {off} THEN {evening} ELSE 0 END)"]
+
+TOTAL_COLUMNS = ['weekday_day', 'weekday_evening', 'weekend_day', 'weekend_evening']
+
+def _totals_add_sql(ref):
+    values = ', '.join(_bucket_columns_sql(ref))
+    updates = ', '.join(f"{c} = {c} + excluded.{c}" for c in TOTAL_COLUMNS)
+    return f"""
+        INSERT INTO monthly_employee_totals (employee_id, year_month, {', '.join(TOTAL_COLUMNS)})
+        SELECT {ref}.employee_id, substr({ref}.date, 1, 7), {values}
+        WHERE date({ref}.date) = {ref}.date
+        ON CONFLICT (employee_id, year_month) DO UPDATE SET {updates};"""
+
+def _totals_subtract_sql(ref):
+    # Yalnızca UPDATE: çalışan silinirken özet satırı cascade ile önce silinmiş olabilir
+    updates = ', '.join(f"{c} = {c} {expr}" for c, expr in zip(TOTAL_COLUMNS, _bucket_columns_sql(ref, '- ')))
+    return f"""
+        UPDATE monthly_employee_totals SET {updates}
+        WHERE employee_id = {ref}.employee_id AND year_month = substr({ref}.date, 1, 7)
+          AND date({ref}.date) = {ref}.date;"""
+
+def _create_totals_triggers(cursor):
+    """work_logs üzerindeki her yazma, ilgili aylık özeti artımlı olarak günceller."""
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_logs_totals_insert AFTER INSERT ON work_logs
+        BEGIN {_totals_add_sql('NEW')} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_logs_totals_update AFTER UPDATE ON work_logs
+        BEGIN {_totals_subtract_sql('OLD')} {_totals_add_sql('NEW')} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_logs_totals_delete AFTER DELETE ON work_logs
+        BEGIN {_totals_subtract_sql('OLD')} END
+    """)
+
+# work_logs'taki her hücre değişikliği (ekleme, değeri değişen güncelleme, silme) artan bir sıra
+# numarasıyla (seq) work_log_changes'e yazılır; istemciler ?since=<seq> ile yalnızca sonrasını alır.
+# AUTOINCREMENT sayesinde eski kayıtlar silinse de sıra numaraları tekrar kullanılmaz.
+WORKLOG_CHANGES_RETENTION_HOURS = float(os.getenv('WORKLOG_CHANGES_RETENTION_HOURS', 72))
+
+def _change_insert_sql(ref, where=''):
+    return f"""
+        INSERT INTO work_log_changes (employee_id, date, year_month, changed_at)
+        SELECT {ref}.employee_id, {ref}.date, substr({ref}.date, 1, 7), (julianday('now') - 2440587.5) * 86400.0
+        {where};"""
+
+def _create_change_triggers(cursor):
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_logs_changes_insert AFTER INSERT ON work_logs
+        BEGIN {_change_insert_sql('NEW')} END
+    """)
+    # Aynı değerle yapılan UPSERT'ler (ör. aynı dosyanın tekrar yüklenmesi) değişiklik sayılmaz
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_logs_changes_update AFTER UPDATE ON work_logs
+        WHEN OLD.day_hours IS NOT NEW.day_hours OR OLD.evening_hours IS NOT NEW.evening_hours
+          OR OLD.sunday_reason IS NOT NEW.sunday_reason OR OLD.employee_id IS NOT NEW.employee_id OR OLD.date IS NOT NEW.date
+        BEGIN
+            {_change_insert_sql('NEW')}
+            {_change_insert_sql('OLD', 'WHERE OLD.employee_id IS NOT NEW.employee_id OR OLD.date IS NOT NEW.date')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_logs_changes_delete AFTER DELETE ON work_logs
+        BEGIN {_change_insert_sql('OLD')} END
+    """)
+
+def drop_work_log_triggers(conn):
+    """Toplu tohumlama için work_logs trigger'larını (özet + değişiklik günlüğü) kaldırır.
+
+    init_db trigger'ları geri kurar; aradaki yazmaların özetleri rebuild_monthly_totals ile hesaplanmalıdır.
+    """
+    for name in ('totals_insert', 'totals_update', 'totals_delete', 'changes_insert', 'changes_update', 'changes_delete'):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_work_logs_{name}")
+
+# Kapatılmış dönemlerin (closed_periods) mesai kayıtları kilitlidir: uygulama yazmadan önce kontrol
+# eder ve anlaşılır hata döner; trigger'lar hiçbir yoldan yazılmamasını garanti eder. Silmeye izin
+# verilir (çalışan silinirken cascade), dönemin raporu zaten anlık görüntüde saklıdır.
+PERIOD_CLOSED_ERROR = 'Dönem kapatılmış'
+
+def _create_period_lock_triggers(cursor):
+    for event, refs in (('INSERT', ('NEW',)), ('UPDATE', ('NEW', 'OLD'))):
+        condition = ' OR '.join(
+            f"EXISTS (SELECT 1 FROM closed_periods WHERE year_month = substr({ref}.date, 1, 7))" for ref in refs)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_work_logs_period_lock_{event.lower()} BEFORE {event} ON work_logs
+            WHEN {condition}
+            BEGIN SELECT RAISE(ABORT, '{PERIOD_CLOSED_ERROR}'); END
+        """)
+
+def closed_months(conn, months):
+    """Verilen aylardan kapatılmış olanların kümesi."""
+    months = list(set(months))
+    if not months:
+        return set()
+    return {row[0] for row in conn.execute(
+        "SELECT year_month FROM closed_periods WHERE year_month IN (SELECT value FROM json_each(?))",
+        (json.dumps(months),))}
+
+def get_change_seq(conn):
+    """Şimdiye kadar verilen en büyük değişiklik sıra numarası (hiç değişiklik yoksa 0)."""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'work_log_changes'").fetchone()
+    return row[0] if row else 0
+
+def changed_cells_since(conn, year_month, since, table='work_logs'):
+    """Ayın `since`'ten sonra değişen hücrelerinin güncel değerleri; geçmiş silinmişse None.
+
+    (employee_id, date, day_hours, evening_hours, sunday_reason) satırları döner; silinen hücrelerde
+    değerler NULL'dur. Tutarlı sonuç için get_change_seq ile aynı read_transaction içinde çağrılmalıdır.
+    table: ayın kayıtlarının okunacağı tablo (arşivlenmiş yıllar için bkz. work_log_table).
+    """
+    seq = get_change_seq(conn)
+    oldest = conn.execute("SELECT MIN(seq) FROM work_log_changes").fetchone()[0]
+    # İstemcinin numarası ilerideyse (ör. veritabanı geri yüklendi) ya da aradaki kayıtlar silindiyse tam yükleme gerekir
+    if since > seq or (since < seq and (oldest is None or since < oldest - 1)):
+        return None
+    return conn.execute(f"""
+        SELECT c.employee_id, c.date, w.day_hours, w.evening_hours, w.sunday_reason
+        FROM (SELECT DISTINCT employee_id, date FROM work_log_changes WHERE year_month = ? AND seq > ?) c
+        LEFT JOIN {table} w ON w.employee_id = c.employee_id AND w.date = c.date
+    """, (year_month, since)).fetchall()
+
+def prune_worklog_changes(conn, now=None):
+    """Saklama süresi (WORKLOG_CHANGES_RETENTION_HOURS) dolan değişiklik kayıtlarını siler."""
+    cutoff = (now or time.time()) - WORKLOG_CHANGES_RETENTION_HOURS * 3600
+    with write_transaction(conn):
+        return conn.execute("DELETE FROM work_log_changes WHERE changed_at < ?", (cutoff,)).rowcount
+
+WORKLOG_CHANGES_PRUNE_INTERVAL = 3600
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+def prune_worklog_changes_if_due(conn, now=None):
+    """prune_worklog_changes'i process başına en fazla WORKLOG_CHANGES_PRUNE_INTERVAL saniyede bir çalıştırır.
+
+    Yazma kilidi alınamazsa budama sonraki fırsata kalır; silinen kayıt sayısını (ya da None) döner.
+    """
+    global _last_prune
+    now = now or time.time()
+    with _prune_lock:
+        if now - _last_prune < WORKLOG_CHANGES_PRUNE_INTERVAL:
+            return None
+        _last_prune = now
+    try:
+        return prune_worklog_changes(conn, now)
+    except sqlite3.OperationalError as exc:
+        if not is_locked_error(exc):
+            raise
+        return None
+
+# --- Yıl arşivi ---
+# Kapatılmış yılların work_logs satırları yıl başına ayrı SQLite dosyasına taşınır; ana veritabanı
+# (ve sayfa önbelleği) güncel verilerle sınırlı kalır. Arşiv dosyaları geçmiş aylar okunurken
+# bağlantıya ATTACH edilir. Aylık özetler, dönem anlık görüntüleri ve değişiklik günlüğü ana
+# veritabanında kalır; raporlar zaten bunlardan okunduğu için arşivden etkilenmez.
+_NOT_ARCHIVED_SQL = "substr(year_month, 1, 4) NOT IN (SELECT year FROM archived_years)"
+ARCHIVE_SCHEMA_PREFIX = 'archive_'
+
+def archive_dir():
+    """Arşiv dosyalarının klasörü; varsayılan olarak veritabanının yanındaki archive/ klasörü."""
+    return os.getenv('ARCHIVE_DIR') or os.path.join(os.path.dirname(os.path.abspath(DB_FILE)), 'archive')
+
+def _year_bounds(year):
+    return f'{year}-01-01', f'{int(year) + 1:04d}-01-01'
+
+def _create_archive_table(conn, schema):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {schema}.work_logs (
+            id INTEGER PRIMARY KEY,
+            employee_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            day_hours INTEGER DEFAULT 0,
+            evening_hours INTEGER DEFAULT 0,
+            sunday_reason TEXT
+        )
+    """)
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {schema}.idx_work_logs_emp_date ON work_logs (employee_id, date)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_work_logs_date ON work_logs (date)")
+
+def _attach(conn, path, schema):
+    if conn.in_transaction:
+        conn.commit()
+    try:
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+    except sqlite3.OperationalError as exc:
+        if 'too many attached' not in str(exc):
+            raise
+        # SQLite bağlantı başına en fazla 10 veritabanı bağlar: önceki arşivler çözülüp yeniden denenir
+        for row in conn.execute("PRAGMA database_list").fetchall():
+            if row[1].startswith(ARCHIVE_SCHEMA_PREFIX):
+                conn.execute(f"DETACH DATABASE {row[1]}")
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+
+def work_log_table(conn, year_month):
+    """Ayın kayıtlarının okunacağı tablo: 'work_logs' ya da arşivlenmiş yıl için 'archive_YYYY.work_logs'.
+
+    Arşiv dosyası gerekiyorsa bağlantıya bağlanır; ATTACH transaction içinde yapılamadığından
+    read_transaction'dan önce çağrılmalıdır. Havuzdaki bağlantıda bağlı dosya kayıttakinden farklıysa
+    (yıl geri alınıp yeniden arşivlendiyse her arşiv yeni bir dosyadır) ya da yıl artık arşivde
+    değilse eski dosya çözülür.
+    """
+    year = year_month[:4]
+    row = conn.execute("SELECT path FROM archived_years WHERE year = ?", (year,)).fetchone()
+    schema = f'{ARCHIVE_SCHEMA_PREFIX}{year}'
+    attached = {r[1]: r[2] for r in conn.execute("PRAGMA database_list").fetchall()}.get(schema)
+    if attached is not None and (row is None or os.path.realpath(attached) != os.path.realpath(row[0])):
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute(f"DETACH DATABASE {schema}")
+        attached = None
+    if row is None:
+        return 'work_logs'
+    if attached is None:
+        _attach(conn, row[0], schema)
+    return f'{schema}.work_logs'
+
+def list_archived_years(conn):
+    return [dict(row) for row in conn.execute("SELECT year, path, row_count, archived_at FROM archived_years ORDER BY year")]
+
+def archive_year(conn, year):
+    """Yılın work_logs satırlarını arşiv dosyasına taşır; taşınan satır sayısını döner.
+
+    Yılın 12 ayı da kapatılmış olmalıdır (kapalı ayların kayıtları değişmez). Önce arşiv dosyası
+    kendi transaction'ında yazılır, ardından ana veritabanında satır sayısı doğrulanıp satırlar
+    silinir ve yıl kaydedilir; arada kesilirse kayıtlı olmayan arşiv dosyası sonraki denemede
+    silinir. Dosya adı her arşivlemede benzersizdir: açık bağlantılar eski dosyayı okumaya devam
+    etmez (bkz. work_log_table). Hata durumunda ValueError.
+    """
+    year = f'{int(year):04d}'
+    months = [f'{year}-{month:02d}' for month in range(1, 13)]
+    open_months = sorted(set(months) - closed_months(conn, months))
+    if open_months:
+        raise ValueError(f"{year} arşivlenemez: kapatılmamış aylar var ({', '.join(open_months)}).")
+    if conn.execute("SELECT 1 FROM archived_years WHERE year = ?", (year,)).fetchone():
+        raise ValueError(f"{year} zaten arşivlenmiş.")
+    start, end = _year_bounds(year)
+    os.makedirs(archive_dir(), exist_ok=True)
+    # Yıl kayıtlı değilse bu yılın dosyaları yarım kalmış denemelerden kalmıştır
+    for name in os.listdir(archive_dir()):
+        if name.startswith(f'work_logs_{year}_') and name.endswith('.db'):
+            os.remove(os.path.join(archive_dir(), name))
+    path = os.path.abspath(os.path.join(archive_dir(), f'work_logs_{year}_{uuid.uuid4().hex[:8]}.db'))
+
+    schema = f'{ARCHIVE_SCHEMA_PREFIX}{year}_new'
+    _attach(conn, path, schema)
+    try:
+        with write_transaction(conn):
+            _create_archive_table(conn, schema)
+            copied = conn.execute(f"""
+                INSERT INTO {schema}.work_logs (id, employee_id, date, day_hours, evening_hours, sunday_reason)
+                SELECT id, employee_id, date, day_hours, evening_hours, sunday_reason
+                FROM main.work_logs WHERE date >= ? AND date < ?
+            """, (start, end)).rowcount
+    finally:
+        conn.execute(f"DETACH DATABASE {schema}")
+
+    with write_transaction(conn):
+        current = conn.execute("SELECT COUNT(*) FROM work_logs WHERE date >= ? AND date < ?", (start, end)).fetchone()[0]
+        if current != copied:
+            raise ValueError(f"{year} arşivlenirken kayıtlar değişti ({copied} kopyalandı, {current} mevcut); tekrar deneyin.")
+        # Özetler ve değişiklik günlüğü değişmez: silme trigger'sız yapılır
+        drop_work_log_triggers(conn)
+        conn.execute("DELETE FROM work_logs WHERE date >= ? AND date < ?", (start, end))
+        _create_totals_triggers(conn)
+        _create_change_triggers(conn)
+        conn.execute("INSERT INTO archived_years (year, path, row_count, archived_at) VALUES (?, ?, ?, ?)",
+                     (year, path, copied, time.strftime('%Y-%m-%dT%H:%M:%S')))
+        bump_version(conn, *[f'worklogs:{month}' for month in months])
+    return copied
+
+def restore_year(conn, year):
+    """Arşivlenmiş yılın satırlarını ana veritabanına geri taşır ve arşiv dosyasını siler; satır sayısını döner."""
+    year = f'{int(year):04d}'
+    row = conn.execute("SELECT path FROM archived_years WHERE year = ?", (year,)).fetchone()
+    if row is None:
+        raise ValueError(f"{year} arşivde değil.")
+    # Bu bağlantıda bağlıysa çözülür; geri yükleme ayrı bir şema adıyla yapılır
+    schema = f'{ARCHIVE_SCHEMA_PREFIX}{year}'
+    if schema in {r[1] for r in conn.execute("PRAGMA database_list").fetchall()}:
+        conn.execute(f"DETACH DATABASE {schema}")
+    schema += '_restore'
+    _attach(conn, row[0], schema)
+    try:
+        with write_transaction(conn):
+            # Aylar kapalı kalır: kilit trigger'ları da geçici olarak kaldırılır
+            drop_work_log_triggers(conn)
+            conn.execute("DROP TRIGGER IF EXISTS trg_work_logs_period_lock_insert")
+            conn.execute("DROP TRIGGER IF EXISTS trg_work_logs_period_lock_update")
+            restored = conn.execute(f"""
+                INSERT INTO main.work_logs (id, employee_id, date, day_hours, evening_hours, sunday_reason)
+                SELECT a.id, a.employee_id, a.date, a.day_hours, a.evening_hours, a.sunday_reason
+                FROM {schema}.work_logs a JOIN main.employees e ON e.id = a.employee_id
+            """).rowcount
+            _create_totals_triggers(conn)
+            _create_change_triggers(conn)
+            _create_period_lock_triggers(conn)
+            conn.execute("DELETE FROM archived_years WHERE year = ?", (year,))
+            bump_version(conn, *[f'worklogs:{year}-{month:02d}' for month in range(1, 13)])
+    finally:
+        conn.execute(f"DETACH DATABASE {schema}")
+    os.remove(row[0])
+    return restored
+
+def _totals_recompute_sql(where=''):
+    # Toplu hesap iki geçişte yapılır: önce satırlar yalnızca hafta sonu kontrolüyle (ucuz strftime)
+    # gruplanır, sonra hafta içine denk gelen tatillerin saatleri tatil tablosundan tarih
+    # indeksiyle bulunup (CROSS JOIN sırayı sabitler) hafta içi kovasından hafta sonu kovasına taşınır.
+    # Satır başına tatil alt sorgusu (_off_day_sql) yalnızca tek satırla çalışan trigger'larda kalır.
+    # where iki kez kullanıldığından parametreleri numaralı (?1, ?2) olmalıdır.
+    columns = ', '.join(TOTAL_COLUMNS)
+    return f"""
+        WITH off_days (date) AS (SELECT date FROM holidays UNION SELECT date FROM official_holidays),
+        weekly AS (
+            SELECT w.employee_id, substr(w.date, 1, 7) AS year_month, strftime('%w', w.date) IN ('0', '6') AS weekend,
+                   SUM(COALESCE(w.day_hours, 0)) AS day_hours, SUM(COALESCE(w.evening_hours, 0)) AS evening_hours
+            FROM work_logs w
+            WHERE date(w.date) = w.date {where}
+            GROUP BY +w.employee_id, year_month, weekend
+        ),
+        parts ({columns.join(('employee_id, year_month, ', ''))}) AS (
+            SELECT employee_id, year_month,
+                   CASE WHEN weekend THEN 0 ELSE day_hours END, CASE WHEN weekend THEN 0 ELSE evening_hours END,
+                   CASE WHEN weekend THEN day_hours ELSE 0 END, CASE WHEN weekend THEN evening_hours ELSE 0 END
+            FROM weekly
+            UNION ALL
+            SELECT w.employee_id, substr(w.date, 1, 7),
+                   -SUM(COALESCE(w.day_hours, 0)), -SUM(COALESCE(w.evening_hours, 0)),
+                   SUM(COALESCE(w.day_hours, 0)), SUM(COALESCE(w.evening_hours, 0))
+            FROM off_days o CROSS JOIN work_logs w ON w.date = o.date
+            WHERE strftime('%w', o.date) NOT IN ('0', '6') AND date(w.date) = w.date {where}
+            GROUP BY w.employee_id, substr(w.date, 1, 7)
+        )
+        SELECT employee_id, year_month, {', '.join(f'SUM({c}) AS {c}' for c in TOTAL_COLUMNS)}
+        FROM parts
+        GROUP BY employee_id, year_month
+    """
+
+def aggregate_month_totals(conn, year_month):
+    """Ayın kategorili saat toplamlarını ham work_logs'tan tek GROUP BY sorgusuyla hesaplar.
+
+    employee_id -> (weekday_day, weekday_evening, weekend_day, weekend_evening) döner; aylık özet
+    tablosunu kullanmadan (ör. doğrulama için) rapora girdi olarak verilebilir.
+    """
+    rows = conn.execute(_totals_recompute_sql('AND w.date >= ?1 AND w.date <= ?2'),
+                        (f"{year_month}-01", f"{year_month}-31")).fetchall()
+    return {row[0]: tuple(row[2:]) for row in rows}
+
+def rebuild_monthly_totals(conn, first_month=None, last_month=None):
+    """Özetleri ham work_logs'tan yeniden hesaplar; ay aralığı ('YYYY-MM', iki uç dahil) verilirse yalnızca o aylar.
+
+    Tatiller değiştiğinde (gün hafta içi <-> tatil kategorisi değişir) çağrılır. Commit çağırana bırakılır.
+    Özeti silinen ya da yeniden yazılan ayların kümesini döner (önbellek sürümlerini artırmak için).
+    """
+    # Arşivlenmiş yılların ham kayıtları ana veritabanında olmadığından özetleri korunur
+    if first_month is None:
+        scope, scope_params = _NOT_ARCHIVED_SQL, ()
+        where, params = '', ()
+    else:
+        last_month = last_month or first_month
+        scope, scope_params = f"year_month >= ? AND year_month <= ? AND {_NOT_ARCHIVED_SQL}", (first_month, last_month)
+        # Yalnızca geçerli tarihler sayıldığından ayın son günü en fazla 31'dir
+        where, params = 'AND w.date >= ?1 AND w.date <= ?2', (f"{first_month}-01", f"{last_month}-31")
+    months_sql = f"SELECT DISTINCT year_month FROM monthly_employee_totals WHERE {scope}"
+    months = {row[0] for row in conn.execute(months_sql, scope_params)}
+    conn.execute(f"DELETE FROM monthly_employee_totals WHERE {scope}", scope_params)
+    conn.execute(f"""
+        INSERT INTO monthly_employee_totals (employee_id, year_month, {', '.join(TOTAL_COLUMNS)})
+        {_totals_recompute_sql(where)}
+    """, params)
+    return months | {row[0] for row in conn.execute(months_sql, scope_params)}
+
+def check_monthly_totals(conn):
+    """Saklanan özetler ile tam yeniden hesaplama arasındaki farklı satırları döner (boş liste = tutarlı)."""
+    stored = (f"SELECT employee_id, year_month, {', '.join(TOTAL_COLUMNS)} FROM monthly_employee_totals "
+              f"WHERE ({' OR '.join(f'{c} != 0' for c in TOTAL_COLUMNS)}) AND {_NOT_ARCHIVED_SQL}")
+    fresh = f"SELECT * FROM ({_totals_recompute_sql()}) WHERE {' OR '.join(f'{c} != 0' for c in TOTAL_COLUMNS)}"
+    # Her iki taraf bir kez hesaplanır; EXCEPT'ler iki yönde de aynı ara sonuçları kullanır
+    rows = conn.execute(f"""
+        WITH stored AS MATERIALIZED ({stored}), fresh AS MATERIALIZED ({fresh})
+        SELECT 'stored', * FROM (SELECT * FROM stored EXCEPT SELECT * FROM fresh)
+        UNION ALL SELECT 'fresh', * FROM (SELECT * FROM fresh EXCEPT SELECT * FROM stored)
+    """).fetchall()
+    return [tuple(r) for r in rows]
+
 def init_db():
     """Veritabanı tablolarını (eğer yoksa) oluşturur."""
     conn = get_db_connection()
@@ -67,6 +730,12 @@ def init_db():
         print("Migrating: Adding salary_type_id column to employees table...")
         cursor.execute("ALTER TABLE employees ADD COLUMN salary_type_id INTEGER REFERENCES salary_types(id)")
 
+    # employees indeksleri: filtre (branch, salary_type_id) + ad sıralı keyset sayfalama.
+    # İndeks girdileri rowid'i (id) içerdiği için (name, id) sırası da indeksten okunur.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees (name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_branch ON employees (branch, name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_salary_type ON employees (salary_type_id, name)")
+
     # Work Logs tablosu
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS work_logs (
@@ -80,6 +749,19 @@ def init_db():
         )
     ''')
 
+    # work_logs indeksleri: (employee_id, date) benzersiz anahtar + ay aralığı sorguları için date indeksi
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_work_logs_emp_date'")
+    if cursor.fetchone() is None:
+        print("Migrating: Deduplicating work_logs and adding unique (employee_id, date) index...")
+        # Aynı çalışan/gün için birden fazla satır varsa, okuma tarafında görünen (en son eklenen) satırı tut
+        cursor.execute("""
+            DELETE FROM work_logs WHERE id NOT IN (
+                SELECT MAX(id) FROM work_logs GROUP BY employee_id, date
+            )
+        """)
+        cursor.execute("CREATE UNIQUE INDEX idx_work_logs_emp_date ON work_logs (employee_id, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_logs_date ON work_logs (date)")
+
     # Holidays tablosu
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS holidays (
@@ -95,6 +777,149 @@ def init_db():
         )
     ''')
 
+    # Veri sürümleri: önbelleklerin (ör. ay takvimi) process'ler arasında geçersiz kılınması için
+    # ilgili yazma işlemlerinde artırılan sayaçlar
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            key TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    # Resmi tatiller tablosu (yıllara yayılan, veri dosyasından yüklenir)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS official_holidays (
+            date TEXT PRIMARY KEY,
+            description TEXT
+        )
+    ''')
+    seed_official_holidays(cursor)
+
+    # Arşivlenmiş yıllar (bkz. archive_year); özet yeniden hesaplamaları bu yılları atlar
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_years (
+            year TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            archived_at TEXT NOT NULL
+        )
+    ''')
+
+    # Aylık özet tablosu: çalışan x ay başına hafta içi/sonu x gündüz/akşam saat toplamları.
+    # work_logs trigger'larıyla artımlı tutulur; raporlar ham loglar yerine buradan okur.
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'monthly_employee_totals'")
+    totals_exists = cursor.fetchone() is not None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_employee_totals (
+            employee_id INTEGER NOT NULL,
+            year_month TEXT NOT NULL,
+            weekday_day INTEGER NOT NULL DEFAULT 0,
+            weekday_evening INTEGER NOT NULL DEFAULT 0,
+            weekend_day INTEGER NOT NULL DEFAULT 0,
+            weekend_evening INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (employee_id, year_month),
+            FOREIGN KEY (employee_id) REFERENCES employees (id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_monthly_totals_month ON monthly_employee_totals (year_month)")
+    if not totals_exists:
+        # Eski sürümler foreign key'leri uygulamadığından silinen çalışanların kayıtları kalmış olabilir;
+        # özet tablosunun foreign key'i bunları kabul etmez. Silinmez, work_logs_orphaned tablosuna taşınır.
+        cursor.execute("SELECT COUNT(*) FROM work_logs WHERE employee_id NOT IN (SELECT id FROM employees)")
+        orphaned = cursor.fetchone()[0]
+        if orphaned:
+            print(f"Migrating: Moving {orphaned} work_logs row(s) of deleted employees to work_logs_orphaned...")
+            cursor.execute("CREATE TABLE IF NOT EXISTS work_logs_orphaned AS SELECT * FROM work_logs WHERE 0")
+            cursor.execute("INSERT INTO work_logs_orphaned SELECT * FROM work_logs WHERE employee_id NOT IN (SELECT id FROM employees)")
+            cursor.execute("DELETE FROM work_logs WHERE employee_id NOT IN (SELECT id FROM employees)")
+    _create_totals_triggers(cursor)
+    if not totals_exists:
+        print("Migrating: Building monthly_employee_totals from work_logs...")
+        rebuild_monthly_totals(cursor)
+
+    # Hücre değişiklik günlüğü: ?since=<seq> ile artımlı grid senkronizasyonu (bkz. _create_change_triggers)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS work_log_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            year_month TEXT NOT NULL,
+            changed_at REAL NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_log_changes_month ON work_log_changes (year_month, seq)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_log_changes_time ON work_log_changes (changed_at)")
+    _create_change_triggers(cursor)
+
+    # Dönem kapatma: kapatılan ayın raporu (ve hesapta kullanılan ayarlar/maaş türleri) donmuş olarak
+    # saklanır. report tam raporun JSON gövdesidir; period_snapshot_rows sayfalı/filtreli okumalar ve
+    # dışa aktarma içindir (çalışan bilgileri kapatma anındaki halleriyle).
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS closed_periods (
+            year_month TEXT PRIMARY KEY,
+            closed_at TEXT NOT NULL,
+            closed_by TEXT,
+            settings TEXT NOT NULL,
+            salary_types TEXT NOT NULL,
+            employee_count INTEGER NOT NULL,
+            total_payment REAL NOT NULL,
+            report TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS period_snapshot_rows (
+            year_month TEXT NOT NULL,
+            employee_id INTEGER NOT NULL,
+            name TEXT,
+            branch TEXT,
+            salary_type_id INTEGER,
+            data TEXT NOT NULL,
+            PRIMARY KEY (year_month, employee_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_period_snapshot_name ON period_snapshot_rows (year_month, name, employee_id)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS period_audit (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            year_month TEXT NOT NULL,
+            action TEXT NOT NULL,
+            actor TEXT,
+            reason TEXT,
+            at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_period_audit_month ON period_audit (year_month, id)")
+    _create_period_lock_triggers(cursor)
+
+    # Arka plan işleri (jobs.py): içe/dışa aktarımların durumu, ilerlemesi ve çıktı dosyaları.
+    # Zamanlar Unix epoch saniyesidir.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            params TEXT,
+            input_path TEXT,
+            progress REAL NOT NULL DEFAULT 0,
+            message TEXT,
+            result TEXT,
+            applied_result TEXT,
+            error TEXT,
+            artifact_path TEXT,
+            artifact_name TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            heartbeat_at REAL,
+            finished_at REAL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+    # Yazması commit edilmiş işin sonucu (bkz. jobs.Job.mark_applied); yeniden denemede yazma tekrarlanmaz
+    if 'applied_result' not in {info[1] for info in cursor.execute("PRAGMA table_info(jobs)").fetchall()}:
+        cursor.execute("ALTER TABLE jobs ADD COLUMN applied_result TEXT")
+
     # Varsayılan ayarları ekle
     try:
         cursor.execute("INSERT INTO settings (key, value) VALUES (?, ?)", ('dayRate', '100'))
@@ -159,10 +984,61 @@ def init_db():
     conn.close()
 
 if __name__ == '__main__':
+    import argparse
     import logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
 
+    parser = argparse.ArgumentParser(description="Veritabanı yönetim komutları")
+    parser.add_argument('command', nargs='?', default='init',
+                        choices=['init', 'rebuild-totals', 'check-totals', 'archive', 'restore', 'list-archives'],
+                        help="init: tabloları oluştur/göç et (varsayılan); rebuild-totals: aylık özetleri yeniden hesapla; "
+                             "check-totals: aylık özetleri ham kayıtlarla karşılaştır; archive/restore YIL: kapatılmış "
+                             "yılın kayıtlarını arşiv dosyasına taşı / geri al; list-archives: arşivlenmiş yıllar")
+    parser.add_argument('years', nargs='*', help="archive/restore için yıl(lar)")
+    parser.add_argument('--no-vacuum', action='store_true', help="archive sonrası VACUUM ile dosyayı küçültme")
+    args = parser.parse_args()
+
     logger.info(f"Veritabanı başlatılıyor... (Dosya: {DB_FILE})")
     init_db()
     logger.info("Veritabanı başarıyla başlatıldı ve tablolar oluşturuldu.")
+
+    if args.command == 'rebuild-totals':
+        conn = get_db_connection()
+        with write_transaction(conn):
+            months = rebuild_monthly_totals(conn)
+            # Çalışan uygulama process'lerinin önbellekteki raporları eski özetlerle kalmasın
+            bump_version(conn, *[f'worklogs:{month}' for month in sorted(months)])
+        conn.close()
+        logger.info(f"Aylık özetler yeniden hesaplandı ({len(months)} ay).")
+    elif args.command == 'check-totals':
+        conn = get_db_connection()
+        mismatches = check_monthly_totals(conn)
+        conn.close()
+        for row in mismatches[:50]:
+            logger.warning(f"Tutarsız özet: {row}")
+        logger.info(f"Aylık özet kontrolü: {len(mismatches)} tutarsız satır.")
+        raise SystemExit(1 if mismatches else 0)
+    elif args.command in ('archive', 'restore'):
+        if not args.years:
+            parser.error(f"{args.command} için en az bir yıl gerekli.")
+        conn = get_db_connection()
+        try:
+            for year in args.years:
+                if args.command == 'archive':
+                    logger.info(f"{year}: {archive_year(conn, year)} satır arşivlendi ({archive_dir()}).")
+                else:
+                    logger.info(f"{year}: {restore_year(conn, year)} satır geri alındı.")
+            if args.command == 'archive' and not args.no_vacuum:
+                # Silinen sayfalar dosyadan atılır (ana veritabanı boyutu ve yedek süresi küçülür)
+                conn.execute("VACUUM")
+        except ValueError as exc:
+            logger.error(str(exc))
+            raise SystemExit(1)
+        finally:
+            conn.close()
+    elif args.command == 'list-archives':
+        conn = get_db_connection()
+        for archive in list_archived_years(conn):
+            logger.info(f"{archive['year']}: {archive['row_count']} satır, {archive['path']} ({archive['archived_at']})")
+        conn.close()
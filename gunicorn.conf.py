@@ -0,0 +1,15 @@
+# Gunicorn yapılandırması (gunicorn bu dosyayı çalışma dizininden otomatik okur).
+#
+# SQLite tek bir yazıcıya izin verir; WAL modunda okuyucular paralel çalışır. Bu yüzden
+# çok sayıda process yerine az sayıda process + thread (gthread) önerilir:
+#   - WEB_CONCURRENCY (process sayısı): 2-4. Her process kendi bağlantı havuzunu açar.
+#   - GUNICORN_THREADS (process başına thread): 4-8. DB_POOL_SIZE bundan küçük olmamalı,
+#     aksi halde istekler havuzda bağlantı bekler.
+#   - Uzun Excel içe/dışa aktarımları için timeout yüksek tutulur.
+import os
+
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
@@ -0,0 +1,285 @@
+"""SQLite'ta saklanan, harici aracı (broker) gerektirmeyen arka plan iş kuyruğu.
+
+Büyük Excel içe/dışa aktarımları istek içinde değil, her process'teki küçük bir thread havuzunda
+çalışır. İşler `jobs` tablosunda tutulduğu için durumu hangi worker'dan sorulursa sorulsun aynıdır;
+kuyruktaki işler BEGIN IMMEDIATE ile atomik olarak sahiplenilir ve çalışan işlerin heartbeat'i
+düzenli güncellenir. Worker process'i ölürse heartbeat'i eskiyen işler kuyruğa geri alınır.
+"""
+import json
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import database
+from database import get_db_connection, pooled_connection, write_transaction, is_locked_error
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))
+JOB_STALE_SECONDS = float(os.getenv('JOB_STALE_SECONDS', 120))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+JOB_RETENTION_HOURS = float(os.getenv('JOB_RETENTION_HOURS', 24))
+JOB_PROGRESS_INTERVAL = 0.5
+JOB_CLEANUP_INTERVAL = 3600
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def jobs_dir():
+    """Yüklenen girdiler ve üretilen dosyalar; varsayılan olarak veritabanının yanındaki jobs/ klasörü."""
+    return os.getenv('JOBS_DIR') or os.path.join(os.path.dirname(os.path.abspath(database.DB_FILE)), 'jobs')
+
+
+def handler(kind):
+    """İş türü için çalıştırıcı kaydeder: fn(conn, job) -> JSON'a çevrilebilir sonuç."""
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+class Job:
+    """Çalışan bir işin handler'a verilen görünümü (parametreler, girdi dosyası, ilerleme, çıktı)."""
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.kind = row['kind']
+        self.params = json.loads(row['params'] or '{}')
+        self.input_path = row['input_path']
+        self.artifact_path = None
+        self.artifact_name = None
+        self._last_progress = 0.0
+
+    def progress(self, fraction, message=None):
+        """İlerlemeyi (0-1) kaydeder; sık çağrılar JOB_PROGRESS_INTERVAL ile seyreltilir."""
+        now = time.monotonic()
+        if now - self._last_progress < JOB_PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        try:
+            with pooled_connection() as conn, write_transaction(conn, retries=0):
+                conn.execute("UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+                             (min(max(fraction, 0.0), 1.0), message, self.id))
+        except Exception as exc:
+            # Yazma kilidi başka bir işteyse ilerleme bir sonraki çağrıya kalır
+            if not is_locked_error(exc):
+                raise
+
+    def applied_result(self, conn):
+        """Yazması önceki bir denemede commit edilmiş işin o denemedeki sonucu; yoksa None.
+
+        Yeniden denenen işlerde yazma tekrarlanmasın diye handler'ın yazma transaction'ı içinde sorulur.
+        """
+        row = conn.execute("SELECT applied_result FROM jobs WHERE id = ?", (self.id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def mark_applied(self, conn, result):
+        """Sonucu handler'ın yazmasıyla aynı transaction'da kaydeder (bkz. applied_result)."""
+        conn.execute("UPDATE jobs SET applied_result = ? WHERE id = ?", (json.dumps(result), self.id))
+
+    def artifact(self, download_name, suffix):
+        """Handler'ın çıktıyı yazacağı dosya yolunu döner; iş bitince download_name ile sunulur."""
+        os.makedirs(jobs_dir(), exist_ok=True)
+        self.artifact_path = os.path.join(jobs_dir(), f'{self.id}{suffix}')
+        self.artifact_name = download_name
+        return self.artifact_path
+
+
+def submit(conn, kind, params=None, input_file=None, input_suffix=''):
+    """İşi kuyruğa ekler ve id'sini döner. input_file (dosya benzeri nesne) jobs_dir()'e kopyalanır."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Bilinmeyen iş türü: {kind}")
+    job_id = uuid.uuid4().hex
+    input_path = None
+    if input_file is not None:
+        os.makedirs(jobs_dir(), exist_ok=True)
+        input_path = os.path.join(jobs_dir(), f'{job_id}-input{input_suffix}')
+        with open(input_path, 'wb') as out:
+            shutil.copyfileobj(input_file, out)
+    with write_transaction(conn):
+        conn.execute("INSERT INTO jobs (id, kind, params, input_path, created_at) VALUES (?, ?, ?, ?, ?)",
+                     (job_id, kind, json.dumps(params or {}), input_path, time.time()))
+    runner.ensure_started()
+    runner.wake()
+    return job_id
+
+
+def get_job(conn, job_id):
+    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value).isoformat(timespec='seconds') if value else None
+
+
+def describe(job):
+    """API yanıtı için işin özeti (dosya yolları dışarı verilmez)."""
+    return {
+        'id': job['id'], 'kind': job['kind'], 'status': job['status'],
+        'progress': job['progress'], 'message': job['message'],
+        'result': json.loads(job['result']) if job['result'] else None,
+        'error': job['error'], 'attempts': job['attempts'],
+        'hasArtifact': job['status'] == 'done' and bool(job['artifact_path']),
+        'createdAt': _timestamp(job['created_at']), 'startedAt': _timestamp(job['started_at']),
+        'finishedAt': _timestamp(job['finished_at'])
+    }
+
+
+def _remove(path):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def recover_stale(conn, now=None):
+    """Heartbeat'i JOB_STALE_SECONDS'tan eski çalışan işleri kuyruğa geri alır (deneme hakkı bittiyse başarısız sayar).
+
+    Çağıranın yazma transaction'ı içinde çalışır; etkilenen iş sayısını döner.
+    """
+    cutoff = (now or time.time()) - JOB_STALE_SECONDS
+    failed = conn.execute("""
+        UPDATE jobs SET status = 'failed', finished_at = ?, worker = NULL,
+               error = 'İşi çalıştıran process durdu, deneme hakkı doldu.'
+        WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?
+    """, (now or time.time(), cutoff, JOB_MAX_ATTEMPTS)).rowcount
+    requeued = conn.execute("""
+        UPDATE jobs SET status = 'queued', worker = NULL, progress = 0,
+               message = 'İşi çalıştıran process durdu, yeniden kuyruğa alındı.'
+        WHERE status = 'running' AND heartbeat_at < ?
+    """, (cutoff,)).rowcount
+    if failed or requeued:
+        logger.warning(f"Yarım kalan işler: {requeued} yeniden kuyruğa alındı, {failed} başarısız sayıldı.")
+    return failed + requeued
+
+
+def cleanup(conn, now=None):
+    """Saklama süresi (JOB_RETENTION_HOURS) dolan bitmiş işleri dosyalarıyla birlikte siler."""
+    cutoff = (now or time.time()) - JOB_RETENTION_HOURS * 3600
+    rows = conn.execute("SELECT id, input_path, artifact_path FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                        (cutoff,)).fetchall()
+    for row in rows:
+        _remove(row['input_path'])
+        _remove(row['artifact_path'])
+    if rows:
+        with write_transaction(conn):
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(row['id'],) for row in rows])
+    return len(rows)
+
+
+class JobRunner:
+    """Process başına tek yönetici thread'i: işleri sahiplenir, heartbeat atar, eski işleri temizler.
+
+    İşler JOB_WORKERS boyutundaki thread havuzunda, havuzdan alınan bir bağlantıyla çalışır.
+    Fork sonrası (ör. gunicorn worker) ilk çağrıda yeniden başlatılır.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, poll_interval=JOB_POLL_INTERVAL):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.pid = None
+        self.worker_id = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = set()
+        self._executor = None
+        self._last_cleanup = 0.0
+
+    def ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self._lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.worker_id = f'{socket.gethostname()}:{self.pid}'
+            self._running = set()
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='job')
+            threading.Thread(target=self._loop, name='job-supervisor', daemon=True).start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _loop(self):
+        conn = get_db_connection()
+        while True:
+            try:
+                self._tick(conn)
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                logger.exception("İş kuyruğu döngüsünde hata")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _tick(self, conn):
+        now = time.time()
+        with self._lock:
+            running = list(self._running)
+        if running:
+            with write_transaction(conn):
+                conn.executemany("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker = ?",
+                                 [(now, job_id, self.worker_id) for job_id in running])
+        if conn.execute("SELECT 1 FROM jobs WHERE status = 'running' AND heartbeat_at < ? LIMIT 1",
+                        (now - JOB_STALE_SECONDS,)).fetchone():
+            with write_transaction(conn):
+                recover_stale(conn, now)
+        free = self.workers - len(running)
+        # Boştayken yazma kilidi alınmaz; yalnızca kuyrukta iş varsa sahiplenme transaction'ı açılır
+        if free > 0 and conn.execute("SELECT 1 FROM jobs WHERE status = 'queued' LIMIT 1").fetchone():
+            for row in self._claim(conn, free, now):
+                with self._lock:
+                    self._running.add(row['id'])
+                self._executor.submit(self._execute, row)
+        if now - self._last_cleanup > JOB_CLEANUP_INTERVAL:
+            cleanup(conn, now)
+            self._last_cleanup = now
+
+    def _claim(self, conn, limit, now):
+        with write_transaction(conn):
+            rows = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT ?", (limit,)).fetchall()
+            conn.executemany("""
+                UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1,
+                       started_at = ?, heartbeat_at = ?, error = NULL
+                WHERE id = ?
+            """, [(self.worker_id, now, now, row['id']) for row in rows])
+        return rows
+
+    def _execute(self, row):
+        job = Job(row)
+        try:
+            if job.kind not in HANDLERS:
+                raise ValueError(f"Bilinmeyen iş türü: {job.kind}")
+            with pooled_connection() as conn:
+                result = HANDLERS[job.kind](conn, job)
+            self._finish(job, 'done', result=result)
+        except Exception as exc:
+            logger.exception(f"İş başarısız oldu ({job.kind} {job.id})")
+            self._finish(job, 'failed', error=str(exc) or exc.__class__.__name__)
+        finally:
+            with self._lock:
+                self._running.discard(job.id)
+            self.wake()
+
+    def _finish(self, job, status, result=None, error=None):
+        with pooled_connection() as conn, write_transaction(conn):
+            # İş bu arada eskimiş sayılıp başka bir process'e verildiyse sonucu ona bırak
+            updated = conn.execute("""
+                UPDATE jobs SET status = ?, progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END,
+                       result = ?, error = ?, artifact_path = ?, artifact_name = ?, finished_at = ?
+                WHERE id = ? AND worker = ?
+            """, (status, status, json.dumps(result) if result is not None else None, error,
+                  job.artifact_path, job.artifact_name, time.time(), job.id, self.worker_id)).rowcount
+        if updated:
+            _remove(job.input_path)
+            if status == 'failed':
+                _remove(job.artifact_path)
+
+
+runner = JobRunner()
@@ -0,0 +1,160 @@
+"""Mesai gridleri için canlı değişiklik yayını (Server-Sent Events).
+
+Her process'te tek bir yayın thread'i veritabanındaki değişiklik sıra numarasını (work_log_changes)
+LIVE_POLL_INTERVAL aralıkla okur; numara ilerlediğinde yalnızca abone olunan ayların değişen
+hücrelerini ay başına tek sorguyla alıp o aylara abone olan istemcilerin kuyruklarına dağıtır. Yazma hangi
+gunicorn worker'ında yapılırsa yapılsın değişiklik veritabanından görüldüğü için tüm worker'lara
+ulaşır; istemci başına sorgu çalışmaz.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from database import get_db_connection, read_transaction, get_change_seq, changed_cells_since
+
+LIVE_POLL_INTERVAL = float(os.getenv('LIVE_POLL_INTERVAL', 0.5))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv('LIVE_HEARTBEAT_SECONDS', 15))
+# Her akış bir gunicorn thread'ini tutar: süre dolunca bağlantı kapanır ve EventSource kaldığı
+# yerden (Last-Event-ID) yeniden bağlanır; üst sınır aşılırsa istemci yoklamaya (polling) döner
+LIVE_STREAM_MAX_SECONDS = float(os.getenv('LIVE_STREAM_MAX_SECONDS', 300))
+LIVE_MAX_STREAMS = int(os.getenv('LIVE_MAX_STREAMS', max(1, int(os.getenv('GUNICORN_THREADS', 4)) // 2)))
+LIVE_RETRY_MS = 3000
+LIVE_QUEUE_SIZE = 256
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event, data, event_id=None):
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines += [f'event: {event}', f'data: {json.dumps(data, ensure_ascii=False)}']
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+def cell_changes(rows):
+    return [{'empId': emp_id, 'date': date_str, 'day': day_hours or 0, 'evening': evening_hours or 0, 'reason': reason}
+            for emp_id, date_str, day_hours, evening_hours, reason in rows]
+
+
+class Subscription:
+    def __init__(self, year_month):
+        self.year_month = year_month
+        self.queue = queue.Queue(LIVE_QUEUE_SIZE)
+
+    def publish(self, seq, payload):
+        try:
+            self.queue.put_nowait((seq, payload))
+        except queue.Full:
+            # Yavaş istemci: bekleyen olaylar atılır, istemciden ayı baştan yüklemesi istenir
+            with self.queue.mutex:
+                self.queue.queue.clear()
+            self.queue.put_nowait((seq, format_event('reset', {'month': self.year_month, 'seq': seq}, seq)))
+
+
+class ChangeHub:
+    """Process başına abonelik listesi ve yayın thread'i (ilk abonelikte, fork sonrası yeniden başlar)."""
+
+    def __init__(self, poll_interval=LIVE_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.pid = None
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._sent = 0
+
+    def stats(self):
+        with self._lock:
+            return {'subscribers': len(self._subscriptions), 'events_total': self._sent}
+
+    def subscribe(self, year_month, limit=None):
+        """Yeni abonelik; process'teki akış sayısı `limit`e ulaştıysa None."""
+        self._ensure_started()
+        with self._lock:
+            if limit is not None and len(self._subscriptions) >= limit:
+                return None
+            subscription = Subscription(year_month)
+            self._subscriptions.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def _ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self._lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self._subscriptions = set()
+            # Başlangıç numarası ilk abonenin yakalama sorgusundan önce okunur
+            conn = get_db_connection()
+            self.seq = get_change_seq(conn)
+            conn.close()
+            threading.Thread(target=self._loop, name='live-hub', daemon=True).start()
+
+    def _loop(self):
+        conn = get_db_connection()
+        while True:
+            try:
+                self._tick(conn)
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                logger.exception("Canlı yayın döngüsünde hata")
+            time.sleep(self.poll_interval)
+
+    def _tick(self, conn):
+        if get_change_seq(conn) == self.seq:
+            return
+        since, events = self.seq, {}
+        with read_transaction(conn):
+            seq = get_change_seq(conn)
+            # Abone listesi sıra numarasından sonra alınır: bundan sonra abone olan istemcinin
+            # yakalama sorgusu en az bu numarayı görür, aradaki değişiklik kaçmaz
+            with self._lock:
+                months = {s.year_month for s in self._subscriptions}
+            for year_month in months:
+                rows = changed_cells_since(conn, year_month, since)
+                if rows is None:
+                    events[year_month] = ('reset', {'month': year_month, 'seq': seq})
+                elif rows:
+                    events[year_month] = ('changes', {'month': year_month, 'since': since, 'seq': seq,
+                                                      'changes': cell_changes(rows)})
+        self.seq = seq
+        if not events:
+            return
+        payloads = {ym: format_event(event, data, seq) for ym, (event, data) in events.items()}
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.year_month in payloads]
+            self._sent += len(subscriptions)
+        for subscription in subscriptions:
+            subscription.publish(seq, payloads[subscription.year_month])
+
+
+hub = ChangeHub()
+
+
+def stream(subscription, first_events, since):
+    """SSE gövdesi: önce yakalama (catch-up) olayları, sonra hub'dan gelenler ve heartbeat'ler.
+
+    `since`ten eski ya da ona eşit sıra numaralı olaylar (yakalamada zaten gönderilmiş) atlanır.
+    """
+    started = time.monotonic()
+    try:
+        yield f'retry: {LIVE_RETRY_MS}\n\n'.encode('utf-8')
+        yield from first_events
+        while time.monotonic() - started < LIVE_STREAM_MAX_SECONDS:
+            try:
+                seq, payload = subscription.queue.get(timeout=LIVE_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield b': ping\n\n'
+                continue
+            if seq > since:
+                since = seq
+                yield payload
+    finally:
+        hub.unsubscribe(subscription)
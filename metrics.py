@@ -0,0 +1,223 @@
+"""İstek ve veritabanı ölçümleri: rota gecikme histogramları, istek başına sorgu sayısı/süresi,
+yavaş sorgu logu ve isteğe bağlı profil dökümü. /api/_metrics bunları Prometheus metin
+biçiminde sunar.
+
+Ölçümler process başınadır; gunicorn'da her worker kendi değerlerini tutar (Prometheus tarafında
+worker'lar ayrı hedef olarak ya da toplanarak okunur).
+"""
+import cProfile
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+from flask import g, request
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1').lower() not in ('0', 'false')
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+SLOW_QUERY_PARAMS_MAX = 500
+
+# Eşiği aşan isteklerin cProfile dökümü (0 = kapalı). cProfile deterministik olduğundan ek yükü
+# sınırlamak için istekler PROFILE_SAMPLE_RATE oranında örneklenir ve aynı anda tek istek profillenir.
+PROFILE_THRESHOLD_MS = float(os.getenv('PROFILE_THRESHOLD_MS', 0))
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 1.0))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+BACKGROUND = '(background)'
+
+logger = logging.getLogger(__name__)
+
+
+def profile_dir():
+    """Profil dökümleri; varsayılan olarak veritabanının yanındaki profiles/ klasörü."""
+    import database
+    return os.getenv('PROFILE_DIR') or os.path.join(os.path.dirname(os.path.abspath(database.DB_FILE)), 'profiles')
+
+
+class Histogram:
+    """Etiket kümesi başına kümülatif kovalı histogram (Prometheus histogram tipi)."""
+
+    def __init__(self, name, help_text, buckets, labels):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}
+
+    def observe(self, label_values, value):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label_values, (counts, total, count) in sorted(self._series.items()):
+            labels = _labels(self.labels, label_values)
+            for bound, n in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total:.6f}')
+            lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._series = {}
+
+    def inc(self, label_values, value=1):
+        self._series[label_values] = self._series.get(label_values, 0) + value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for label_values, value in sorted(self._series.items()):
+            value = f'{value:.6f}' if isinstance(value, float) else value
+            lines.append(f'{self.name}{{{_labels(self.labels, label_values)}}} {value}')
+        return lines
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_lock = threading.Lock()
+_local = threading.local()
+_profile_lock = threading.Lock()
+_gauges = []
+
+request_latency = Histogram('http_request_duration_seconds', 'İstek işleme süresi (yanıt gövdesi akışı hariç).',
+                            LATENCY_BUCKETS, ('method', 'endpoint', 'status'))
+request_queries = Histogram('db_queries_per_request', 'İstek başına çalıştırılan SQL sorgusu sayısı.',
+                            QUERY_COUNT_BUCKETS, ('endpoint',))
+request_query_time = Histogram('db_query_time_per_request_seconds', 'İstek başına SQL execute süresi toplamı.',
+                               LATENCY_BUCKETS, ('endpoint',))
+queries_total = Counter('db_queries_total', 'Çalıştırılan SQL sorgusu sayısı.', ('endpoint',))
+query_seconds_total = Counter('db_query_seconds_total', 'SQL execute süresi toplamı.', ('endpoint',))
+slow_queries_total = Counter('db_slow_queries_total', f'SLOW_QUERY_MS ({SLOW_QUERY_MS:g} ms) eşiğini aşan sorgular.',
+                             ('endpoint',))
+profiles_total = Counter('request_profiles_total', 'Diske yazılan istek profili sayısı.', ('endpoint',))
+
+
+def register_gauges(prefix, collect, help_text=''):
+    """collect() -> {ad: sayı} değerlerini her okumada `{prefix}_{ad}` gauge'ları olarak sunar."""
+    _gauges.append((prefix, collect, help_text))
+
+
+def _endpoint():
+    state = getattr(_local, 'request', None)
+    return state['endpoint'] if state is not None else BACKGROUND
+
+
+def observe_query(sql, params, elapsed):
+    """Veritabanı katmanı her execute sonrasında çağırır (database.InstrumentedCursor)."""
+    state = getattr(_local, 'request', None)
+    endpoint = state['endpoint'] if state is not None else BACKGROUND
+    if state is not None:
+        state['queries'] += 1
+        state['query_time'] += elapsed
+    slow = elapsed * 1000 >= SLOW_QUERY_MS
+    with _lock:
+        queries_total.inc((endpoint,))
+        query_seconds_total.inc((endpoint,), elapsed)
+        if slow:
+            slow_queries_total.inc((endpoint,))
+    if slow:
+        params_text = repr(params)
+        if len(params_text) > SLOW_QUERY_PARAMS_MAX:
+            params_text = params_text[:SLOW_QUERY_PARAMS_MAX] + '...'
+        logger.warning("Yavaş sorgu (%.1f ms, %s): %s | parametreler: %s",
+                       elapsed * 1000, endpoint, ' '.join(sql.split()), params_text)
+
+
+def _begin_request():
+    endpoint = request.url_rule.rule if request.url_rule is not None else '(unmatched)'
+    _local.request = {'endpoint': endpoint, 'queries': 0, 'query_time': 0.0}
+    g.metrics_started = time.perf_counter()
+    if (PROFILE_THRESHOLD_MS > 0 and random.random() < PROFILE_SAMPLE_RATE
+            and _profile_lock.acquire(blocking=False)):
+        profiler = cProfile.Profile()
+        g.metrics_profiler = profiler
+        profiler.enable()
+
+
+def _end_request(response):
+    state = getattr(_local, 'request', None)
+    started = g.pop('metrics_started', None)
+    if state is None or started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    endpoint = state['endpoint']
+    with _lock:
+        request_latency.observe((request.method, endpoint, str(response.status_code)), elapsed)
+        request_queries.observe((endpoint,), state['queries'])
+        request_query_time.observe((endpoint,), state['query_time'])
+    response.headers['Server-Timing'] = f"app;dur={elapsed * 1000:.1f}, db;dur={state['query_time'] * 1000:.1f}"
+    _stop_profiler(endpoint, elapsed)
+    return response
+
+
+def _stop_profiler(endpoint, elapsed):
+    profiler = g.pop('metrics_profiler', None)
+    if profiler is None:
+        return
+    profiler.disable()
+    try:
+        if elapsed * 1000 >= PROFILE_THRESHOLD_MS:
+            os.makedirs(profile_dir(), exist_ok=True)
+            name = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{request.method}{request.path.replace('/', '_')}.prof"
+            path = os.path.join(profile_dir(), name)
+            profiler.dump_stats(path)
+            with _lock:
+                profiles_total.inc((endpoint,))
+            logger.info("İstek profili yazıldı (%.0f ms): %s", elapsed * 1000, path)
+    finally:
+        _profile_lock.release()
+
+
+def _teardown_request(exc=None):
+    # after_request çalışmadıysa (yakalanmamış hata) profil kilidi ve thread durumu burada bırakılır
+    if 'metrics_profiler' in g:
+        _stop_profiler(_endpoint(), 0)
+    _local.request = None
+
+
+def init_app(app):
+    """İstek ölçümlerini bağlar. Diğer after_request kancalarından (ör. sıkıştırma) sonra çalışması
+    için uygulama kurulurken ilk kaydedilenlerden olmalıdır."""
+    if not METRICS_ENABLED:
+        return
+    app.before_request(_begin_request)
+    app.after_request(_end_request)
+    app.teardown_request(_teardown_request)
+
+
+def render():
+    """Tüm ölçümleri Prometheus metin biçiminde (text/plain; version=0.0.4) döner."""
+    with _lock:
+        lines = []
+        for metric in (request_latency, request_queries, request_query_time,
+                       queries_total, query_seconds_total, slow_queries_total, profiles_total):
+            lines.extend(metric.render())
+    for prefix, collect, help_text in _gauges:
+        for key, value in collect().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                name = f'{prefix}_{key}'
+                if help_text:
+                    lines.append(f'# HELP {name} {help_text}')
+                lines.extend([f'# TYPE {name} gauge', f'{name} {value}'])
+    return '\n'.join(lines) + '\n'
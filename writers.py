@@ -0,0 +1,87 @@
+"""Rapor satırları için akışlı dosya yazıcıları: CSV, NDJSON ve XLSX.
+
+Her yazıcı kolon tanımlarını ve kayıt (dict) üretecini alıp bytes parçaları üreten bir
+generator'dır; HTTP yanıtı olarak akıtılabilir veya arka plan işinde dosyaya yazılabilir.
+Kolonlar (başlık, anahtar, para mı) üçlüleridir; para kolonları 2 haneye yuvarlanıp sayı olarak
+yazılır. NDJSON kayıtları kolonlarla sınırlamadan JSON API'deki haliyle yazar.
+"""
+import csv
+import io
+import json
+import tempfile
+from collections import namedtuple
+
+import openpyxl
+
+# Bu kadar satırda bir parça gönderilir (küçük parçalar yanıt başına ek yük demektir)
+FLUSH_ROWS = 500
+FILE_CHUNK_BYTES = 64 * 1024
+
+Writer = namedtuple('Writer', 'mimetype extension write')
+
+
+def _values(columns, record):
+    return [round(record.get(key) or 0, 2) if money else record.get(key, '') for _, key, money in columns]
+
+
+def write_csv(columns, records, title=None):
+    buffer = io.StringIO()
+    out = csv.writer(buffer)
+    # BOM: Excel UTF-8 CSV'yi Türkçe karakterlerle doğru açar. Başlık hemen gönderilir.
+    buffer.write('\ufeff')
+    out.writerow([header for header, _, _ in columns])
+    yield buffer.getvalue().encode('utf-8')
+    buffer.seek(0)
+    buffer.truncate()
+    for i, record in enumerate(records, 1):
+        out.writerow(_values(columns, record))
+        if i % FLUSH_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def write_ndjson(columns, records, title=None):
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= FLUSH_ROWS:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines.clear()
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def write_xlsx(columns, records, title='Rapor'):
+    # XLSX bir zip arşivi olduğundan dosya bitmeden gönderilemez: write-only workbook geçici
+    # dosyaya yazılır, ardından parça parça okunur
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet(title)
+    sheet.append([header for header, _, _ in columns])
+    for record in records:
+        sheet.append(_values(columns, record))
+    with tempfile.TemporaryFile(suffix='.xlsx') as f:
+        wb.save(f)
+        f.seek(0)
+        while True:
+            chunk = f.read(FILE_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+WRITERS = {
+    'csv': Writer('text/csv', '.csv', write_csv),
+    'ndjson': Writer('application/x-ndjson', '.ndjson', write_ndjson),
+    'xlsx': Writer('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx', write_xlsx),
+}
+
+
+def get_writer(name):
+    """?format= değerine göre yazıcı; geçersizse ValueError."""
+    writer = WRITERS.get(name)
+    if writer is None:
+        raise ValueError(f"Geçersiz biçim: {name} (geçerli: {', '.join(WRITERS)})")
+    return writer